@@ -1,6 +1,6 @@
 import argparse
-from pathlib import Path
 from models.common import ImportTypes, SeverityLevel, ReimportConditions
+from common.tracing import TRACE_FORMATS
 
 
 def main_parser():
@@ -8,23 +8,11 @@ def main_parser():
     The main_parser parses all arguments defined in this function.
     """
 
-    # Create a parent parser with shared arguments (excluding file and import-type)
-    parent_parser = argparse.ArgumentParser(
-        prog="defectdojo-importer", description="Defect Dojo CI tool for importing scan findings"
-    )
-    import_args = parent_parser.add_argument_group("Scan Import Configuration")
-    import_args.add_argument("-f", "--file", type=Path, help="File to import")
-    import_args.add_argument(
-        "-t",
-        "--import-type",
-        type=str,
-        default=ImportTypes.FINDINGS.value,
-        choices=[import_type.value for import_type in ImportTypes],
-        help="Type of import: findings or languages, default is findings.",
-    )
+    # Shared arguments of the main parser and of the sub-commands (excluding file and import-type)
+    shared_parser = argparse.ArgumentParser(add_help=False)
 
-    # DefectDojo Configuration Group for parent parser
-    dd_config_group = parent_parser.add_argument_group("DefectDojo Configuration")
+    # DefectDojo Configuration Group
+    dd_config_group = shared_parser.add_argument_group("DefectDojo Configuration")
     dd_config_group.add_argument("--api-url", type=str, help="DefectDojo API URL")
     dd_config_group.add_argument("--api-key", type=str, help="DefectDojo API Key")
     dd_config_group.add_argument("--product-name", type=str, help="Product name")
@@ -34,8 +22,8 @@ def main_parser():
     )
     dd_config_group.add_argument("--product-platform", type=str, help="Product platform")
 
-    # Test Configuration Group for parent parser
-    test_config_group = parent_parser.add_argument_group("Test Configuration")
+    # Test Configuration Group
+    test_config_group = shared_parser.add_argument_group("Test Configuration")
     test_config_group.add_argument("--engagement-name", type=str, help="Engagement name")
     test_config_group.add_argument("--test-name", type=str, help="Test name")
     test_config_group.add_argument("--test-type-name", type=str, help="Test type name")
@@ -50,8 +38,8 @@ def main_parser():
         help="Additional tool configuration parameters as comma-separated values. Max of 3 parameters.",
     )
 
-    # Scan Settings Group for parent parser
-    scan_settings_group = parent_parser.add_argument_group("Scan Settings")
+    # Scan Settings Group
+    scan_settings_group = shared_parser.add_argument_group("Scan Settings")
     scan_settings_group.add_argument(
         "--minimum-severity",
         type=str,
@@ -76,40 +64,169 @@ def main_parser():
         choices=[condition.value for condition in ReimportConditions],
         help="Condition for reimporting findings",
     )
+    scan_settings_group.add_argument(
+        "--auto-create-context",
+        action="store_true",
+        default=False,
+        help="Let DefectDojo resolve or create the product, engagement and test in the import request.",
+    )
+    scan_settings_group.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        default=False,
+        help="Skip the upload if the report is identical to the last one imported into the test.",
+    )
 
-    # Build/CI Information Group for parent parser
-    ci_info_group = parent_parser.add_argument_group("Build/CI Information")
+    # Build/CI Information Group
+    ci_info_group = shared_parser.add_argument_group("Build/CI Information")
     ci_info_group.add_argument("--build-id", type=str, help="Build ID")
     ci_info_group.add_argument("--commit-hash", type=str, help="Commit hash")
     ci_info_group.add_argument("--branch-tag", type=str, help="Branch or tag")
     ci_info_group.add_argument("--scm-uri", type=str, help="SCM URI")
 
-    # General Options Group for parent parser
-    general_group = parent_parser.add_argument_group("General Options")
+    # General Options Group
+    general_group = shared_parser.add_argument_group("General Options")
     general_group.add_argument(
         "-v", "--verbose", dest="debug", action="store_true", help="Enable verbose/debug logging."
     )
     general_group.add_argument(
         "-i", "--insecure", action="store_true", default=False, help="Disable ssl verification."
     )
+    general_group.add_argument(
+        "--pool-size",
+        type=int,
+        help="Maximum number of pooled HTTP connections per host, default is 10.",
+    )
+    general_group.add_argument(
+        "--no-keep-alive",
+        dest="keep_alive",
+        action="store_false",
+        default=True,
+        help="Close HTTP connections after each request instead of reusing them.",
+    )
+    general_group.add_argument(
+        "--workers",
+        type=int,
+        help="Number of reports imported concurrently when importing several files, default is 4.",
+    )
+    general_group.add_argument(
+        "--lookup-retries",
+        type=int,
+        help="Retries for DefectDojo lookups on 429/502/503/504 or connection errors, default is 3.",
+    )
+    general_group.add_argument(
+        "--import-retries",
+        type=int,
+        help="Retries for import uploads rejected with 429/503 or failed connections, default is 2.",
+    )
+    general_group.add_argument(
+        "--dtrack-retries",
+        type=int,
+        help="Retries for Dependency-Track requests, default is 3.",
+    )
+    general_group.add_argument(
+        "--retry-budget",
+        type=float,
+        help="Maximum time in seconds spent retrying a single request, default is 120.",
+    )
+    general_group.add_argument(
+        "--lookup-rate",
+        type=float,
+        help="Maximum DefectDojo lookup requests per second, shared by concurrent imports, default is unlimited.",
+    )
+    general_group.add_argument(
+        "--import-rate",
+        type=float,
+        help="Maximum DefectDojo import uploads per second, eg. 0.5 for one every 2 seconds, default is unlimited.",
+    )
+    general_group.add_argument(
+        "--rate-limit-file",
+        type=str,
+        help="Share the request rates with every importer process on the host using this file.",
+    )
+    general_group.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Directory of the persistent lookup cache for DefectDojo ids. Disabled if not set.",
+    )
+    general_group.add_argument(
+        "--cache-ttl",
+        type=float,
+        help="Time in seconds cached ids are reused, default is 86400.",
+    )
+    general_group.add_argument(
+        "--cache-negative-ttl",
+        type=float,
+        help="Time in seconds missing entities are cached, default is 300.",
+    )
+    general_group.add_argument(
+        "--outbox",
+        type=str,
+        help="Queue findings imports in this directory instead of sending them, see flush.",
+    )
+    general_group.add_argument(
+        "--metrics-file",
+        type=str,
+        help="Write request metrics to this file in Prometheus text format.",
+    )
+    general_group.add_argument(
+        "--trace-file",
+        type=str,
+        help="Write a trace of the phases and requests of the run to this file.",
+    )
+    general_group.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        help="Format of the trace file: chrome (Perfetto, chrome://tracing) or otlp json, default is chrome.",
+    )
+    general_group.add_argument(
+        "--log-body-limit",
+        type=int,
+        help="Bytes of each request and response body logged with --verbose and on errors, 0 logs the sizes only, default is 2048.",
+    )
+    general_group.add_argument(
+        "--summary-json",
+        type=str,
+        help="Write a json summary of the run with the resolved ids, report sizes and hashes, import statistics and time spent per phase and request.",
+    )
+    general_group.add_argument(
+        "--profile",
+        type=str,
+        help="Profile the run, writing cProfile statistics to this file and logging the time and memory of each phase.",
+    )
+
+    # Import arguments of the main parser only
+    import_parser = argparse.ArgumentParser(add_help=False)
+    import_args = import_parser.add_argument_group("Scan Import Configuration")
+    import_args.add_argument(
+        "-f",
+        "--file",
+        type=str,
+        nargs="+",
+        action="extend",
+        help="Files, globs or directories to import. Append =<test type> to set a test type per file.",
+    )
+    import_args.add_argument(
+        "-t",
+        "--import-type",
+        type=str,
+        default=ImportTypes.FINDINGS.value,
+        choices=[import_type.value for import_type in ImportTypes],
+        help="Type of import: findings or languages, default is findings.",
+    )
 
-    # Create a parent parser with shared arguments (excluding subparsers)
-    integrations_parent_parser = argparse.ArgumentParser(add_help=False)
-    # Copy all arguments from main parser to parent parser (excluding subparsers)
-    for action in parent_parser._actions:
-        if action.dest not in ["file", "import_type", "product_api_scan", "subcommands"]:
-            integrations_parent_parser._add_action(action)
-    for group in parent_parser._action_groups:
-        if group.title != "Scan Import Configuration":
-            integrations_parent_parser._action_groups.append(group)
+    parent_parser = argparse.ArgumentParser(
+        prog="defectdojo-importer",
+        description="Defect Dojo CI tool for importing scan findings",
+        parents=[import_parser, shared_parser],
+    )
 
     # Subparsers for integration
     subparsers = parent_parser.add_subparsers(dest="sub_command", title="Sub-commands", metavar="")
     integration_parser = subparsers.add_parser(
         "integration",
         help="Import findings from supported external integrations",
-        parents=[integrations_parent_parser],
-        add_help=False,
+        parents=[shared_parser],
     )
     integration_subparsers = integration_parser.add_subparsers(
         dest="integration_type", title="Available external integrations options", metavar=""
@@ -118,8 +235,7 @@ def main_parser():
     dtrack_parser = integration_subparsers.add_parser(
         "dtrack",
         help="Setup and trigger Dependency-Track findings import.",
-        parents=[integrations_parent_parser],
-        add_help=False,
+        parents=[shared_parser],
     )
     # Add dtrack-specific arguments first
     dtrack_parser.add_argument("--dtrack-api-url", type=str, help="Dependency-Track API URL")
@@ -137,4 +253,59 @@ def main_parser():
         "--dtrack-reactivate", action="store_true", help="Dependency-Track reactivate"
     )
 
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Import the reports of many products from a manifest",
+        parents=[shared_parser],
+    )
+    batch_parser.add_argument(
+        "--manifest",
+        type=str,
+        help="JSON or YAML manifest listing the imports of the batch.",
+    )
+    batch_parser.add_argument(
+        "--results-file",
+        type=str,
+        default="batch-results.json",
+        help="File the aggregated batch results are written to, default is batch-results.json.",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run a daemon importing reports posted to it or dropped into a spool directory",
+        parents=[shared_parser],
+    )
+    serve_parser.add_argument(
+        "--host", type=str, default="127.0.0.1", help="Address to listen on, default is 127.0.0.1."
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=8484, help="Port to listen on, default is 8484."
+    )
+    serve_parser.add_argument(
+        "--spool-dir",
+        type=str,
+        help="Directory watched for *.import.json manifests, report paths are relative to it.",
+    )
+    serve_parser.add_argument(
+        "--spool-interval",
+        type=float,
+        default=2.0,
+        help="Time in seconds between scans of the spool directory, default is 2.",
+    )
+
+    flush_parser = subparsers.add_parser(
+        "flush",
+        help="Send the imports queued in the outbox to DefectDojo",
+        parents=[shared_parser],
+    )
+    flush_parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=10,
+        help="Attempts before a queued import is moved to the failed directory, default is 10.",
+    )
+    flush_parser.add_argument(
+        "--results-file", type=str, help="File the results of the flushed imports are written to."
+    )
+
     return parent_parser
@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import logging
+import threading
+from functools import wraps
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger("defectdojo_importer")
+
+CACHE_FILE = "lookups.json"
+
+
+class LookupCache:
+    """Name to id cache for DefectDojo lookups.
+
+    Entries are keyed by endpoint url and lookup parameters and stored as json under
+    `cache_dir`, so they survive between runs. Missing entities are cached with a
+    shorter ttl, and every entry for the api url is dropped when DefectDojo answers 404.
+    Without a `cache_dir` the cache only lives in memory.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        cache_dir: str | Path | None = None,
+        ttl: float = 86400,
+        negative_ttl: float = 300,
+    ):
+        self.api_url = api_url.rstrip("/")
+        self.path = Path(cache_dir).expanduser() / CACHE_FILE if cache_dir else None
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.lock = threading.Lock()
+        self.entries = self.load()
+
+    def load(self) -> dict:
+        """Load cache entries from disk."""
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable lookup cache %s", self.path)
+            return {}
+
+    def save(self):
+        """Atomically write unexpired cache entries to disk."""
+        if self.path is None:
+            return
+        now = time.time()
+        self.entries = {key: entry for key, entry in self.entries.items() if entry["expires"] > now}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self.entries, file)
+            os.replace(temp_path, self.path)
+        except OSError:
+            logger.warning("Could not write lookup cache %s", self.path, exc_info=True)
+
+    @staticmethod
+    def key(endpoint: str, params: dict) -> str:
+        return f"{endpoint}?{json.dumps(params, sort_keys=True, default=str)}"
+
+    def get(self, endpoint: str, params: dict) -> tuple[bool, int | dict | None]:
+        """Return whether a lookup is cached and its cached value."""
+        with self.lock:
+            entry = self.entries.get(self.key(endpoint, params))
+        if entry is None or entry["expires"] <= time.time():
+            return False, None
+        return True, entry["id"]
+
+    def set(self, endpoint: str, params: dict, value: int | dict | None):
+        """Cache the result of a lookup, or its absence when value is None."""
+        ttl = self.ttl if value is not None else self.negative_ttl
+        with self.lock:
+            self.entries[self.key(endpoint, params)] = {"id": value, "expires": time.time() + ttl}
+            self.save()
+
+    def invalidate(self):
+        """Drop every cache entry for the api url."""
+        with self.lock:
+            self.entries = {
+                key: entry
+                for key, entry in self.entries.items()
+                if not key.startswith(self.api_url)
+            }
+            self.save()
+
+    def response_hook(self, response, *args, **kwargs):
+        """requests response hook invalidating the cache when DefectDojo answers 404."""
+        if response.status_code == 404 and response.url.startswith(self.api_url):
+            logger.info("DefectDojo returned 404, invalidating lookup cache.")
+            self.invalidate()
+        return response
+
+
+def cached_lookup(key: Callable[..., dict]):
+    """Cache the id returned by a resource `get` method in the resource's lookup cache."""
+
+    def decorator(get):
+        @wraps(get)
+        def wrapper(resource, *args, **kwargs):
+            if resource.cache is None:
+                return get(resource, *args, **kwargs)
+            params = key(*args, **kwargs)
+            hit, value = resource.cache.get(resource.endpoint, params)
+            if hit:
+                resource.logger.debug("Lookup cache hit for %s %s", resource.endpoint, params)
+                return value
+            value = get(resource, *args, **kwargs)
+            resource.cache.set(resource.endpoint, params, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def cache_created(key: Callable[..., dict]):
+    """Cache the id returned by a resource `create` method in the resource's lookup cache."""
+
+    def decorator(create):
+        @wraps(create)
+        def wrapper(resource, *args, **kwargs):
+            value = create(resource, *args, **kwargs)
+            if resource.cache is not None:
+                resource.cache.set(resource.endpoint, key(*args, **kwargs), value)
+            return value
+
+        return wrapper
+
+    return decorator
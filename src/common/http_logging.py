@@ -0,0 +1,74 @@
+from .instrumentation import body_size
+
+# Bytes of a request or response body written to the log, 0 logs the sizes only
+DEFAULT_BODY_LIMIT = 2048
+# Headers carrying the DefectDojo and Dependency-Track credentials
+SECRET_HEADERS = frozenset(
+    {"authorization", "proxy-authorization", "x-api-key", "cookie", "set-cookie"}
+)
+REDACTED = "[REDACTED]"
+
+
+def redact_headers(headers) -> dict:
+    """Return the headers with the values of credentials replaced."""
+    return {
+        name: REDACTED if name.lower() in SECRET_HEADERS else value
+        for name, value in (headers or {}).items()
+    }
+
+
+def truncate_body(body, limit: int = DEFAULT_BODY_LIMIT, encoding: str | None = None) -> str:
+    """Decode at most limit bytes of a body, noting the size of what is left out.
+
+    Only the logged part is decoded, streamed bodies such as report uploads are not read.
+    """
+    size = body_size(body)
+    if body is not None and not isinstance(body, (bytes, str)):
+        return f"<streamed body of {size} bytes>"
+    if size == 0:
+        return "<empty>"
+    if limit <= 0:
+        return f"<{size} bytes>"
+    head = body[:limit]
+    if isinstance(head, bytes):
+        try:
+            head = head.decode(encoding or "utf-8", errors="replace")
+        except LookupError:
+            head = head.decode("utf-8", errors="replace")
+    if size > limit:
+        return f"{head}... <{size - limit} more bytes>"
+    return head
+
+
+class LazyBody:
+    """A body that is only truncated and decoded if the log record is emitted."""
+
+    def __init__(self, body, limit: int = DEFAULT_BODY_LIMIT, encoding: str | None = None):
+        self.body = body
+        self.limit = limit
+        self.encoding = encoding
+
+    def __str__(self) -> str:
+        return truncate_body(self.body, self.limit, self.encoding)
+
+
+class LazyExchange:
+    """A request and its response, only formatted if the log record is emitted."""
+
+    def __init__(self, response, limit: int = DEFAULT_BODY_LIMIT):
+        self.response = response
+        self.limit = limit
+
+    def __str__(self) -> str:
+        request = self.response.request
+        return "\n".join(
+            [
+                f"{request.method} {request.url} -> {self.response.status_code} "
+                f"in {self.response.elapsed.total_seconds():.3f}s",
+                f"Request headers: {redact_headers(request.headers)}",
+                f"Request body: {truncate_body(request.body, self.limit)}",
+                f"Response headers: {redact_headers(self.response.headers)}",
+                "Response body: "
+                + truncate_body(self.response.content, self.limit, self.response.encoding),
+            ]
+        )
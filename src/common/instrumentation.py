@@ -0,0 +1,130 @@
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Callable
+from urllib.parse import urlsplit
+
+# Object ids and Dependency-Track uuids in a path, so requests for different objects are
+# counted under the same endpoint
+ID_SEGMENT = re.compile(
+    r"/(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(?=/|$)"
+)
+
+
+@dataclass
+class RequestRecord:
+    """A single attempt of a request sent by a HttpClient.
+
+    elapsed is the time until the response body was read, ttfb the time until the response
+    headers were received.
+    """
+
+    method: str
+    url: str
+    status: int | None
+    elapsed: float
+    attempt: int = 1
+    error: str | None = None
+    ttfb: float | None = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+
+    @property
+    def endpoint(self) -> str:
+        return normalize_endpoint(self.url)
+
+
+RequestObserver = Callable[[RequestRecord], None]
+
+
+def body_size(body) -> int:
+    """Return the size of a request body, streamed bodies included."""
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    # Streamed multipart bodies know their length up front
+    return getattr(body, "len", 0)
+
+
+def normalize_endpoint(url: str) -> str:
+    """Return the path of a url, with object ids replaced by {id} and uuids by {uuid}."""
+    return ID_SEGMENT.sub(
+        lambda match: "/{id}" if match[1].isdigit() else "/{uuid}", urlsplit(url).path
+    )
+
+
+class RequestCounter:
+    """Count the requests sent by method and endpoint, retries included."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts: Counter = Counter()
+
+    def __call__(self, record: RequestRecord):
+        with self.lock:
+            self.counts[f"{record.method} {record.endpoint}"] += 1
+
+    @property
+    def total(self) -> int:
+        with self.lock:
+            return sum(self.counts.values())
+
+    def by_endpoint(self) -> dict[str, int]:
+        with self.lock:
+            return dict(sorted(self.counts.items()))
+
+    def reset(self):
+        with self.lock:
+            self.counts.clear()
+
+
+@dataclass
+class EndpointStats:
+    count: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+
+
+class RequestStats:
+    """Sum the requests sent by method and endpoint, with their time, bytes and errors.
+
+    A request counts as an error if it failed or was answered with a 4xx or 5xx status.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def __call__(self, record: RequestRecord):
+        with self.lock:
+            stats = self.endpoints.setdefault(f"{record.method} {record.endpoint}", EndpointStats())
+            stats.count += 1
+            if record.error is not None or (record.status or 0) >= 400:
+                stats.errors += 1
+            stats.seconds += record.elapsed
+            stats.max_seconds = max(stats.max_seconds, record.elapsed)
+            stats.request_bytes += record.request_bytes
+            stats.response_bytes += record.response_bytes
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            endpoints = {
+                endpoint: asdict(stats) for endpoint, stats in sorted(self.endpoints.items())
+            }
+        return {
+            "total": sum(stats["count"] for stats in endpoints.values()),
+            "errors": sum(stats["errors"] for stats in endpoints.values()),
+            "seconds": sum(stats["seconds"] for stats in endpoints.values()),
+            "request_bytes": sum(stats["request_bytes"] for stats in endpoints.values()),
+            "response_bytes": sum(stats["response_bytes"] for stats in endpoints.values()),
+            "by_endpoint": endpoints,
+        }
+
+    def reset(self):
+        with self.lock:
+            self.endpoints.clear()
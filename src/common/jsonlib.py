@@ -0,0 +1,28 @@
+"""JSON encoding and decoding, through orjson when it is installed."""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Name of the backend in use
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data: bytes | str):
+    """Parse JSON from bytes or text, bytes are parsed without decoding them first.
+
+    Invalid documents raise a ValueError with either backend.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> str:
+    """Encode an object as compact JSON text."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
@@ -0,0 +1,187 @@
+import os
+import bisect
+import logging
+import tempfile
+import threading
+from collections import defaultdict
+from .instrumentation import RequestRecord
+
+logger = logging.getLogger("defectdojo_importer")
+
+PREFIX = "defectdojo_importer_http"
+# Upper bounds in seconds, imports can take minutes for DefectDojo to process
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((format_value(bound), total))
+        result.append(("+Inf", self.count))
+        return result
+
+
+def format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict) -> str:
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Metrics:
+    """Request metrics of HttpClient, rendered in the Prometheus text format.
+
+    Used as a HttpClient observer, requests are labelled by method and endpoint with the
+    object ids of the path removed, so the number of series stays bounded.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.durations: dict[tuple, Histogram] = {}
+        self.first_bytes: dict[tuple, Histogram] = {}
+        self.requests: dict[tuple, int] = defaultdict(int)
+        self.retries: dict[tuple, int] = defaultdict(int)
+        self.request_bytes: dict[tuple, int] = defaultdict(int)
+        self.response_bytes: dict[tuple, int] = defaultdict(int)
+
+    def __call__(self, record: RequestRecord):
+        key = (record.method, record.endpoint)
+        status = str(record.status) if record.status is not None else (record.error or "error")
+        with self.lock:
+            self.durations.setdefault(key, Histogram(self.buckets)).observe(record.elapsed)
+            if record.ttfb is not None:
+                self.first_bytes.setdefault(key, Histogram(self.buckets)).observe(record.ttfb)
+            self.requests[(*key, status)] += 1
+            if record.attempt > 1:
+                self.retries[key] += 1
+            self.request_bytes[key] += record.request_bytes
+            self.response_bytes[key] += record.response_bytes
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def counter(name: str, help_text: str, values: dict, label_names: tuple):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} counter")
+            for key, value in sorted(values.items()):
+                lines.append(f"{PREFIX}_{name}{format_labels(dict(zip(label_names, key)))} {value}")
+
+        def histogram(name: str, help_text: str, values: dict):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} histogram")
+            for (method, endpoint), hist in sorted(values.items()):
+                labels = {"method": method, "endpoint": endpoint}
+                for bound, count in hist.cumulative():
+                    bucket_labels = format_labels({**labels, "le": bound})
+                    lines.append(f"{PREFIX}_{name}_bucket{bucket_labels} {count}")
+                lines.append(f"{PREFIX}_{name}_sum{format_labels(labels)} {hist.sum!r}")
+                lines.append(f"{PREFIX}_{name}_count{format_labels(labels)} {hist.count}")
+
+        with self.lock:
+            histogram(
+                "request_duration_seconds",
+                "Time from sending a request until its response was read.",
+                self.durations,
+            )
+            histogram(
+                "time_to_first_byte_seconds",
+                "Time from sending a request until the response headers were received.",
+                self.first_bytes,
+            )
+            counter(
+                "requests_total",
+                "Requests sent, retries included, by response status or error.",
+                self.requests,
+                ("method", "endpoint", "status"),
+            )
+            counter(
+                "retries_total",
+                "Requests sent again after a failed attempt.",
+                self.retries,
+                ("method", "endpoint"),
+            )
+            counter(
+                "request_bytes_total",
+                "Bytes of request bodies sent.",
+                self.request_bytes,
+                ("method", "endpoint"),
+            )
+            counter(
+                "response_bytes_total",
+                "Bytes of response bodies received.",
+                self.response_bytes,
+                ("method", "endpoint"),
+            )
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Write the metrics atomically, as the node exporter textfile collector expects."""
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, prefix=".metrics-", suffix=".tmp", delete=False
+        ) as file:
+            file.write(self.render())
+        os.replace(file.name, path)
+
+
+class MetricsWriter:
+    """Write metrics to a file when stopped and, with an interval, while running."""
+
+    def __init__(self, metrics: Metrics, path: str, interval: float | None = None):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def write(self):
+        try:
+            self.metrics.write(self.path)
+        except OSError as err:
+            logger.error("Could not write metrics to %s: %s", self.path, err)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.write()
+
+    def __enter__(self) -> "MetricsWriter":
+        if self.interval:
+            self.thread = threading.Thread(
+                target=self.run, name="defectdojo-importer-metrics", daemon=True
+            )
+            self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.write()
+
+
+# Metrics of the requests sent by this process
+REGISTRY = Metrics()
@@ -0,0 +1,128 @@
+import os
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from uuid import uuid4
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class ReportFile:
+    """A report on disk that is read in chunks while it is uploaded."""
+
+    path: Path
+    digest: str | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.path)
+
+    def sha256(self, chunk_size: int = CHUNK_SIZE) -> str:
+        """Hash the contents of the report in a single streaming pass, once."""
+        if self.digest is None:
+            digest = hashlib.sha256()
+            for chunk in self.chunks(chunk_size):
+                digest.update(chunk)
+            self.digest = digest.hexdigest()
+        return self.digest
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE):
+        """Yield the contents of the report in chunks."""
+        with open(self.path, "rb") as file:
+            while chunk := file.read(chunk_size):
+                yield chunk
+
+
+class MultipartEncoder:
+    """Streaming multipart/form-data request body.
+
+    Takes the same fields and file tuples as the `data` and `files` arguments of requests,
+    but reads ReportFile contents in chunks as the body is sent, so memory use does not
+    depend on the size of the report.
+    """
+
+    def __init__(self, fields: dict, files: list, chunk_size: int = CHUNK_SIZE):
+        self.boundary = uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+        self.parts = self.build_parts(fields, files)
+        self.len = sum(
+            part.size if isinstance(part, ReportFile) else len(part) for part in self.parts
+        )
+        self.iterator = None
+        self.buffer = b""
+        self.position = 0
+
+    def build_parts(self, fields: dict, files: list) -> list:
+        """Build the body as a list of bytes and ReportFile parts."""
+        parts = []
+        for name, value in fields.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for item in values:
+                if item is None:
+                    continue
+                if not isinstance(item, bytes):
+                    item = str(item).encode()
+                parts.append(self.part_header(name) + item + b"\r\n")
+        for name, (filename, contents, content_type) in files:
+            if contents is None:
+                continue
+            parts.append(self.part_header(name, filename or name, content_type))
+            parts.append(contents if isinstance(contents, ReportFile) else bytes(contents))
+            parts.append(b"\r\n")
+        parts.append(f"--{self.boundary}--\r\n".encode())
+        return parts
+
+    def part_header(
+        self, name: str, filename: str | None = None, content_type: str | None = None
+    ) -> bytes:
+        disposition = f'form-data; name="{quote(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{quote(filename)}"'
+        header = f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type:
+            header += f"Content-Type: {content_type}\r\n"
+        return (header + "\r\n").encode()
+
+    def __len__(self) -> int:
+        return self.len
+
+    def __iter__(self):
+        for part in self.parts:
+            if isinstance(part, ReportFile):
+                yield from part.chunks(self.chunk_size)
+            else:
+                yield part
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes of the body, or the rest of it if size is negative."""
+        if self.iterator is None:
+            self.iterator = iter(self)
+        while size < 0 or len(self.buffer) < size:
+            chunk = next(self.iterator, None)
+            if chunk is None:
+                break
+            self.buffer += chunk
+        if size < 0:
+            data, self.buffer = self.buffer, b""
+        else:
+            data, self.buffer = self.buffer[:size], self.buffer[size:]
+        self.position += len(data)
+        return data
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Rewind the body, only seeking to the start is supported."""
+        if offset != 0 or whence != os.SEEK_SET:
+            raise OSError("MultipartEncoder can only be rewound to the start.")
+        self.iterator = None
+        self.buffer = b""
+        self.position = 0
+        return 0
+
+
+def quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\r", "").replace("\n", "")
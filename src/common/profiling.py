@@ -0,0 +1,198 @@
+import io
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator
+
+# The profilers are only imported once --profile is given
+if TYPE_CHECKING:
+    import cProfile
+
+logger = logging.getLogger("defectdojo_importer")
+
+# Functions listed in the summary, by time spent in the function itself
+TOP_FUNCTIONS = 10
+
+
+@dataclass
+class PhaseStats:
+    name: str
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak: int = 0
+
+
+@dataclass
+class ActivePhase:
+    name: str
+    memory: int
+    peak: int = 0
+
+
+def format_bytes(size: int) -> str:
+    for unit in ["B", "KiB", "MiB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class Profiler:
+    """Profile a run with cProfile and measure the phases of the import.
+
+    Each phase records its wall time and the CPU time of the process while it ran, while
+    profiling also the tracemalloc peak above the memory allocated when it started. Phases
+    run concurrently, such as the report preparation during the lookups, are each charged the
+    CPU time and memory of the whole process. On Python 3.12 and later every thread is
+    profiled, before only the main thread is.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.enabled = False
+        self.profile: "cProfile.Profile | None" = None
+        self.phases: dict[str, PhaseStats] = {}
+        self.active: list[ActivePhase] = []
+        self.peak = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def reset(self):
+        with self.lock:
+            self.phases = {}
+            self.active = []
+            self.peak = 0
+
+    def start(self):
+        import cProfile
+        import tracemalloc
+
+        self.reset()
+        tracemalloc.start()
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        self.enabled = True
+
+    def stop(self):
+        import tracemalloc
+
+        self.enabled = False
+        self.profile.disable()
+        self.wall = time.perf_counter() - self.wall
+        self.cpu = time.process_time() - self.cpu
+        with self.lock:
+            self.record_peak(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    def record_peak(self, peak: int):
+        """Charge the peak since the last reset to the running phases, called with the lock."""
+        self.peak = max(self.peak, peak)
+        for active in self.active:
+            active.peak = max(active.peak, peak - active.memory)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the enclosed block as a phase, its memory only while profiling."""
+        active = None
+        if self.enabled:
+            import tracemalloc
+
+            with self.lock:
+                memory, peak = tracemalloc.get_traced_memory()
+                # The peak is reset for the new phase, phases already running keep theirs
+                self.record_peak(peak)
+                tracemalloc.reset_peak()
+                active = ActivePhase(name, memory)
+                self.active.append(active)
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            with self.lock:
+                stats = self.phases.setdefault(name, PhaseStats(name))
+                stats.calls += 1
+                stats.wall += wall
+                stats.cpu += cpu
+                if active is not None and active in self.active:
+                    self.record_peak(tracemalloc.get_traced_memory()[1])
+                    self.active.remove(active)
+                    stats.peak = max(stats.peak, active.peak)
+
+    def timings(self) -> dict[str, dict]:
+        """Return the calls, wall and CPU seconds of each phase measured so far."""
+        with self.lock:
+            return {
+                name: {"calls": stats.calls, "wall": stats.wall, "cpu": stats.cpu}
+                for name, stats in self.phases.items()
+            }
+
+    def summary(self) -> str:
+        """Return the phase timings and the functions the most time was spent in."""
+        import pstats
+
+        rows = [("Phase", "Calls", "Wall (s)", "CPU (s)", "Peak memory")]
+        for stats in self.phases.values():
+            rows.append(
+                (
+                    stats.name,
+                    str(stats.calls),
+                    f"{stats.wall:.3f}",
+                    f"{stats.cpu:.3f}",
+                    format_bytes(stats.peak),
+                )
+            )
+        rows.append(("total", "1", f"{self.wall:.3f}", f"{self.cpu:.3f}", format_bytes(self.peak)))
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        lines = [
+            "  ".join(
+                value.ljust(width) if column == 0 else value.rjust(width)
+                for column, (value, width) in enumerate(zip(row, widths))
+            )
+            for row in rows
+        ]
+
+        functions = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=functions)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(TOP_FUNCTIONS)
+        # Skip the header of pstats up to the column titles
+        listing = functions.getvalue().splitlines()
+        start = next((i for i, line in enumerate(listing) if "ncalls" in line), len(listing))
+        return "\n".join(lines + [""] + [line for line in listing[start:] if line.strip()])
+
+    def dump(self, path: str):
+        """Write the cProfile statistics, readable with pstats or snakeviz."""
+        self.profile.dump_stats(path)
+
+
+# Phases of the run of this process, profiled by --profile
+PROFILER = Profiler()
+
+
+def phase(name: str):
+    """Measure a block as a phase of the run."""
+    return PROFILER.phase(name)
+
+
+@contextmanager
+def profiling(path: str) -> Iterator[Profiler]:
+    """Profile the enclosed run, writing the statistics to path and logging a summary."""
+    PROFILER.start()
+    try:
+        yield PROFILER
+    finally:
+        PROFILER.stop()
+        try:
+            PROFILER.dump(path)
+        except OSError as err:
+            logger.error("Could not write profile to %s: %s", path, err)
+        else:
+            logger.info("Profile written to %s", path)
+        logger.info("Time and memory of the run by phase:\n%s", PROFILER.summary())
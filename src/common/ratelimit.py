@@ -0,0 +1,88 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+@contextmanager
+def shared_buckets(path: str) -> Iterator[dict]:
+    """Hold an exclusive lock on a bucket state file, writing the state back when done."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    with open(fd, "r+", encoding="utf-8") as file:
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            try:
+                buckets = json.loads(file.read() or "{}")
+            except ValueError:
+                buckets = {}
+            yield buckets
+            file.seek(0)
+            file.truncate()
+            file.write(json.dumps(buckets))
+            file.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    """Token buckets limiting the requests per second of each endpoint family.
+
+    A bucket holds up to a second of requests, at least one, and refills at its rate. Every
+    request takes a token, requests finding the bucket empty reserve the next token and wait
+    for it, so concurrent requests are spaced out evenly instead of being sent in bursts.
+    With a path, the buckets are kept in that file under an exclusive lock and shared by
+    every process of the host using it.
+    """
+
+    def __init__(
+        self,
+        rates: dict[str, float],
+        path: str | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rates = {family: rate for family, rate in rates.items() if rate}
+        self.path = path
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        # Tokens left and time of the last update of each family
+        self.buckets: dict[str, list[float]] = {}
+
+    def take(self, buckets: dict, family: str) -> float:
+        rate = self.rates[family]
+        burst = max(rate, 1.0)
+        now = self.clock()
+        tokens, updated = buckets.get(family, [burst, now])
+        # The monotonic clock of a previous boot may be ahead
+        if updated > now:
+            tokens, updated = burst, now
+        tokens = min(burst, tokens + (now - updated) * rate) - 1
+        buckets[family] = [tokens, now]
+        return max(-tokens / rate, 0.0)
+
+    def reserve(self, family: str) -> float:
+        """Take a token of the bucket of a family, returning the seconds until it is due."""
+        if family not in self.rates:
+            return 0.0
+        with self.lock:
+            if self.path is None:
+                return self.take(self.buckets, family)
+            with shared_buckets(self.path) as buckets:
+                return self.take(buckets, family)
+
+    def acquire(self, family: str) -> float:
+        """Wait until a request of a family may be sent, returning the seconds waited."""
+        delay = self.reserve(family)
+        if delay > 0:
+            self.sleep(delay)
+        return delay
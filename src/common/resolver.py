@@ -0,0 +1,95 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class Step:
+    name: str
+    func: Callable
+    depends: tuple[str, ...]
+    started: float | None = None
+    finished: float | None = None
+
+    @property
+    def duration(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class Resolver:
+    """Run dependent lookups, each one as soon as the lookups it depends on are done.
+
+    Each step is called with the results of its dependencies as positional arguments, and
+    steps that do not depend on each other run concurrently.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.steps: dict[str, Step] = {}
+
+    def add(self, name: str, func: Callable, *depends: str):
+        """Add a step computing `name` from the results of the steps it depends on."""
+        self.steps[name] = Step(name, func, depends)
+
+    def run_step(self, step: Step, results: dict):
+        step.started = time.monotonic()
+        try:
+            return step.func(*(results[name] for name in step.depends))
+        finally:
+            step.finished = time.monotonic()
+
+    def resolve(self) -> dict:
+        """Run every step and return their results by name.
+
+        The first error raised by a step is raised once the running steps finished, steps
+        depending on a failed step are not run.
+        """
+        for step in self.steps.values():
+            unknown = [name for name in step.depends if name not in self.steps]
+            if unknown:
+                raise ValueError(f"Step {step.name} depends on unknown steps {unknown}.")
+
+        results = {}
+        pending = dict(self.steps)
+        running = {}
+        error = None
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="defectdojo-importer"
+        ) as executor:
+            while True:
+                if error is None:
+                    for name, step in list(pending.items()):
+                        if all(depend in results for depend in step.depends):
+                            del pending[name]
+                            running[executor.submit(self.run_step, step, results)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as err:
+                        error = error or err
+
+        if error is not None:
+            raise error
+        if pending:
+            raise ValueError(f"Steps {sorted(pending)} have circular dependencies.")
+        return results
+
+    def critical_path(self) -> tuple[list[str], float]:
+        """Return the chain of steps that determined the total time, and its duration."""
+        finished = [step for step in self.steps.values() if step.finished is not None]
+        if not finished:
+            return [], 0.0
+        step = max(finished, key=lambda step: step.finished)
+        path = [step]
+        while step.depends:
+            step = max((self.steps[name] for name in step.depends), key=lambda s: s.finished or 0)
+            path.append(step)
+        path.reverse()
+        return [step.name for step in path], sum(step.duration for step in path)
@@ -0,0 +1,114 @@
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from requests import Response
+from requests.exceptions import ConnectionError as RequestsConnectionError, ConnectTimeout
+from urllib3.exceptions import NewConnectionError
+
+IMPORT_PATHS = ["/api/v2/import-scan/", "/api/v2/reimport-scan/", "/api/v2/import-languages/"]
+
+
+def endpoint_family(url: str) -> str:
+    """Return the endpoint family used to select a retry policy for a url."""
+    path = urlparse(url).path
+    if any(path.endswith(import_path) for import_path in IMPORT_PATHS):
+        return "import"
+    # Dependency Track exposes a v1 api while DefectDojo exposes a v2 api.
+    if "/api/v1/" in path:
+        return "dtrack"
+    return "lookup"
+
+
+def retry_after(response: Response | None) -> float | None:
+    """Parse the Retry-After header (seconds or http date) of a response."""
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=timezone.utc)
+    return max((retry_date - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def is_connect_error(err: Exception) -> bool:
+    """Check if the request failed before anything was sent to the server."""
+    if isinstance(err, ConnectTimeout):
+        return True
+    if isinstance(err, RequestsConnectionError) and err.args:
+        return isinstance(getattr(err.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by a total time budget."""
+
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    total_timeout: float = 120.0
+    methods: list[str] = field(default_factory=lambda: ["GET", "HEAD", "OPTIONS"])
+    statuses: list[int] = field(default_factory=lambda: [429, 502, 503, 504])
+    # Retry connection errors after the request may have been sent (eg. connection reset).
+    retry_sent_errors: bool = True
+
+    def backoff(self, attempt: int) -> float:
+        """Return a full jitter backoff delay for the given attempt number."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def next_delay(
+        self,
+        method: str,
+        attempt: int,
+        remaining: float,
+        response: Response | None = None,
+        error: Exception | None = None,
+    ) -> float | None:
+        """Return the delay before the next attempt, or None if the request must not be retried."""
+        if attempt > self.max_retries or method.upper() not in self.methods:
+            return None
+        if response is not None:
+            if response.status_code not in self.statuses:
+                return None
+        elif error is not None:
+            if not self.retry_sent_errors and not is_connect_error(error):
+                return None
+        delay = retry_after(response)
+        if delay is None:
+            delay = self.backoff(attempt)
+        if delay > remaining:
+            return None
+        return delay
+
+
+def default_retry_policies(
+    lookup_retries: int = 3,
+    import_retries: int = 2,
+    dtrack_retries: int = 3,
+    total_timeout: float = 120.0,
+) -> dict[str, RetryPolicy]:
+    """Return the retry policies for each endpoint family."""
+    return {
+        "lookup": RetryPolicy(max_retries=lookup_retries, total_timeout=total_timeout),
+        # Imports are only retried when the server did not process the upload.
+        "import": RetryPolicy(
+            max_retries=import_retries,
+            backoff_base=2.0,
+            total_timeout=total_timeout,
+            methods=["POST"],
+            statuses=[429, 503],
+            retry_sent_errors=False,
+        ),
+        "dtrack": RetryPolicy(max_retries=dtrack_retries, total_timeout=total_timeout),
+    }
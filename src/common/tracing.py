@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+from .instrumentation import RequestRecord
+
+logger = logging.getLogger("defectdojo_importer")
+
+SERVICE_NAME = "defectdojo-importer"
+TRACE_FORMATS = ("chrome", "otlp")
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_ERROR = 2
+# Spans kept in memory, long running daemons drop the spans beyond it
+MAX_SPANS = 100_000
+
+
+@dataclass
+class Span:
+    """A timed phase of a run, times are nanoseconds since the epoch."""
+
+    name: str
+    span_id: str
+    parent_id: str | None
+    start: int
+    end: int = 0
+    attributes: dict = field(default_factory=dict)
+    thread_id: int = 0
+    thread_name: str = ""
+    kind: int = SPAN_KIND_INTERNAL
+    error: str | None = None
+
+    def set(self, **attributes):
+        """Add attributes, None values are left out."""
+        self.attributes.update(
+            {key: value for key, value in attributes.items() if value is not None}
+        )
+
+
+class NoopSpan:
+    """Span handed out while tracing is disabled."""
+
+    def set(self, **attributes):
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+def attribute_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_attributes(attributes: dict) -> list[dict]:
+    return [{"key": key, "value": attribute_value(value)} for key, value in attributes.items()]
+
+
+class Tracer:
+    """Record the phases of a run as spans and export them to a file.
+
+    Spans nest within the span that is open in the same thread, spans started in worker
+    threads belong to the root span of the run. Used as a HttpClient observer, every request
+    attempt is added as a client span of the phase that sent it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.spans: list[Span] = []
+            self.dropped = 0
+            self.trace_id = os.urandom(16).hex()
+            self.root: Span | None = None
+            # Span times are taken from the monotonic clock, anchored to the epoch once
+            self.epoch = time.time_ns() - time.perf_counter_ns()
+
+    def now(self) -> int:
+        return self.epoch + time.perf_counter_ns()
+
+    def current(self) -> Span | None:
+        stack = getattr(self.local, "stack", None)
+        return stack[-1] if stack else self.root
+
+    def start_span(self, name: str, start: int | None = None, /, **attributes) -> Span:
+        parent = self.current()
+        thread = threading.current_thread()
+        span = Span(
+            name,
+            os.urandom(8).hex(),
+            parent.span_id if parent else None,
+            start if start is not None else self.now(),
+            thread_id=thread.native_id or 0,
+            thread_name=thread.name,
+        )
+        span.set(**attributes)
+        return span
+
+    def finish_span(self, span: Span, end: int | None = None):
+        span.end = end if end is not None else self.now()
+        with self.lock:
+            if len(self.spans) < MAX_SPANS:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+
+    def add_span(self, name: str, start: int, end: int, /, **attributes) -> Span | None:
+        """Record a phase that was timed before tracing was enabled, times from now()."""
+        if not self.enabled:
+            return None
+        span = self.start_span(name, start, **attributes)
+        self.finish_span(span, end)
+        return span
+
+    @contextmanager
+    def span(self, name: str, /, **attributes) -> Iterator[Span | NoopSpan]:
+        """Time the enclosed block as a span, yielding it so attributes can be added."""
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+        span = self.start_span(name, **attributes)
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        self.local.stack.append(span)
+        try:
+            yield span
+        except BaseException as err:
+            span.error = f"{type(err).__name__}: {err}"
+            raise err
+        finally:
+            self.local.stack.pop()
+            self.finish_span(span)
+
+    def __call__(self, record: RequestRecord):
+        if not self.enabled:
+            return
+        end = self.now()
+        span = self.start_span(
+            f"{record.method} {record.endpoint}",
+            end - int(record.elapsed * 1e9),
+            **{
+                "http.request.method": record.method,
+                "url.full": record.url,
+                "http.route": record.endpoint,
+                "http.response.status_code": record.status,
+                "http.request.resend_count": record.attempt - 1 or None,
+                "http.request.body.size": record.request_bytes,
+                "http.response.body.size": record.response_bytes,
+                "http.time_to_first_byte": record.ttfb,
+            },
+        )
+        span.kind = SPAN_KIND_CLIENT
+        span.error = record.error
+        self.finish_span(span, end)
+
+    def chrome_trace(self) -> dict:
+        """Return the spans as Chrome trace events, each thread is shown as its own track."""
+        pid = os.getpid()
+        with self.lock:
+            spans = sorted(self.spans, key=lambda span: (span.start, -span.end))
+        events = []
+        threads = {}
+        for span in spans:
+            threads.setdefault(span.thread_id, span.thread_name)
+            args = dict(span.attributes)
+            if span.error:
+                args["error"] = span.error
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "http" if span.kind == SPAN_KIND_CLIENT else "importer",
+                    "ph": "X",
+                    "ts": span.start / 1000,
+                    "dur": (span.end - span.start) / 1000,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": args,
+                }
+            )
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": SERVICE_NAME}}
+        ] + [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def otlp_trace(self) -> dict:
+        """Return the spans as an OTLP/JSON ExportTraceServiceRequest."""
+        with self.lock:
+            spans = sorted(self.spans, key=lambda span: (span.start, -span.end))
+        otlp_spans = []
+        for span in spans:
+            otlp_span = {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": span.kind,
+                "startTimeUnixNano": str(span.start),
+                "endTimeUnixNano": str(span.end),
+                "attributes": otlp_attributes(
+                    {
+                        **span.attributes,
+                        "thread.id": span.thread_id,
+                        "thread.name": span.thread_name,
+                    }
+                ),
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            if span.error:
+                otlp_span["status"] = {"code": STATUS_CODE_ERROR, "message": span.error}
+            otlp_spans.append(otlp_span)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": otlp_attributes({"service.name": SERVICE_NAME})},
+                    "scopeSpans": [{"scope": {"name": "defectdojo_importer"}, "spans": otlp_spans}],
+                }
+            ]
+        }
+
+    def write(self, path: str, trace_format: str = "chrome"):
+        """Write the recorded spans to a file in the chrome or otlp format."""
+        trace = self.otlp_trace() if trace_format == "otlp" else self.chrome_trace()
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(trace, file)
+
+
+class TraceWriter:
+    """Trace a run under a root span and write its spans to a file when it ends.
+
+    Spans added before, such as the argument parsing, become children of the root span.
+    """
+
+    def __init__(self, tracer: Tracer, path: str, trace_format: str = "chrome", name: str = "run"):
+        self.tracer = tracer
+        self.path = path
+        self.trace_format = trace_format
+        self.name = name
+
+    def __enter__(self) -> Span:
+        self.tracer.enabled = True
+        with self.tracer.lock:
+            earlier = [span for span in self.tracer.spans if span.parent_id is None]
+        root = self.tracer.start_span(
+            self.name, min((span.start for span in earlier), default=None)
+        )
+        for span in earlier:
+            span.parent_id = root.span_id
+        self.tracer.root = root
+        return root
+
+    def __exit__(self, exc_type, exc, traceback):
+        root = self.tracer.root
+        if exc is not None:
+            root.error = f"{exc_type.__name__}: {exc}"
+        self.tracer.root = None
+        self.tracer.finish_span(root)
+        if self.tracer.dropped:
+            logger.warning("Dropped %s spans beyond the first %s.", self.tracer.dropped, MAX_SPANS)
+        try:
+            self.tracer.write(self.path, self.trace_format)
+        except OSError as err:
+            logger.error("Could not write trace to %s: %s", self.path, err)
+        finally:
+            self.tracer.enabled = False
+            self.tracer.reset()
+
+
+# Spans of the run of this process
+TRACER = Tracer()
+
+
+def span(name: str, /, **attributes):
+    """Time a block as a span of the current run, a no-op unless tracing is enabled."""
+    return TRACER.span(name, **attributes)
@@ -1,9 +1,15 @@
 import os
+import glob
+import errno
 from pathlib import Path
+from .multipart import ReportFile
 
 
 def get_files(filename: str | None = None, payload: bytes | None = None):
-    """Return a list of file tuples for HTTP file upload."""
+    """Return a list of file tuples for HTTP file upload.
+
+    The report itself is not read here, it is streamed from disk when uploaded.
+    """
     if filename is None:
         return [
             (
@@ -15,23 +21,55 @@ def get_files(filename: str | None = None, payload: bytes | None = None):
                 ),
             )
         ]
-    with open(Path(filename).expanduser().absolute(), "rb") as file:
-        contents = file.read()
-        if payload is not None:
-            contents = payload
-        files = [
+    path = Path(filename).expanduser().absolute()
+    # Fail early if the report is missing or unreadable
+    if not path.is_file():
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(path))
+    if not os.access(path, os.R_OK):
+        raise PermissionError(errno.EACCES, os.strerror(errno.EACCES), str(path))
+    contents = ReportFile(path) if payload is None else payload
+    files = [
+        (
+            "file",
             (
-                "file",
-                (
-                    os.path.basename(filename),
-                    contents,
-                    "application/octet-stream",
-                ),
-            )
-        ]
+                os.path.basename(filename),
+                contents,
+                "application/octet-stream",
+            ),
+        )
+    ]
     return files
 
 
+def get_report_files(
+    patterns: list[str] | str | Path | None, test_type_name: str
+) -> list[tuple[str, str]]:
+    """Expand file, glob and directory arguments into (filename, test type) pairs.
+
+    Each argument may end with `=<test type>` to override the default test type.
+    """
+    if patterns is None:
+        return []
+    if isinstance(patterns, (str, Path)):
+        patterns = [patterns]
+    reports = []
+    for pattern in map(str, patterns):
+        test_type = test_type_name
+        if "=" in pattern and not os.path.exists(pattern):
+            pattern, test_type = pattern.rsplit("=", 1)
+        path = Path(pattern).expanduser()
+        if path.is_dir():
+            filenames = sorted(str(file) for file in path.iterdir() if file.is_file())
+        elif any(char in pattern for char in "*?["):
+            filenames = sorted(
+                file for file in glob.glob(str(path), recursive=True) if os.path.isfile(file)
+            )
+        else:
+            filenames = [str(path)]
+        reports.extend((filename, test_type.strip()) for filename in filenames)
+    return reports
+
+
 def get_service_keys(service_keys_csv: str, position: int = 0):
     """Return the service key at the given position from a CSV string."""
     service_keys = service_keys_csv.split(",", maxsplit=2)
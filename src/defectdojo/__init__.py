@@ -1,4 +1,5 @@
 from http_client import HttpClient
+from common.cache import LookupCache
 from .product_api_scan import ProductApiScan
 from .product_types import ProductTypes
 from .products import Products
@@ -8,23 +9,27 @@ from .tests import Tests
 from .scans import Scans
 from .languages import Languages
 from .tool_configurations import ToolConfigurations
+from .pagination import DEFAULT_PAGE_SIZE, paginate
 
 
 class DefectDojo:
-    def __init__(self, client: HttpClient, api_key: str):
+    def __init__(self, client: HttpClient, api_key: str, cache: LookupCache | None = None):
         self.defectdojo_client = client
         self.defectdojo_client.headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
             "Authorization": "Token " + api_key,
         }
+        self.cache = cache
+        if cache is not None and cache.response_hook not in client.session.hooks["response"]:
+            client.session.hooks["response"].append(cache.response_hook)
 
-        self.product_api_scan_configuration = ProductApiScan(self.defectdojo_client)
-        self.product_types = ProductTypes(self.defectdojo_client)
-        self.products = Products(self.defectdojo_client)
-        self.engagements = Engagements(self.defectdojo_client)
-        self.test_types = TestTypes(self.defectdojo_client)
+        self.product_api_scan_configuration = ProductApiScan(self.defectdojo_client, cache)
+        self.product_types = ProductTypes(self.defectdojo_client, cache)
+        self.products = Products(self.defectdojo_client, cache)
+        self.engagements = Engagements(self.defectdojo_client, cache)
+        self.test_types = TestTypes(self.defectdojo_client, cache)
         self.tests = Tests(self.defectdojo_client)
         self.scans = Scans(self.defectdojo_client)
         self.languages = Languages(self.defectdojo_client)
-        self.tool_configurations = ToolConfigurations(self.defectdojo_client)
+        self.tool_configurations = ToolConfigurations(self.defectdojo_client, cache)
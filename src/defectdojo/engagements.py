@@ -1,48 +1,49 @@
-import json
 from http_client import HttpClient
+from common.tracing import span
+from common.cache import LookupCache, cached_lookup, cache_created
 from models.engagement import Engagement
+from .lookup import get_newest
+
+
+def lookup_params(engagement: Engagement) -> dict:
+    return {
+        "name": engagement.name,
+        "product": engagement.product,
+        "status": engagement.status.value,
+    }
 
 
 class Engagements:
 
-    def __init__(self, client: HttpClient):
+    def __init__(self, client: HttpClient, cache: LookupCache | None = None):
         self.client = client
+        self.cache = cache
         self.logger = self.client.logger
         self.endpoint = self.client.url + "/api/v2/engagements/"
 
+    @cached_lookup(lookup_params)
     def get(self, engagement: Engagement) -> int | None:
         """Fetch an engagement by name."""
-        response = self.client.request(
-            "GET",
-            self.endpoint,
-            params={
-                "name": engagement.name,
-                "product": engagement.product,
-                "status": engagement.status.value,
-            },
-        )
         try:
-            engagement_data = json.loads(response)
-            count = engagement_data["count"]
+            result = get_newest(self.client, self.endpoint, lookup_params(engagement))
         except Exception as err:
             self.logger.error(
                 f"An error occured while getting engagement for name {engagement.name}.",
                 exc_info=True,
             )
             raise err
-        if count < 1:
+        if result is None:
             self.logger.warning(f"Engagement not found for name {engagement.name}.")
             return None
-        result = max(engagement_data["results"], key=lambda ev: ev["id"])
         engagement_id = result["id"]
         self.logger.info(f"Engagement found, id: {engagement_id}")
         return engagement_id
 
+    @cache_created(lookup_params)
     def create(self, engagement: Engagement) -> int:
         """Create an engagement."""
-        response = self.client.request("POST", self.endpoint, data=engagement.to_dict())
+        engagement_data = self.client.request_json("POST", self.endpoint, data=engagement.to_dict())
         try:
-            engagement_data = json.loads(response)
             engagement_id = engagement_data["id"]
         except Exception as err:
             self.logger.error(
@@ -55,7 +56,10 @@ class Engagements:
 
     def get_or_create(self, engagement: Engagement) -> int:
         """Get or create an engagement."""
-        engagement_id = self.get(engagement)
-        if engagement_id is None:
-            engagement_id = self.create(engagement)
+        with span("get_or_create engagement", name=engagement.name) as current:
+            engagement_id = self.get(engagement)
+            created = engagement_id is None
+            if created:
+                engagement_id = self.create(engagement)
+            current.set(id=engagement_id, created=created)
         return engagement_id
@@ -1,4 +1,7 @@
 from http_client import HttpClient
+from common.multipart import MultipartEncoder
+from common.profiling import phase
+from .scans import load_response
 
 
 class Languages:
@@ -8,14 +11,20 @@ class Languages:
         self.logger = self.client.logger
         self.headers = {**(self.client.headers or {})}
 
-    def upload(self, product: int, files: list):
-        """Import a language and lines of code report."""
+    def upload(self, product: int, files: list) -> dict | None:
+        """Import a language and lines of code report, returning None if it failed."""
         endpoint = self.client.url + "/api/v2/import-languages/"
         if "Content-Type" in self.headers:
             del self.headers["Content-Type"]
         self.client.headers = self.headers
         try:
-            self.client.request("POST", endpoint, data={"product": product}, files=files)
+            body = MultipartEncoder({"product": product}, files)
+            with phase("upload"):
+                response = self.client.fetch(
+                    "POST", endpoint, data=body, headers={"Content-Type": body.content_type}
+                )
             self.logger.info("Language report imported successfully")
-        except Exception as err:
+        except Exception:
             self.logger.error("Import Failed!", exc_info=True)
+            return None
+        return load_response(response.content)
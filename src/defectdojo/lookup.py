@@ -0,0 +1,56 @@
+"""Lookups of the newest DefectDojo object matching a filter."""
+
+import logging
+from requests.exceptions import HTTPError
+from http_client import HttpClient
+from .pagination import paginate
+
+logger = logging.getLogger("defectdojo_importer")
+
+NEWEST_FIRST = {"o": "-id", "limit": 1}
+
+# Endpoints checked to honour the `o=-id` ordering, the first time a lookup matches several
+# objects, as filters without ordering ignore the parameter
+ordering_checked: set[str] = set()
+# Endpoints that rejected or ignored the ordering, their lookups fetch full pages instead
+ordering_rejected: set[str] = set()
+
+
+def newest_by_id(client: HttpClient, endpoint: str, params: dict) -> dict | None:
+    """Fetch every matching object and return the one with the highest id."""
+    return max(paginate(client, endpoint, params), key=lambda result: result["id"], default=None)
+
+
+def get_newest(client: HttpClient, endpoint: str, params: dict) -> dict | None:
+    """Return the newest object of an endpoint matching params, None if there is none.
+
+    The server is asked for a single object ordered by descending id, so the lookup stays
+    small however many objects match. The ordering of an endpoint is checked once, the first
+    time several objects match, and endpoints rejecting or ignoring it fall back to fetching
+    the matching objects and picking the highest id for the rest of the process.
+    """
+    if endpoint in ordering_rejected:
+        return newest_by_id(client, endpoint, params)
+
+    try:
+        data = client.request_json("GET", endpoint, params={**params, **NEWEST_FIRST})
+    except HTTPError as err:
+        if err.response is None or err.response.status_code != 400:
+            raise err
+        logger.debug("%s does not support ordering by id, fetching full pages.", endpoint)
+        ordering_rejected.add(endpoint)
+        return newest_by_id(client, endpoint, params)
+
+    if not data["results"]:
+        return None
+    newest = data["results"][0]
+    if data["count"] == 1 or endpoint in ordering_checked:
+        return newest
+
+    # Several objects match, check once that the server ordered them
+    checked = newest_by_id(client, endpoint, params)
+    ordering_checked.add(endpoint)
+    if checked is None or checked["id"] != newest["id"]:
+        logger.debug("%s ignores ordering by id, fetching full pages.", endpoint)
+        ordering_rejected.add(endpoint)
+    return checked
@@ -0,0 +1,54 @@
+"""Iteration over every object of a DefectDojo list endpoint."""
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from http_client import HttpClient
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def paginate(
+    client: HttpClient,
+    endpoint: str,
+    params: dict | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> Iterator[dict]:
+    """Yield the objects of a list endpoint, following the `next` links page by page.
+
+    Pages are only fetched as the objects are consumed. With prefetch, the next page is
+    fetched in the background while the current one is consumed. The query of each `next`
+    link is sent to `endpoint`, as DefectDojo builds the links from its own host name,
+    which is not always the one the client uses behind a proxy.
+    """
+
+    def fetch_page(url: str, page_params: dict | None) -> dict:
+        return client.request_json("GET", url, params=page_params)
+
+    def next_url(page: dict) -> str | None:
+        if not page.get("next"):
+            return None
+        return f"{endpoint}?{urlsplit(page['next']).query}"
+
+    first_params = {**(params or {}), "limit": page_size}
+    if not prefetch:
+        page = fetch_page(endpoint, first_params)
+        while True:
+            yield from page["results"]
+            url = next_url(page)
+            if url is None:
+                return
+            page = fetch_page(url, None)
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="defectdojo-importer")
+    try:
+        future = executor.submit(fetch_page, endpoint, first_params)
+        while future is not None:
+            page = future.result()
+            url = next_url(page)
+            future = executor.submit(fetch_page, url, None) if url else None
+            yield from page["results"]
+    finally:
+        # Do not wait for a prefetched page when iteration stops early
+        executor.shutdown(wait=False, cancel_futures=True)
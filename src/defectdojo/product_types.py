@@ -1,40 +1,43 @@
-import json
 from http_client import HttpClient
+from common.tracing import span
+from common.cache import LookupCache, cached_lookup, cache_created
 from models.product import ProductType
+from .lookup import get_newest
 
 
 class ProductTypes:
 
-    def __init__(self, client: HttpClient):
+    def __init__(self, client: HttpClient, cache: LookupCache | None = None):
         self.client = client
+        self.cache = cache
         self.logger = self.client.logger
         self.endpoint = self.client.url + "/api/v2/product_types/"
 
+    @cached_lookup(lambda product_type: {"name": product_type.name})
     def get(self, product_type: ProductType) -> int | None:
         """Fetch a product type by name."""
-        response = self.client.request("GET", self.endpoint, params={"name": product_type.name})
         try:
-            product_type_data = json.loads(response)
-            count = product_type_data["count"]
+            result = get_newest(self.client, self.endpoint, {"name": product_type.name})
         except Exception as err:
             self.logger.error(
                 f"An error occured while getting product type for name {product_type.name}.",
                 exc_info=True,
             )
             raise err
-        if count < 1:
+        if result is None:
             self.logger.warning(f"Product type not found for name {product_type.name}")
             return None
-        result = max(product_type_data["results"], key=lambda ev: ev["id"])
         product_type_id = result["id"]
         self.logger.info(f"Product type found, id: {product_type_id}")
         return product_type_id
 
+    @cache_created(lambda product_type: {"name": product_type.name})
     def create(self, product_type: ProductType) -> int:
         """Create a product type."""
-        response = self.client.request("POST", self.endpoint, data=product_type.to_json())
+        product_type_data = self.client.request_json(
+            "POST", self.endpoint, data=product_type.to_json()
+        )
         try:
-            product_type_data = json.loads(response)
             product_type_id = product_type_data["id"]
         except Exception as err:
             self.logger.error(
@@ -47,7 +50,10 @@ class ProductTypes:
 
     def get_or_create(self, product_type: ProductType) -> int:
         """Get or create a product type."""
-        product_type_id = self.get(product_type)
-        if product_type_id is None:
-            product_type_id = self.create(product_type)
+        with span("get_or_create product_type", name=product_type.name) as current:
+            product_type_id = self.get(product_type)
+            created = product_type_id is None
+            if created:
+                product_type_id = self.create(product_type)
+            current.set(id=product_type_id, created=created)
         return product_type_id
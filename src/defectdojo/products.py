@@ -1,39 +1,40 @@
-import json
 from http_client import HttpClient
+from common.tracing import span
+from common.cache import LookupCache, cached_lookup, cache_created
 from models.product import Product
+from .lookup import get_newest
 
 
 class Products:
 
-    def __init__(self, client: HttpClient):
+    def __init__(self, client: HttpClient, cache: LookupCache | None = None):
         self.client = client
+        self.cache = cache
         self.logger = self.client.logger
         self.endpoint = self.client.url + "/api/v2/products/"
 
+    @cached_lookup(lambda product: {"name": product.name})
     def get(self, product: Product) -> int | None:
         """Fetch a product by name."""
-        response = self.client.request("GET", self.endpoint, params={"name": product.name})
         try:
-            product_data = json.loads(response)
-            count = product_data["count"]
+            result = get_newest(self.client, self.endpoint, {"name": product.name})
         except Exception as err:
             self.logger.error(
                 f"An error occured while getting product for name {product.name}.", exc_info=True
             )
             raise err
-        if count < 1:
+        if result is None:
             self.logger.warning(f"Product not found for name {product.name}.")
             return None
-        result = max(product_data["results"], key=lambda ev: ev["id"])
         product_id = result["id"]
         self.logger.info("Product found, id: %s", product_id)
         return product_id
 
+    @cache_created(lambda product: {"name": product.name})
     def create(self, product: Product) -> int:
         """Create a product."""
-        response = self.client.request("POST", self.endpoint, data=product.to_json())
+        product_data = self.client.request_json("POST", self.endpoint, data=product.to_json())
         try:
-            product_data = json.loads(response)
             product_id = product_data["id"]
         except Exception:
             self.logger.error(
@@ -44,7 +45,10 @@ class Products:
 
     def get_or_create(self, product: Product) -> int:
         """Get or create a product."""
-        product_id = self.get(product)
-        if product_id is None:
-            product_id = self.create(product)
+        with span("get_or_create product", name=product.name) as current:
+            product_id = self.get(product)
+            created = product_id is None
+            if created:
+                product_id = self.create(product)
+            current.set(id=product_id, created=created)
         return product_id
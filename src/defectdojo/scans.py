@@ -1,5 +1,30 @@
+from common import jsonlib
 from models.scan import Scan
 from http_client import HttpClient
+from common.multipart import MultipartEncoder
+from common.tracing import span
+from common.profiling import phase
+
+
+def load_response(content: bytes) -> dict:
+    """Parse an import response, which may be empty.
+
+    An import that was processed is not failed for a response that can not be parsed.
+    """
+    try:
+        return jsonlib.loads(content) if content else {}
+    except ValueError:
+        return {}
+
+
+def upload_attributes(scan: Scan, endpoint: str, body: MultipartEncoder) -> dict:
+    return {
+        "endpoint": endpoint,
+        "bytes": len(body),
+        "scan_type": scan.scan_type,
+        "engagement": scan.engagement,
+        "test": scan.test,
+    }
 
 
 class Scans:
@@ -11,20 +36,32 @@ class Scans:
             del self.headers["Content-Type"]
         self.client.headers = self.headers
 
-    def upload(self, scan: Scan, files: list):
-        """Import scan findings."""
+    def upload(self, scan: Scan, files: list) -> dict | None:
+        """Import scan findings, returning the import response or None if it failed."""
         endpoint = self.client.url + "/api/v2/import-scan/"
         try:
-            self.client.request("POST", endpoint, data=scan.to_dict(), files=files)
+            body = MultipartEncoder(scan.to_dict(), files)
+            with phase("upload"), span("import-scan", **upload_attributes(scan, endpoint, body)):
+                response = self.client.fetch(
+                    "POST", endpoint, data=body, headers={"Content-Type": body.content_type}
+                )
             self.logger.info("Scan report imported successfully")
         except Exception:
             self.logger.error("Import Failed!", exc_info=True)
+            return None
+        return load_response(response.content)
 
-    def reupload(self, scan: Scan, files: list):
-        """Re-imports scan findings."""
+    def reupload(self, scan: Scan, files: list) -> dict | None:
+        """Re-imports scan findings, returning the import response or None if it failed."""
         endpoint = self.client.url + "/api/v2/reimport-scan/"
         try:
-            self.client.request("POST", endpoint, data=scan.to_dict(), files=files)
+            body = MultipartEncoder(scan.to_dict(), files)
+            with phase("upload"), span("reimport-scan", **upload_attributes(scan, endpoint, body)):
+                response = self.client.fetch(
+                    "POST", endpoint, data=body, headers={"Content-Type": body.content_type}
+                )
             self.logger.info("Scan report re-imported successfully")
         except Exception:
             self.logger.error("Re-import Failed!", exc_info=True)
+            return None
+        return load_response(response.content)
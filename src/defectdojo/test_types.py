@@ -1,41 +1,41 @@
 """Test types are required when importing findings."""
 
-import json
 from models.tests import TestType
 from http_client import HttpClient
+from common.cache import LookupCache, cached_lookup, cache_created
+from .lookup import get_newest
 
 
 class TestTypes:
-    def __init__(self, client: HttpClient):
+    def __init__(self, client: HttpClient, cache: LookupCache | None = None):
         self.client = client
+        self.cache = cache
         self.logger = self.client.logger
         self.endpoint = self.client.url + "/api/v2/test_types/"
 
+    @cached_lookup(lambda test_type: {"name": test_type.name})
     def get(self, test_type: TestType) -> int | None:
         """Get a test type."""
 
-        response = self.client.request("GET", self.endpoint, params={"name": test_type.name})
         try:
-            test_type_data = json.loads(response)
-            count = test_type_data["count"]
+            result = get_newest(self.client, self.endpoint, {"name": test_type.name})
         except Exception as err:
             self.logger.error(
                 f"An error occured while getting test type {test_type.name}.", exc_info=True
             )
             raise err
-        if count < 1:
+        if result is None:
             self.logger.warning(f"Test type {test_type.name} not found")
             return None
-        result = max(test_type_data["results"], key=lambda ev: ev["id"])
         test_type_id = result["id"]
         self.logger.info(f"Test type found, id: {test_type_id}")
         return test_type_id
 
+    @cache_created(lambda test_type: {"name": test_type.name})
     def create(self, test_type: TestType) -> int:
         """Create a test type."""
-        response = self.client.request("POST", self.endpoint, data=test_type.to_json())
+        test_type_data = self.client.request_json("POST", self.endpoint, data=test_type.to_json())
         try:
-            test_type_data = json.loads(response)
             test_type_id = test_type_data["id"]
         except Exception as err:
             self.logger.error(
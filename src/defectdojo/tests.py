@@ -1,6 +1,6 @@
-import json
 from models.tests import Test
 from http_client import HttpClient
+from .lookup import get_newest
 
 
 class Tests:
@@ -12,27 +12,32 @@ class Tests:
     def get(self, test: Test, metadata: dict = {}) -> int | None:
         """Get a test."""
 
-        response = self.client.request(
-            "GET",
-            self.endpoint,
-            params={
-                "title": test.title,
-                "engagement": test.engagement,
-                "test_type": test.test_type,
-                "tags__and": ",".join(test.tags),
-                **metadata,
-            },
-        )
+        params = {
+            "title": test.title,
+            "engagement": test.engagement,
+            "test_type": test.test_type,
+            "tags__and": ",".join(test.tags),
+            **metadata,
+        }
         try:
-            test_data = json.loads(response)
-            count = test_data["count"]
+            result = get_newest(self.client, self.endpoint, params)
         except Exception as err:
             self.logger.error(f"An error occured while getting test {test.title}.", exc_info=True)
             raise err
-        if count < 1:
+        if result is None:
             self.logger.warning(f"Test {test.title} not found. Will be created")
             return None
-        result = max(test_data["results"], key=lambda ev: ev["id"])
         test_id = result["id"]
         self.logger.info("Test found, id: %s", test_id)
         return test_id
+
+    def get_tags(self, test_id: int) -> list[str]:
+        """Get the tags of a test."""
+
+        test_data = self.client.request_json("GET", f"{self.endpoint}{test_id}/")
+        try:
+            tags = test_data.get("tags") or []
+        except Exception as err:
+            self.logger.error(f"An error occured while getting test {test_id}.", exc_info=True)
+            raise err
+        return tags
@@ -1,12 +1,31 @@
+import time
+import threading
 from logging import Logger
 import requests
-from requests.exceptions import HTTPError
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError, RequestException
 from urllib3.exceptions import InsecureRequestWarning
 from urllib3 import disable_warnings
+from common.retry import RetryPolicy, default_retry_policies, endpoint_family
+from common.instrumentation import RequestObserver, RequestRecord, body_size
+from common.http_logging import DEFAULT_BODY_LIMIT, LazyBody, LazyExchange
+from common import jsonlib
+from common.ratelimit import RateLimiter
 
 # Disable SSL Warnings
 disable_warnings(InsecureRequestWarning)
 
+DEFAULT_POOL_SIZE = 10
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Create a requests session backed by a keep-alive connection pool."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class HttpClient:
     """This class handles http requests"""
@@ -17,34 +36,191 @@ class HttpClient:
         headers: dict | None = None,
         ssl_verify: bool = True,
         logger: Logger = Logger(__name__),
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+        session: requests.Session | None = None,
+        retry_policies: dict[str, RetryPolicy] | None = None,
+        observers: list[RequestObserver] | None = None,
+        log_body_limit: int = DEFAULT_BODY_LIMIT,
+        rate_limiter: RateLimiter | None = None,
     ):
         self.url = url
         self.headers = headers
         self.ssl_verify = ssl_verify
         self.logger = logger
+        self.keep_alive = keep_alive
+        # Clients created for other services (eg. Dependency Track) can share the same pool.
+        self.session = session or create_session(pool_size)
+        self.retry_policies = retry_policies or default_retry_policies()
+        # Called with a RequestRecord after every attempt of a request
+        self.observers = observers if observers is not None else []
+        # Bytes of each body written to the debug log and to errors
+        self.log_body_limit = log_body_limit
+        # Paces the attempts of each endpoint family, retries included
+        self.rate_limiter = rate_limiter
+
+    def connection_stats(self) -> dict:
+        """Return the number of connections opened and reused by the session pool."""
+        connections = 0
+        requests_sent = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                connections += pool.num_connections
+                requests_sent += pool.num_requests
+        return {
+            "connections": connections,
+            "requests": requests_sent,
+            "reused": max(requests_sent - connections, 0),
+        }
+
+    def warm_up(self, connections: int = 1) -> list[threading.Thread]:
+        """Open pooled connections in the background, before the first request needs them.
+
+        Only the TCP and TLS handshakes are made, no request is sent. The connections are
+        put back into the pool the requests to the client url are sent through.
+        """
+        url = self.url.rstrip("/") + "/"
+        # Pools are keyed by the tls settings requests derives from the environment
+        settings = self.session.merge_environment_settings(url, {}, None, self.ssl_verify, None)
+        if not self.keep_alive or settings["proxies"]:
+            return []
+        request = requests.Request("GET", url).prepare()
+        adapter = self.session.get_adapter(url)
+        try:
+            pool = adapter.get_connection_with_tls_context(
+                request, settings["verify"], cert=settings["cert"]
+            )
+            # Take the connections out first, so that each thread opens a different one
+            pooled = [pool._get_conn() for _ in range(connections)]
+        except Exception as err:
+            self.logger.debug("Could not open connections to %s in advance: %s", url, err)
+            return []
+
+        def connect(connection):
+            try:
+                connection.connect()
+            except Exception as err:
+                self.logger.debug("Could not open connection to %s in advance: %s", url, err)
+            finally:
+                pool._put_conn(connection)
+
+        threads = [
+            threading.Thread(
+                target=connect, args=(connection,), name="defectdojo-importer-warm-up", daemon=True
+            )
+            for connection in pooled
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def retry_policy(self, url: str) -> RetryPolicy:
+        """Return the retry policy for the endpoint family of a url."""
+        family = endpoint_family(url)
+        return self.retry_policies.get(family) or RetryPolicy(max_retries=0)
+
+    def send(self, method: str, url: str, attempt: int, **kwargs) -> requests.Response:
+        """Send a single attempt of a request and notify the observers of its outcome."""
+        started = time.monotonic()
+        response = None
+        error = None
+        try:
+            response = self.session.request(method, url, **kwargs)
+            return response
+        except Exception as err:
+            error = type(err).__name__
+            raise err
+        finally:
+            if self.observers:
+                record = RequestRecord(method.upper(), url, None, time.monotonic() - started)
+                record.attempt = attempt
+                record.error = error
+                if response is not None:
+                    record.status = response.status_code
+                    record.ttfb = response.elapsed.total_seconds()
+                    record.request_bytes = body_size(response.request.body)
+                    record.response_bytes = len(response.content)
+                for observer in self.observers:
+                    observer(record)
 
     def request(self, method: str, url: str, **kwargs) -> str:
-        """Handle HTTP requests for different methods."""
+        """Handle HTTP requests for different methods, returning the response text."""
+        return self.fetch(method, url, **kwargs).text
+
+    def request_json(self, method: str, url: str, **kwargs):
+        """Send a request and parse its JSON response, None if the response is empty.
+
+        The response is parsed from its bytes, without decoding it to text first.
+        """
+        content = self.fetch(method, url, **kwargs).content
+        return jsonlib.loads(content) if content else None
+
+    def fetch(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request, retrying it according to the retry policy of its endpoint."""
         headers = self.headers
         if "headers" in kwargs:
             headers = {**(self.headers or {}), **(kwargs.get("headers") or {})}
             del kwargs["headers"]
+        if not self.keep_alive:
+            headers = {**(headers or {}), "Connection": "close"}
 
         # Set default timeout based on method
         timeout = 300 if method.upper() == "POST" else 120
         if "timeout" not in kwargs:
             kwargs["timeout"] = timeout
 
-        try:
-            response = requests.request(
-                method, url, headers=headers, verify=self.ssl_verify, **kwargs
+        family = endpoint_family(url)
+        policy = self.retry_policy(url)
+        deadline = time.monotonic() + policy.total_timeout
+        attempt = 0
+        while True:
+            attempt += 1
+            response = None
+            # Rewind streamed request bodies before each attempt
+            if hasattr(kwargs.get("data"), "seek"):
+                kwargs["data"].seek(0)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(family)
+            try:
+                response = self.send(
+                    method, url, attempt, headers=headers, verify=self.ssl_verify, **kwargs
+                )
+                response.raise_for_status()
+                break
+            except HTTPError as http_err:
+                delay = policy.next_delay(
+                    method, attempt, deadline - time.monotonic(), response=response
+                )
+                if delay is None:
+                    self.logger.error(
+                        "%s - %s",
+                        http_err,
+                        LazyBody(response.content, self.log_body_limit, response.encoding),
+                        exc_info=True,
+                    )
+                    raise http_err
+                reason = f"status {response.status_code}"
+            except RequestException as err:
+                delay = policy.next_delay(method, attempt, deadline - time.monotonic(), error=err)
+                if delay is None:
+                    self.logger.error("Could not make request. \n%s", err)
+                    raise err
+                reason = type(err).__name__
+            except Exception as err:
+                self.logger.error("Could not make request. \n%s", err)
+                raise err
+            self.logger.warning(
+                "%s %s failed with %s, retrying in %.2fs (retry %s of %s)",
+                method,
+                url,
+                reason,
+                delay,
+                attempt,
+                policy.max_retries,
             )
-            response.raise_for_status()
-        except HTTPError as http_err:
-            self.logger.error(f"{http_err} - {response.text}", exc_info=True)
-            raise http_err
-        except Exception as err:
-            self.logger.error(f"Could not make request. \n{err}")
-            raise err
-        self.logger.debug(response.text)
-        return response.text
+            time.sleep(delay)
+        # Formatted only if debug logging is enabled
+        self.logger.debug("%s", LazyExchange(response, self.log_body_limit))
+        return response
@@ -1 +1,10 @@
 from .importer import Importer
+
+
+def __getattr__(name: str):
+    # The asyncio importer is only loaded by the callers using it
+    if name == "AsyncImporter":
+        from .aio import AsyncImporter
+
+        return AsyncImporter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
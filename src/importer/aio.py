@@ -0,0 +1,48 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from arguments import main_parser
+from http_client import DEFAULT_POOL_SIZE, create_session
+from .importer import Importer, logger
+from .validations import validate_config
+
+
+class AsyncImporter:
+    """Run many imports concurrently from an event loop, on a bounded thread pool.
+
+    Each import runs the blocking Importer.execute on one of `max_concurrency` executor
+    threads, so at most `max_concurrency` imports run at a time however many are awaited.
+    All imports share one keep-alive connection pool.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_POOL_SIZE):
+        self.max_concurrency = max_concurrency
+        self.session = create_session(max_concurrency)
+        self.parser = main_parser()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="defectdojo-importer"
+        )
+
+    async def run(self, args: list[str]):
+        """Run a single import from cli arguments."""
+        parsed_args = self.parser.parse_args(args)
+        config = validate_config(parsed_args)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.executor, partial(Importer.execute, parsed_args, config, self.session)
+        )
+
+    async def run_many(self, args_list: list[list[str]]) -> list:
+        """Run many imports concurrently, returning the exception raised by each failed import."""
+        results = await asyncio.gather(
+            *(self.run(args) for args in args_list), return_exceptions=True
+        )
+        for args, result in zip(args_list, results):
+            if isinstance(result, BaseException):
+                logger.error("Import failed for %s: %s", args, result)
+        return results
+
+    def close(self):
+        """Release the executor and connection pool."""
+        self.executor.shutdown(wait=True)
+        self.session.close()
@@ -0,0 +1,301 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from models.config import Config
+from models.common import ReimportConditions
+from models.result import ImportResult, ImportStatus
+from models.exceptions import ConfigurationError
+from defectdojo import DefectDojo
+from common import utils
+from .findings import (
+    setup_product_engagement,
+    can_auto_create_context,
+    import_report_file,
+    import_result,
+    report_test_names,
+)
+from .validations import create_config
+
+logger = logging.getLogger("defectdojo_importer")
+
+# Error of the imports skipped after a failed import into the same test
+NOT_ATTEMPTED = "Not attempted, an earlier import into the same test failed."
+
+# Settings of the shared client, pool and cache can not change between imports
+GLOBAL_KEYS = [
+    "api_url",
+    "api_key",
+    "debug",
+    "pool_size",
+    "keep_alive",
+    "lookup_retries",
+    "import_retries",
+    "dtrack_retries",
+    "retry_budget",
+    "cache_dir",
+    "cache_ttl",
+    "cache_negative_ttl",
+    "workers",
+    "outbox",
+    "metrics_file",
+    "trace_file",
+    "trace_format",
+    "summary_json",
+    "log_body_limit",
+    "lookup_rate",
+    "import_rate",
+    "rate_limit_file",
+]
+
+
+@dataclass
+class BatchJob:
+    """A single report import of a batch manifest."""
+
+    index: int
+    config: Config
+    filename: str | None
+    auto_create_context: bool = False
+
+    @property
+    def context_key(self) -> tuple:
+        return (
+            self.config.product_type_name,
+            self.config.product_name,
+            str(self.config.engagement_name),
+        )
+
+    @property
+    def test_key(self) -> tuple:
+        # DefectDojo creates the context of these imports itself, so imports sharing it
+        # run in order to avoid creating the same product or engagement twice.
+        if self.auto_create_context:
+            return self.context_key
+        return self.context_key + self.import_key
+
+    @property
+    def import_key(self) -> tuple:
+        """Identify the test of an import within its context."""
+        return (self.config.test_type_name, str(self.config.test_name)) + self.reimport_key
+
+    @property
+    def reimport_key(self) -> tuple:
+        # The metadata resolve_test matches the test on, reports differing in it are
+        # imported into different tests
+        if not self.config.reimport:
+            return ()
+        match self.config.reimport_condition:
+            case ReimportConditions.BRANCH:
+                return (self.config.branch_tag,)
+            case ReimportConditions.COMMIT:
+                return (self.config.commit_hash,)
+            case ReimportConditions.BUILD:
+                return (self.config.build_id,)
+            case _:
+                return ()
+
+
+def load_manifest(path: str) -> list[dict]:
+    """Load the imports of a json or yaml batch manifest.
+
+    The manifest is either a list of imports, or a mapping with `imports` and optional
+    `defaults` applied to every import. Keys are config options, eg. product_name, plus
+    `file` with one or more report files, globs or directories.
+    """
+    manifest_path = Path(path)
+    try:
+        text = manifest_path.read_text(encoding="utf-8")
+    except OSError as err:
+        raise ConfigurationError(f"Could not read batch manifest {path}: {err}") from err
+
+    try:
+        if manifest_path.suffix.lower() in [".yaml", ".yml"]:
+            try:
+                import yaml
+            except ImportError as err:
+                raise ConfigurationError(
+                    "PyYAML is required for yaml manifests, install it or use a json manifest."
+                ) from err
+            data = yaml.safe_load(text)
+        else:
+            data = json.loads(text)
+    except ValueError as err:
+        raise ConfigurationError(f"Invalid batch manifest {path}: {err}") from err
+
+    defaults = {}
+    if isinstance(data, dict):
+        defaults = data.get("defaults") or {}
+        data = data.get("imports")
+    if not isinstance(data, list) or not data:
+        raise ConfigurationError(f"Batch manifest {path} does not contain any imports.")
+    if not isinstance(defaults, dict) or not all(isinstance(entry, dict) for entry in data):
+        raise ConfigurationError(f"Imports in batch manifest {path} must be mappings.")
+
+    return [{**defaults, **entry} for entry in data]
+
+
+def batch_jobs(config: Config, entries: list[dict]) -> list[BatchJob]:
+    """Validate the manifest entries and expand them into one job per report file."""
+    keys = set(Config.__dataclass_fields__.keys()) - set(GLOBAL_KEYS)
+    jobs = []
+    for number, entry in enumerate(entries, start=1):
+        entry = {key.replace("-", "_"): value for key, value in entry.items()}
+        unknown = sorted(set(entry) - keys - {"file"})
+        if unknown:
+            raise ConfigurationError(f"Unknown keys in import {number}: {', '.join(unknown)}.")
+
+        files = entry.pop("file", None)
+        try:
+            entry_config = create_config({**config.to_dict(), "test_name": None, **entry})
+        except ConfigurationError as err:
+            raise ConfigurationError(f"Import {number}: {err}") from err
+        except ValueError as err:
+            raise ConfigurationError(f"Import {number}: invalid value, {err}") from err
+
+        if files:
+            reports = utils.get_report_files(files, entry_config.test_type_name)
+            if not reports:
+                raise ConfigurationError(f"Import {number}: no report files found for {files}.")
+        elif entry_config.tool_configuration_name:
+            if not entry_config.tool_configuration_params:
+                raise ConfigurationError(
+                    f"Import {number}: tool configuration parameters are required."
+                )
+            reports = [(None, entry_config.test_type_name)]
+        else:
+            raise ConfigurationError(f"Import {number}: file or tool configuration is required.")
+
+        auto_create_context = can_auto_create_context(entry_config)
+        for (filename, test_type), test_name in zip(
+            reports, report_test_names(entry_config, reports)
+        ):
+            jobs.append(
+                BatchJob(
+                    len(jobs),
+                    replace(entry_config, test_type_name=test_type, test_name=test_name),
+                    filename,
+                    auto_create_context,
+                )
+            )
+    return jobs
+
+
+def resolve_contexts(
+    defectdojo: DefectDojo, jobs: list[BatchJob], workers: int
+) -> tuple[dict, dict]:
+    """Resolve the product type, product and engagement of every job.
+
+    Lookups run concurrently in three waves, distinct product types first, then distinct
+    products and finally distinct engagements, so no entity is created twice. Later waves
+    reuse the ids of earlier waves through the lookup cache.
+    """
+    contexts = {}
+    for job in jobs:
+        if not job.auto_create_context:
+            contexts.setdefault(job.context_key, job.config)
+
+    resolved = {}
+    errors = {}
+
+    def resolve(key: tuple, config: Config):
+        try:
+            resolved[key] = setup_product_engagement(defectdojo, config)
+        except Exception as err:
+            logger.error("Could not resolve %s: %s", " / ".join(key), err)
+            errors[key] = str(err)
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, workers), thread_name_prefix="defectdojo-importer"
+    ) as executor:
+        for depth in range(1, 4):
+            wave = {}
+            for key, config in contexts.items():
+                if key not in resolved and key not in errors:
+                    wave.setdefault(key[:depth], (key, config))
+            list(executor.map(lambda item: resolve(*item), wave.values()))
+
+    return resolved, errors
+
+
+def run_batch(
+    defectdojo: DefectDojo, jobs: list[BatchJob], workers: int, stop_on_failure: bool = False
+) -> list[ImportResult]:
+    """Import the jobs of a batch, running imports of different tests concurrently.
+
+    Imports of the same test run one after another in manifest order. With stop_on_failure,
+    the imports following a failed import into the same test are not attempted.
+    """
+    resolved, errors = resolve_contexts(defectdojo, jobs, workers)
+
+    def import_job(job: BatchJob) -> ImportResult:
+        if job.auto_create_context:
+            return import_report_file(defectdojo, job.config, job.filename)
+        if job.context_key in errors:
+            return import_result(
+                ImportStatus.FAILED,
+                job.config,
+                job.filename,
+                None,
+                error=errors[job.context_key],
+            )
+        return import_report_file(defectdojo, job.config, job.filename, resolved[job.context_key])
+
+    def import_group(group: list[BatchJob]) -> list[tuple[int, ImportResult]]:
+        results = []
+        for job in group:
+            if stop_on_failure and results and results[-1][1].status == ImportStatus.FAILED:
+                result = import_result(
+                    ImportStatus.FAILED,
+                    job.config,
+                    job.filename,
+                    None,
+                    error=NOT_ATTEMPTED,
+                )
+            else:
+                result = import_job(job)
+            results.append((job.index, result))
+        return results
+
+    groups = {}
+    for job in jobs:
+        groups.setdefault(job.test_key, []).append(job)
+
+    results = {}
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(workers, len(groups))), thread_name_prefix="defectdojo-importer"
+    ) as executor:
+        for group_results in executor.map(import_group, groups.values()):
+            results.update(group_results)
+
+    failed = [result for result in results.values() if result.status == ImportStatus.FAILED]
+    if failed:
+        logger.error("%s of %s batch imports failed.", len(failed), len(results))
+    return [results[job.index] for job in jobs]
+
+
+def write_results(path: str, jobs: list[BatchJob], results: list[ImportResult]):
+    """Write the aggregated results of a batch as json."""
+    summary = {status.value: 0 for status in ImportStatus}
+    for result in results:
+        summary[result.status.value] += 1
+    output = {
+        "summary": {"total": len(results), **summary},
+        "results": [
+            {
+                "product_type_name": job.config.product_type_name,
+                "product_name": job.config.product_name,
+                "engagement_name": job.config.engagement_name,
+                **result.to_dict(),
+            }
+            for job, result in zip(jobs, results)
+        ],
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(output, file, indent=2)
+    logger.info(
+        "Batch finished: %s. Results written to %s",
+        ", ".join(f"{count} {status}" for status, count in summary.items()),
+        path,
+    )
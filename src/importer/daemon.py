@@ -0,0 +1,415 @@
+import os
+import json
+import shutil
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlparse
+from uuid import uuid4
+from common.metrics import REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from models.config import Config
+from models.result import ImportResult, ImportStatus
+from models.exceptions import ConfigurationError
+from defectdojo import DefectDojo
+from .batch import BatchJob, batch_jobs, load_manifest
+from .findings import setup_product_engagement, import_report_file, import_result
+from .validations import to_bool
+
+logger = logging.getLogger("defectdojo_importer")
+
+# Number of finished imports whose status can still be queried
+MAX_FINISHED = 10000
+CHUNK_SIZE = 64 * 1024
+SPOOL_PATTERNS = ["*.import.json", "*.import.yaml", "*.import.yml"]
+
+
+@dataclass
+class QueuedImport:
+    """An import submitted to the daemon and its current status."""
+
+    id: str
+    job: BatchJob
+    status: str = "queued"
+    result: ImportResult | None = None
+    # Temporary directory of an uploaded report, removed once the import finished
+    workdir: str | None = None
+    source: str | None = None
+
+    def to_dict(self) -> dict:
+        status = {"id": self.id, "status": self.status}
+        if self.result is not None:
+            status.update(self.result.to_dict())
+        return status
+
+
+class ImportQueue:
+    """Queue of imports that keeps imports into the same test in order.
+
+    A queued reimport is replaced by a newer reimport into the same test, as only the latest
+    report would survive anyway, and a test is only imported by one worker at a time.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.pending = OrderedDict()
+        self.active = set()
+        self.stopped = False
+
+    def put(self, item: QueuedImport) -> QueuedImport | None:
+        """Queue an import, returning the queued import it replaced if any."""
+        with self.condition:
+            queued = self.pending.setdefault(item.job.test_key, [])
+            replaced = None
+            # Imports of auto-created contexts share a key with the other tests of the context
+            if (
+                queued
+                and item.job.config.reimport
+                and queued[-1].job.config.reimport
+                and queued[-1].job.import_key == item.job.import_key
+            ):
+                replaced = queued.pop()
+            queued.append(item)
+            self.condition.notify()
+            return replaced
+
+    def get(self) -> QueuedImport | None:
+        """Wait for the next import whose test is not being imported, None once stopped."""
+        with self.condition:
+            while not self.stopped:
+                key = next((key for key in self.pending if key not in self.active), None)
+                if key is not None:
+                    item = self.pending[key].pop(0)
+                    if not self.pending[key]:
+                        del self.pending[key]
+                    self.active.add(key)
+                    return item
+                self.condition.wait()
+            return None
+
+    def done(self, item: QueuedImport):
+        with self.condition:
+            self.active.discard(item.job.test_key)
+            self.condition.notify_all()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def drain(self) -> list[QueuedImport]:
+        """Remove and return the imports still queued."""
+        with self.condition:
+            items = [item for queued in self.pending.values() for item in queued]
+            self.pending.clear()
+            return items
+
+    def __len__(self) -> int:
+        with self.condition:
+            return sum(len(queued) for queued in self.pending.values())
+
+
+class ImportDaemon:
+    """Long running importer keeping its connection pool and lookup cache warm.
+
+    Imports are submitted over HTTP or as manifests dropped into a spool directory, and
+    forwarded to DefectDojo by `config.workers` worker threads.
+    """
+
+    def __init__(
+        self,
+        defectdojo: DefectDojo,
+        config: Config,
+        spool_dir: str | None = None,
+        spool_interval: float = 2.0,
+    ):
+        self.defectdojo = defectdojo
+        self.config = config
+        self.spool_dir = Path(spool_dir) if spool_dir else None
+        self.spool_interval = spool_interval
+        self.queue = ImportQueue()
+        self.imports = OrderedDict()
+        self.spool_files = {}
+        self.lock = threading.Lock()
+        # New products and engagements are created one at a time to avoid duplicates
+        self.context_lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.threads = []
+
+    def submit(
+        self, entries: list[dict], workdir: str | None = None, source: str | None = None
+    ) -> list[QueuedImport]:
+        """Validate manifest entries and queue their imports."""
+        try:
+            jobs = batch_jobs(self.config, entries)
+        except ConfigurationError:
+            if workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+            raise
+        items = []
+        for job in jobs:
+            item = QueuedImport(uuid4().hex, job, workdir=workdir, source=source)
+            with self.lock:
+                self.imports[item.id] = item
+            replaced = self.queue.put(item)
+            if replaced is not None:
+                logger.info("Import %s superseded by %s", replaced.id, item.id)
+                self.finish(
+                    replaced,
+                    import_result(
+                        ImportStatus.SKIPPED,
+                        replaced.job.config,
+                        replaced.job.filename,
+                        None,
+                        error=f"Superseded by import {item.id}.",
+                    ),
+                )
+            items.append(item)
+        return items
+
+    def status(self, import_id: str) -> dict | None:
+        with self.lock:
+            item = self.imports.get(import_id)
+        return item.to_dict() if item is not None else None
+
+    def process(self, job: BatchJob) -> ImportResult:
+        """Resolve the context of a job and import its report."""
+        if job.auto_create_context:
+            return import_report_file(self.defectdojo, job.config, job.filename)
+        try:
+            with self.context_lock:
+                engagement_config = setup_product_engagement(self.defectdojo, job.config)
+        except Exception as err:
+            logger.error("Could not resolve %s: %s", " / ".join(job.context_key), err)
+            return import_result(
+                ImportStatus.FAILED, job.config, job.filename, None, error=str(err)
+            )
+        return import_report_file(self.defectdojo, job.config, job.filename, engagement_config)
+
+    def finish(self, item: QueuedImport, result: ImportResult):
+        item.result = result
+        item.status = result.status.value
+        logger.info(
+            "%s (%s): %s%s",
+            item.job.config.product_name,
+            item.job.config.test_name,
+            item.status,
+            f", test id: {result.test_id}" if result.test_id else "",
+        )
+        if item.workdir:
+            shutil.rmtree(item.workdir, ignore_errors=True)
+        with self.lock:
+            # Forget the oldest finished imports
+            while len(self.imports) > MAX_FINISHED:
+                oldest = next(iter(self.imports.values()))
+                if oldest.result is None:
+                    break
+                self.imports.popitem(last=False)
+
+    def work(self):
+        while (item := self.queue.get()) is not None:
+            item.status = "running"
+            try:
+                result = self.process(item.job)
+            except Exception as err:
+                logger.error("Import %s failed: %s", item.id, err, exc_info=True)
+                result = import_result(
+                    ImportStatus.FAILED, item.job.config, item.job.filename, None, error=str(err)
+                )
+            self.finish(item, result)
+            self.queue.done(item)
+
+    def scan_spool(self):
+        """Queue the `*.import.json` or `*.import.yaml` manifests dropped into the spool directory.
+
+        Manifests are claimed by moving them to `processing/`, and moved to `done/` or
+        `failed/` with their results once their imports finished. Relative report paths
+        are resolved against the spool directory.
+        """
+        processing = self.spool_dir / "processing"
+        manifests = [path for pattern in SPOOL_PATTERNS for path in self.spool_dir.glob(pattern)]
+        for path in sorted(manifests):
+            if path.name.startswith("."):
+                continue
+            try:
+                os.replace(path, processing / path.name)
+            except FileNotFoundError:
+                continue
+            try:
+                entries = load_manifest(str(processing / path.name))
+                for entry in entries:
+                    if entry.get("file"):
+                        files = (
+                            entry["file"] if isinstance(entry["file"], list) else [entry["file"]]
+                        )
+                        entry["file"] = [str(self.spool_dir / file) for file in files]
+                items = self.submit(entries, source=path.name)
+            except ConfigurationError as err:
+                logger.error("Spooled manifest %s is invalid: %s", path.name, err)
+                self.write_spool_results("failed", path.name, error=str(err))
+                continue
+            logger.info("Queued %s imports from %s", len(items), path.name)
+            self.spool_files[path.name] = items
+
+        for name, items in list(self.spool_files.items()):
+            if all(item.result is not None for item in items):
+                failed = any(item.result.status == ImportStatus.FAILED for item in items)
+                self.write_spool_results("failed" if failed else "done", name, items=items)
+                del self.spool_files[name]
+
+    def write_spool_results(self, state: str, name: str, items=(), error: str | None = None):
+        results = {"results": [item.to_dict() for item in items]}
+        if error:
+            results["error"] = error
+        with open(self.spool_dir / state / name, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        (self.spool_dir / "processing" / name).unlink(missing_ok=True)
+
+    def watch_spool(self):
+        while True:
+            try:
+                self.scan_spool()
+            except OSError:
+                logger.error("Could not scan spool directory %s", self.spool_dir, exc_info=True)
+            if self.stopping.wait(self.spool_interval):
+                return
+
+    def start(self):
+        """Start the import workers and the spool directory watcher."""
+        targets = [self.work] * max(1, self.config.workers)
+        if self.spool_dir is not None:
+            for state in ["processing", "done", "failed"]:
+                (self.spool_dir / state).mkdir(parents=True, exist_ok=True)
+            # Requeue manifests claimed by a previous run that did not finish
+            for path in (self.spool_dir / "processing").iterdir():
+                os.replace(path, self.spool_dir / path.name)
+            targets.append(self.watch_spool)
+        for target in targets:
+            thread = threading.Thread(target=target, name="defectdojo-importer", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        """Stop after the running imports, imports still queued are skipped."""
+        self.stopping.set()
+        self.queue.stop()
+        for thread in self.threads:
+            thread.join()
+        for item in self.queue.drain():
+            # Removes the report received over HTTP
+            self.finish(
+                item,
+                import_result(
+                    ImportStatus.SKIPPED,
+                    item.job.config,
+                    item.job.filename,
+                    None,
+                    error="Daemon stopped before the import started.",
+                ),
+            )
+
+
+def query_entry(query: str) -> dict:
+    """Convert the query string of an ingest request into a manifest entry."""
+    bool_fields = [field.name for field in fields(Config) if field.type is bool]
+    entry = {}
+    for key, value in parse_qsl(query):
+        key = key.replace("-", "_")
+        entry[key] = to_bool(value) if key in bool_fields else value
+    return entry
+
+
+class ImportRequestHandler(BaseHTTPRequestHandler):
+    """Local ingest endpoint of the daemon.
+
+    POST /imports?product_name=...&test_type_name=... with the report as body queues an
+    import, GET /imports/<id> returns its status, GET /health the queue length and
+    GET /metrics the request metrics in Prometheus text format.
+    """
+
+    server: "ImportServer"
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip("/")
+        if path == "/metrics":
+            self.send_text(200, REGISTRY.render(), METRICS_CONTENT_TYPE)
+        elif path == "/health":
+            self.send_json(200, {"status": "ok", "queued": len(self.server.importer.queue)})
+        elif path.startswith("/imports/"):
+            status = self.server.importer.status(path.rsplit("/", 1)[-1])
+            if status is None:
+                self.send_json(404, {"error": "Import not found."})
+            else:
+                self.send_json(200, status)
+        else:
+            self.send_json(404, {"error": "Not found."})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/imports":
+            self.send_json(404, {"error": "Not found."})
+            return
+        if self.headers.get("Content-Length") is None:
+            self.send_json(411, {"error": "Content-Length is required."})
+            return
+        try:
+            remaining = int(self.headers["Content-Length"])
+        except ValueError:
+            remaining = -1
+        if remaining < 0:
+            self.send_json(400, {"error": "Content-Length must be a number of bytes."})
+            return
+
+        entry = query_entry(url.query)
+        filename = os.path.basename(entry.pop("filename", "") or "report")
+        workdir = tempfile.mkdtemp(prefix="defectdojo-importer-")
+        entry["file"] = os.path.join(workdir, filename)
+        # Stream the report to disk, it is streamed again from there when uploaded
+        with open(entry["file"], "wb") as file:
+            while remaining > 0:
+                chunk = self.rfile.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                file.write(chunk)
+                remaining -= len(chunk)
+        if remaining > 0:
+            shutil.rmtree(workdir, ignore_errors=True)
+            self.send_json(400, {"error": "Report is shorter than its Content-Length."})
+            return
+
+        try:
+            items = self.server.importer.submit([entry], workdir=workdir, source="http")
+        except ConfigurationError as err:
+            self.send_json(400, {"error": str(err)})
+            return
+        self.send_json(202, {"imports": [item.to_dict() for item in items]})
+
+    def send_text(self, status: int, body: str, content_type: str):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class ImportServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], importer: ImportDaemon):
+        super().__init__(address, ImportRequestHandler)
+        self.importer = importer
@@ -1,7 +1,22 @@
 import sys
+import argparse
 from importer import Importer
 
 
+def profile_path(args: list[str]) -> str | None:
+    """Return the --profile file, read ahead so the argument parsing is profiled as well."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profile")
+    return parser.parse_known_args(args)[0].profile
+
+
 def main():
     """Entry point for the DefectDojo Importer CLI."""
-    Importer.run(sys.argv[1:])
+    path = profile_path(sys.argv[1:])
+    if path is None:
+        Importer.run(sys.argv[1:])
+        return
+    from common.profiling import profiling
+
+    with profiling(path):
+        Importer.run(sys.argv[1:])
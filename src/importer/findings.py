@@ -1,3 +1,9 @@
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
 from http_client import HttpClient
 from models.config import Config
 from models.product import Product, ProductType
@@ -7,24 +13,36 @@ from models.scan import Scan
 from models.dtrack import Project, ProjectProperty
 from models.common import ReimportConditions
 from models.api_scan_configuration import ApiScanConfig
+from models.result import ImportResult, ImportStatus
 from models.exceptions import InvalidScanType, ConfigurationError
 from defectdojo import DefectDojo
 from integrations.dtrack import Dtrack
 from common import utils
+from common.multipart import ReportFile
+from common.resolver import Resolver
+from common.tracing import span
+from common.profiling import phase
+from .report_hash import (
+    get_report_hash,
+    is_report_unchanged,
+    record_report_hash,
+    report_hash_tag,
+)
 
+logger = logging.getLogger("defectdojo_importer")
 
-def setup_product_engagement(defectdojo: DefectDojo, config: Config) -> dict:
-    """Setup and validate engagement, product, test type, and API scan configuration."""
 
-    # Get Product type and Product
-    product_type = ProductType(
-        config.product_type_name, critical_product=config.critical_product
-    )
-    product_type_id = defectdojo.product_types.get_or_create(product_type)
+def resolve_product_type(defectdojo: DefectDojo, config: Config) -> int:
+    product_type = ProductType(config.product_type_name, critical_product=config.critical_product)
+    return defectdojo.product_types.get_or_create(product_type)
+
+
+def resolve_product(defectdojo: DefectDojo, config: Config, product_type_id: int) -> int:
     product = Product(config.product_name, product_type_id)
-    product_id = defectdojo.products.get_or_create(product)
+    return defectdojo.products.get_or_create(product)
+
 
-    # Get Engagement
+def resolve_engagement(defectdojo: DefectDojo, config: Config, product_id: int) -> int:
     engagement = Engagement(
         str(config.engagement_name),
         product_id,
@@ -32,33 +50,31 @@ def setup_product_engagement(defectdojo: DefectDojo, config: Config) -> dict:
         commit_hash=config.commit_hash,
         branch_tag=config.branch_tag,
     )
-    engagement_id = defectdojo.engagements.get_or_create(engagement)
-
-    return {
-        "product_id": product_id,
-        "product_type_id": product_type_id,
-        "engagement_id": engagement_id,
-    }
-
+    return defectdojo.engagements.get_or_create(engagement)
 
-def setup_test(defectdojo: DefectDojo, config: Config, engagement_config: dict) -> dict:
-    """Setup and validate test type and test."""
 
+def resolve_test_type(defectdojo: DefectDojo, config: Config) -> int:
     test_type = TestType(
         str(config.test_type_name),
         static_tool=config.static_tool,
         dynamic_tool=config.dynamic_tool,
     )
-    valid_test_type = defectdojo.test_types.get(test_type)
+    with span("lookup test_type", name=test_type.name) as current:
+        valid_test_type = defectdojo.test_types.get(test_type)
+        current.set(id=valid_test_type)
 
     if not valid_test_type:
         raise InvalidScanType(f"Test type '{config.test_type_name}' is not valid.")
+    return valid_test_type
 
-    # Get Test
+
+def resolve_test(
+    defectdojo: DefectDojo, config: Config, engagement_id: int, test_type_id: int
+) -> int | None:
     test = Test(
         str(config.test_name),
-        engagement_config["engagement_id"],
-        valid_test_type,
+        engagement_id,
+        test_type_id,
         build_id=config.build_id,
         commit_hash=config.commit_hash,
         branch_tag=config.branch_tag,
@@ -79,7 +95,60 @@ def setup_test(defectdojo: DefectDojo, config: Config, engagement_config: dict)
             case _:
                 pass
 
-    test_id = defectdojo.tests.get(test, test_metadata)
+    with span("lookup test", name=test.title, engagement=engagement_id) as current:
+        test_id = defectdojo.tests.get(test, test_metadata)
+        current.set(id=test_id)
+    return test_id
+
+
+def resolve_tool_configuration(defectdojo: DefectDojo, config: Config) -> int:
+    tool_configuration = defectdojo.tool_configurations.get(config.tool_configuration_name)
+    if not tool_configuration:
+        raise ConfigurationError(
+            f"Tool configuration '{config.tool_configuration_name}' not found."
+        )
+    return tool_configuration
+
+
+def resolve_api_scan(
+    defectdojo: DefectDojo, config: Config, product_id: int, tool_configuration: int
+) -> int:
+    api_scan = ApiScanConfig(
+        product_id,
+        tool_configuration,
+        service_key_1=utils.get_service_keys(str(config.tool_configuration_params), 0),
+        service_key_2=utils.get_service_keys(str(config.tool_configuration_params), 1),
+        service_key_3=utils.get_service_keys(str(config.tool_configuration_params), 2),
+    )
+    return defectdojo.product_api_scan_configuration.get_or_create(api_scan)
+
+
+def setup_product_engagement(defectdojo: DefectDojo, config: Config) -> dict:
+    """Setup and validate engagement, product, test type, and API scan configuration."""
+
+    with phase("resolution"):
+        # Get Product type and Product
+        product_type_id = resolve_product_type(defectdojo, config)
+        product_id = resolve_product(defectdojo, config, product_type_id)
+
+        # Get Engagement
+        engagement_id = resolve_engagement(defectdojo, config, product_id)
+
+    return {
+        "product_id": product_id,
+        "product_type_id": product_type_id,
+        "engagement_id": engagement_id,
+    }
+
+
+def setup_test(defectdojo: DefectDojo, config: Config, engagement_config: dict) -> dict:
+    """Setup and validate test type and test."""
+
+    with phase("resolution"):
+        valid_test_type = resolve_test_type(defectdojo, config)
+        test_id = resolve_test(
+            defectdojo, config, engagement_config["engagement_id"], valid_test_type
+        )
 
     return {
         "test_id": test_id,
@@ -87,64 +156,313 @@ def setup_test(defectdojo: DefectDojo, config: Config, engagement_config: dict)
     }
 
 
+def setup_import(defectdojo: DefectDojo, config: Config) -> tuple[dict, dict]:
+    """Resolve the engagement and test of an import.
+
+    Only the product type, product, engagement and test lookups depend on each other, the
+    test type and tool configuration are looked up concurrently with them.
+    """
+    resolver = Resolver()
+    resolver.add("product_type_id", lambda: resolve_product_type(defectdojo, config))
+    resolver.add("product_id", partial(resolve_product, defectdojo, config), "product_type_id")
+    resolver.add("engagement_id", partial(resolve_engagement, defectdojo, config), "product_id")
+    resolver.add("test_type_id", lambda: resolve_test_type(defectdojo, config))
+    resolver.add(
+        "test_id",
+        partial(resolve_test, defectdojo, config),
+        "engagement_id",
+        "test_type_id",
+    )
+    if config.tool_configuration_name:
+        resolver.add("tool_configuration", lambda: resolve_tool_configuration(defectdojo, config))
+        resolver.add(
+            "api_scan_id",
+            partial(resolve_api_scan, defectdojo, config),
+            "product_id",
+            "tool_configuration",
+        )
+
+    started = time.monotonic()
+    with phase("resolution"):
+        results = resolver.resolve()
+    path, latency = resolver.critical_path()
+    logger.debug(
+        "Resolved import context in %.3fs, critical path %s took %.3fs",
+        time.monotonic() - started,
+        " -> ".join(path),
+        latency,
+    )
+
+    engagement_config = {
+        "product_id": results["product_id"],
+        "product_type_id": results["product_type_id"],
+        "engagement_id": results["engagement_id"],
+    }
+    test_config = {
+        "test_id": results["test_id"],
+        "test_type_id": results["test_type_id"],
+        "api_scan_id": results.get("api_scan_id"),
+    }
+    return engagement_config, test_config
+
+
+def can_auto_create_context(config: Config) -> bool:
+    """Check if the import can let DefectDojo resolve the product and engagement by name."""
+    if not config.auto_create_context:
+        return False
+    if config.tool_configuration_name:
+        logger.warning("API scan imports need the product id, ignoring --auto-create-context.")
+        return False
+    if config.reimport and config.reimport_condition != ReimportConditions.DEFAULT:
+        logger.warning(
+            "Reimport condition '%s' needs a test lookup, ignoring --auto-create-context.",
+            config.reimport_condition.value,
+        )
+        return False
+    return True
+
+
 def import_findings(
     defectdojo: DefectDojo,
     config: Config,
     filename: str | None,
-    test_config: dict,
-    engagement_config: dict,
-):
-    """Import test findings into defectdojo API using the client."""
+    test_config: dict | None = None,
+    engagement_config: dict | None = None,
+    files: list | None = None,
+) -> ImportResult:
+    """Import test findings into defectdojo API using the client.
 
-    files = utils.get_files(filename)
-    api_scan_id = None
-    if config.tool_configuration_name:
-        tool_configuration = defectdojo.tool_configurations.get(
-            config.tool_configuration_name
+    Without a resolved engagement_config, the scan is reimported in a single request and
+    DefectDojo finds or creates the product type, product, engagement and test by name, so
+    that later runs reimport into the same test like resolved imports do. Files prepared by
+    prepare_report are uploaded instead of filename if given.
+    """
+
+    if files is None:
+        files = prepare_report(config, filename)
+    if engagement_config is None:
+        test_id = None
+        reimport = True
+        scan = Scan(
+            config.test_type_name,
+            config.product_name,
+            str(config.test_name),
+            None,
+            str(config.engagement_name),
+            product_type_name=config.product_type_name,
+            auto_create_context=True,
+            push_to_jira=config.push_to_jira,
+            build_id=config.build_id,
+            commit_hash=config.commit_hash,
+            branch_tag=config.branch_tag,
+            source_code_management_uri=config.scm_uri,
         )
-        if not tool_configuration:
-            raise ConfigurationError(
-                f"Tool configuration '{config.tool_configuration_name}' not found."
+    else:
+        test_id = test_config["test_id"]
+        reimport = test_id is not None
+        api_scan_id = test_config.get("api_scan_id")
+        if config.tool_configuration_name and api_scan_id is None:
+            tool_configuration = resolve_tool_configuration(defectdojo, config)
+            api_scan_id = resolve_api_scan(
+                defectdojo, config, engagement_config["product_id"], tool_configuration
             )
-        api_scan = ApiScanConfig(
-            engagement_config["product_id"],
-            tool_configuration,
-            service_key_1=utils.get_service_keys(
-                str(config.tool_configuration_params), 0
-            ),
-            service_key_2=utils.get_service_keys(
-                str(config.tool_configuration_params), 1
-            ),
-            service_key_3=utils.get_service_keys(
-                str(config.tool_configuration_params), 2
-            ),
+
+        scan = Scan(
+            config.test_type_name,
+            config.product_name,
+            str(config.test_name),
+            engagement_config["engagement_id"],
+            str(config.engagement_name),
+            test=test_id,
+            api_scan_id=api_scan_id,
+            push_to_jira=config.push_to_jira,
+            build_id=config.build_id,
+            commit_hash=config.commit_hash,
+            branch_tag=config.branch_tag,
+            source_code_management_uri=config.scm_uri,
         )
-        api_scan_id = defectdojo.product_api_scan_configuration.get_or_create(api_scan)
 
-    scan = Scan(
-        config.test_type_name,
-        config.product_name,
-        str(config.test_name),
-        engagement_config["engagement_id"],
-        str(config.engagement_name),
-        test=test_config["test_id"],
-        api_scan_id=api_scan_id,
-        push_to_jira=config.push_to_jira,
-        build_id=config.build_id,
-        commit_hash=config.commit_hash,
-        branch_tag=config.branch_tag,
-        source_code_management_uri=config.scm_uri,
-    )
+    details = report_details(config, files, engagement_config)
+    report_hash = None
+    if config.skip_unchanged:
+        report_hash = get_report_hash(files)
+        if report_hash is not None:
+            if is_report_unchanged(defectdojo, config, "findings", report_hash, test_id):
+                return import_result(ImportStatus.SKIPPED, config, filename, test_id, **details)
+            scan.tags.append(report_hash_tag(report_hash))
 
-    if test_config["test_id"] is None:
-        defectdojo.scans.upload(scan, files)
+    if reimport:
+        response = defectdojo.scans.reupload(scan, files)
     else:
-        defectdojo.scans.reupload(scan, files)
+        response = defectdojo.scans.upload(scan, files)
+    if response is None:
+        return import_result(ImportStatus.FAILED, config, filename, test_id, **details)
+
+    test_id = response.get("test") or test_id
+    # Imports creating the context return the ids DefectDojo resolved
+    for key in ["product_id", "engagement_id"]:
+        if response.get(key) is not None:
+            details.setdefault(key, response[key])
+    if report_hash is not None:
+        record_report_hash(defectdojo, config, "findings", report_hash, test_id)
+    status = ImportStatus.REIMPORTED if reimport else ImportStatus.IMPORTED
+    return import_result(status, config, filename, test_id, response=response, **details)
+
+
+def report_details(config: Config, files: list, engagement_config: dict | None) -> dict:
+    """Describe the uploaded report and the product and engagement it is imported into."""
+    details = {}
+    if engagement_config is not None:
+        details["product_id"] = engagement_config["product_id"]
+        details["engagement_id"] = engagement_config["engagement_id"]
+    for _, (_, contents, _) in files:
+        if isinstance(contents, ReportFile):
+            details["report_size"] = contents.size
+            # Hashed by prepare_report already, the digest is kept on the report
+            if config.skip_unchanged or config.summary_json:
+                details["report_sha256"] = contents.sha256()
+    return details
+
+
+def import_result(
+    status: ImportStatus, config: Config, filename: str | None, test_id: int | None, **kwargs
+) -> ImportResult:
+    return ImportResult(
+        status,
+        filename=str(filename) if filename else None,
+        test_type_name=config.test_type_name,
+        test_name=config.test_name,
+        test_id=test_id,
+        **kwargs,
+    )
+
+
+def report_test_names(config: Config, reports: list[tuple[str, str]]) -> list[str]:
+    """Name the test of each report after its test type.
+
+    Reports of the configured test type keep the configured test name when they are the only
+    one of their type, otherwise the file name is added to keep the tests apart.
+    """
+    test_types = [test_type for _, test_type in reports]
+    names = []
+    for filename, test_type in reports:
+        if test_types.count(test_type) > 1:
+            names.append(f"{test_type} ({os.path.basename(filename)})")
+        elif test_type == config.test_type_name:
+            names.append(str(config.test_name))
+        else:
+            names.append(test_type)
+    return names
+
+
+def import_report_file(
+    defectdojo: DefectDojo,
+    config: Config,
+    filename: str,
+    engagement_config: dict | None = None,
+) -> ImportResult:
+    """Resolve the test of a single report and import it."""
+    try:
+        with span("import_report", filename=filename, test_type=config.test_type_name) as current:
+            if engagement_config is None:
+                result = import_findings(defectdojo, config, filename)
+            else:
+                test_config = setup_test(defectdojo, config, engagement_config)
+                result = import_findings(
+                    defectdojo, config, filename, test_config, engagement_config
+                )
+            current.set(status=result.status.value, test_id=result.test_id)
+        return result
+    except Exception as err:
+        logger.error("Import of %s failed: %s", filename, err)
+        return import_result(ImportStatus.FAILED, config, filename, None, error=str(err))
+
+
+def import_report_files(
+    defectdojo: DefectDojo,
+    config: Config,
+    reports: list[tuple[str, str]],
+    engagement_config: dict | None = None,
+) -> list[ImportResult]:
+    """Import several reports into the same engagement with a bounded worker pool."""
+    configs = [
+        replace(config, test_type_name=test_type, test_name=test_name)
+        for (_, test_type), test_name in zip(reports, report_test_names(config, reports))
+    ]
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(config.workers, len(reports))),
+        thread_name_prefix="defectdojo-importer",
+    ) as executor:
+        results = list(
+            executor.map(
+                lambda report: import_report_file(
+                    defectdojo, report[1], report[0][0], engagement_config
+                ),
+                zip(reports, configs),
+            )
+        )
+
+    for result in results:
+        logger.info(
+            "%s (%s): %s%s",
+            result.filename,
+            result.test_type_name,
+            result.status.value,
+            f", test id: {result.test_id}" if result.test_id else "",
+        )
+    failed = [result for result in results if result.status == ImportStatus.FAILED]
+    if failed:
+        logger.error("%s of %s report imports failed.", len(failed), len(results))
+    return results
+
+
+def import_reports(
+    defectdojo: DefectDojo,
+    config: Config,
+    reports: list[tuple[str, str]],
+    engagement_config: dict | None = None,
+) -> list[ImportResult]:
+    """Import the reports given on the command line.
+
+    A single report of the configured test type is imported directly, anything else is
+    imported concurrently by import_report_files.
+    """
+    if not is_single_report(config, reports):
+        return import_report_files(defectdojo, config, reports, engagement_config)
+    filename = reports[0][0] if reports else None
+    if engagement_config is None:
+        return [import_findings(defectdojo, config, filename)]
+    test_config = setup_test(defectdojo, config, engagement_config)
+    return [import_findings(defectdojo, config, filename, test_config, engagement_config)]
+
+
+def is_single_report(config: Config, reports: list[tuple[str, str]]) -> bool:
+    """Check if the reports are a single report, or none, of the configured test type."""
+    return len(reports) <= 1 and all(test_type == config.test_type_name for _, test_type in reports)
+
+
+def prepare_report(config: Config, filename: str | None) -> list:
+    """Check the report and hash it if needed, so the upload can start right away."""
+    with phase("preparation"), span("prepare_report", filename=filename) as current:
+        files = utils.get_files(filename)
+        if config.skip_unchanged or config.summary_json:
+            current.set(sha256=get_report_hash(files))
+    return files
+
+
+def import_report(defectdojo: DefectDojo, config: Config, filename: str | None) -> ImportResult:
+    """Resolve the engagement and test of a single report concurrently and import it.
+
+    The report is prepared in the background while the lookups are running.
+    """
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="defectdojo-importer") as executor:
+        prepared = executor.submit(prepare_report, config, filename)
+        engagement_config, test_config = setup_import(defectdojo, config)
+        files = prepared.result()
+    return import_findings(defectdojo, config, filename, test_config, engagement_config, files)
 
 
-def integration_findings(
-    client: HttpClient, config: Config, engagement_id: int, type: str
-):
+def integration_findings(client: HttpClient, config: Config, engagement_id: int, type: str):
     """Integrate external tool findings into defectdojo API."""
 
     match type:
@@ -1,14 +1,36 @@
 import sys
+import json
+import signal
 import logging
-from .findings import setup_product_engagement, setup_test, import_findings, integration_findings
-from .languages import import_languages
+import threading
+from argparse import Namespace
+from contextlib import ExitStack
+from dataclasses import replace
+from typing import TYPE_CHECKING
 from .validations import validate_config
 from arguments import main_parser
-from http_client import HttpClient
-from defectdojo import DefectDojo
+from common import utils
+from common.cache import LookupCache
+from common.instrumentation import RequestCounter
+from common.metrics import REGISTRY, MetricsWriter
+from common.tracing import TRACER, TraceWriter
+from common.profiling import PROFILER, phase
+from models.config import Config
+from models.result import ImportResult
 from models.exceptions import ConfigurationError
 
+# requests and the DefectDojo client are only imported once an import runs, so that
+# printing the help or reporting a configuration error starts fast
+if TYPE_CHECKING:
+    import requests
+    from http_client import HttpClient
+    from defectdojo import DefectDojo
+
 LOGGER_NAME = "defectdojo_importer"
+# Lookups of the product type chain and of the test type start concurrently
+WARM_UP_CONNECTIONS = 2
+# Seconds between writes of the metrics file by batches and the daemon
+METRICS_INTERVAL = 15.0
 logging.basicConfig(format="%(levelname)s - %(message)s")
 logger = logging.getLogger(LOGGER_NAME)
 logger.setLevel(logging.INFO)
@@ -18,21 +40,176 @@ logger.propagate = True
 class Importer:
     @staticmethod
     def run(args: list[str]):
+        started = TRACER.now()
+        PROFILER.reset()
+        parser = main_parser()
         if len(args) == 0:
-            main_parser().print_help()
+            parser.print_help()
             sys.exit(0)
         else:
-            parsed_args = main_parser().parse_args(args)
+            parsed_args = parser.parse_args(args)
+            parsed = TRACER.now()
             try:
-                config = validate_config(parsed_args)
+                with phase("config"):
+                    config = validate_config(parsed_args)
             except ConfigurationError as e:
-                main_parser().print_help()
+                parser.print_help()
                 logger.error(f"Configuration error: {e}")
                 sys.exit(1)
-            client = HttpClient(config.api_url, ssl_verify=parsed_args.insecure, logger=logger)
-            defectdojo = DefectDojo(client, config.api_key)
+            if config.trace_file:
+                # Tracing is only known to be enabled once the configuration is validated
+                TRACER.enabled = True
+                TRACER.add_span("parse_arguments", started, parsed)
+                TRACER.add_span("validate_config", parsed, TRACER.now())
+            Importer.execute(parsed_args, config)
+
+    @staticmethod
+    def create_client(
+        config: Config, insecure: bool, session: "requests.Session | None" = None
+    ) -> "HttpClient":
+        """Create the DefectDojo client, optionally sharing an existing connection pool."""
+        from http_client import HttpClient
+        from common.retry import default_retry_policies
+        from common.ratelimit import RateLimiter
+
+        rate_limiter = None
+        if config.lookup_rate or config.import_rate:
+            # Shared by the concurrent imports sent through the client
+            rate_limiter = RateLimiter(
+                {"lookup": config.lookup_rate, "import": config.import_rate},
+                config.rate_limit_file,
+            )
+        observers = []
+        if config.metrics_file:
+            observers.append(REGISTRY)
+        if config.trace_file:
+            observers.append(TRACER)
+        if config.summary_json:
+            from .summary import REQUESTS
+
+            observers.append(REQUESTS)
+        return HttpClient(
+            config.api_url,
+            ssl_verify=insecure,
+            logger=logger,
+            pool_size=config.pool_size,
+            keep_alive=config.keep_alive,
+            session=session,
+            observers=observers,
+            log_body_limit=config.log_body_limit,
+            rate_limiter=rate_limiter,
+            retry_policies=default_retry_policies(
+                lookup_retries=config.lookup_retries,
+                import_retries=config.import_retries,
+                dtrack_retries=config.dtrack_retries,
+                total_timeout=config.retry_budget,
+            ),
+        )
+
+    @staticmethod
+    def create_cache(config: Config) -> LookupCache | None:
+        """Create the persistent lookup cache if a cache directory is configured."""
+        if not config.cache_dir:
+            return None
+        return LookupCache(
+            config.api_url,
+            config.cache_dir,
+            ttl=config.cache_ttl,
+            negative_ttl=config.cache_negative_ttl,
+        )
+
+    @staticmethod
+    def execute(parsed_args: Namespace, config: Config, session: "requests.Session | None" = None):
+        """Run an import of a validated configuration, writing metrics, traces and the summary
+        if configured."""
+        with ExitStack() as stack:
+            if config.metrics_file:
+                # Long running commands keep the metrics file up to date while they run
+                live = parsed_args.sub_command in ["batch", "serve", "flush"]
+                stack.enter_context(
+                    MetricsWriter(REGISTRY, config.metrics_file, METRICS_INTERVAL if live else None)
+                )
+            if config.trace_file:
+                root = stack.enter_context(
+                    TraceWriter(
+                        TRACER,
+                        config.trace_file,
+                        config.trace_format,
+                        parsed_args.sub_command or "import",
+                    )
+                )
+                root.set(
+                    product_name=config.product_name or None,
+                    import_type=getattr(parsed_args, "import_type", None),
+                )
+            summary = None
+            if config.summary_json:
+                from .summary import SummaryWriter
+
+                summary = stack.enter_context(
+                    SummaryWriter(
+                        config.summary_json,
+                        parsed_args.sub_command or "import",
+                        config,
+                        getattr(parsed_args, "import_type", None),
+                    )
+                )
+            results = Importer.dispatch(parsed_args, config, session)
+            if summary is not None:
+                summary.results = results
+
+    @staticmethod
+    def dispatch(
+        parsed_args: Namespace, config: Config, session: "requests.Session | None" = None
+    ) -> list[ImportResult]:
+        """Run the import or sub-command of a validated configuration, returning its results."""
+        from http_client import HttpClient
+        from defectdojo import DefectDojo
+        from .findings import (
+            setup_product_engagement,
+            import_reports,
+            integration_findings,
+            can_auto_create_context,
+            is_single_report,
+            import_report,
+        )
+        from .languages import import_languages
+        from .outbox import enqueue_reports
+
+        if parsed_args.sub_command == "batch":
+            return Importer.execute_batch(parsed_args, config, session)
+        if parsed_args.sub_command == "serve":
+            Importer.serve(parsed_args, config, session)
+            return []
+        if parsed_args.sub_command == "flush":
+            return Importer.flush(parsed_args, config, session)
+        if parsed_args.sub_command is None and config.outbox:
+            reports = utils.get_report_files(parsed_args.file, config.test_type_name)
+            enqueue_reports(config.outbox, config, reports)
+            return []
+        client = Importer.create_client(config, parsed_args.insecure, session)
+        request_counter = RequestCounter()
+        client.observers.append(request_counter)
+        # Connect while the reports are listed and the first lookups are prepared
+        client.warm_up(WARM_UP_CONNECTIONS)
+        try:
+            defectdojo = DefectDojo(client, config.api_key, Importer.create_cache(config))
+            reports = utils.get_report_files(parsed_args.file, config.test_type_name)
+            if (
+                parsed_args.sub_command is None
+                and parsed_args.import_type == "findings"
+                and can_auto_create_context(config)
+            ):
+                return import_reports(defectdojo, config, reports)
+            if (
+                parsed_args.sub_command is None
+                and parsed_args.import_type == "findings"
+                and is_single_report(config, reports)
+            ):
+                return [import_report(defectdojo, config, reports[0][0] if reports else None)]
             engagement_config = setup_product_engagement(defectdojo, config)
 
+            results = []
             if parsed_args.sub_command == "integration":
                 match parsed_args.integration_type:
                     case "dtrack":
@@ -40,17 +217,132 @@ class Importer:
                             str(config.dtrack_api_url),
                             ssl_verify=parsed_args.insecure,
                             logger=logger,
+                            keep_alive=config.keep_alive,
+                            session=client.session,
+                            retry_policies=client.retry_policies,
+                            observers=client.observers,
+                            log_body_limit=client.log_body_limit,
+                            rate_limiter=client.rate_limiter,
                         )
-                integration_findings(
-                    client, config, engagement_config["engagement_id"], parsed_args.integration_type
-                )
+                with phase(parsed_args.integration_type):
+                    integration_findings(
+                        client,
+                        config,
+                        engagement_config["engagement_id"],
+                        parsed_args.integration_type,
+                    )
 
             elif parsed_args.import_type == "findings":
-                test_config = setup_test(defectdojo, config, engagement_config)
-                import_findings(
-                    defectdojo, config, parsed_args.file, test_config, engagement_config
-                )
+                results = import_reports(defectdojo, config, reports, engagement_config)
             elif parsed_args.import_type == "languages":
-                import_languages(
-                    defectdojo, config, engagement_config["product_id"], str(parsed_args.file)
+                results = [
+                    import_languages(
+                        defectdojo, config, engagement_config["product_id"], reports[0][0]
+                    )
+                ]
+
+            return results
+        finally:
+            stats = client.connection_stats()
+            logger.debug(
+                "HTTP connections opened: %s, reused: %s", stats["connections"], stats["reused"]
+            )
+            logger.debug(
+                "HTTP requests sent: %s %s", request_counter.total, request_counter.by_endpoint()
+            )
+
+    @staticmethod
+    def create_shared_defectdojo(
+        parsed_args: Namespace, config: Config, session: "requests.Session | None" = None
+    ) -> "DefectDojo":
+        """Create a DefectDojo client shared by the concurrent imports of a batch or daemon."""
+        from defectdojo import DefectDojo
+
+        # Every worker needs its own pooled connection
+        client = Importer.create_client(
+            replace(config, pool_size=max(config.pool_size, config.workers)),
+            parsed_args.insecure,
+            session,
+        )
+        # Products and engagements shared by several imports are only looked up once
+        cache = Importer.create_cache(config) or LookupCache(
+            config.api_url, ttl=config.cache_ttl, negative_ttl=config.cache_negative_ttl
+        )
+        return DefectDojo(client, config.api_key, cache)
+
+    @staticmethod
+    def execute_batch(
+        parsed_args: Namespace, config: Config, session: "requests.Session | None" = None
+    ) -> list[ImportResult]:
+        """Run the imports of a batch manifest through a shared client and lookup cache."""
+        from .batch import load_manifest, batch_jobs, run_batch, write_results
+
+        try:
+            jobs = batch_jobs(config, load_manifest(parsed_args.manifest))
+        except ConfigurationError as e:
+            logger.error(f"Configuration error: {e}")
+            sys.exit(1)
+
+        defectdojo = Importer.create_shared_defectdojo(parsed_args, config, session)
+        client = defectdojo.defectdojo_client
+        request_counter = RequestCounter()
+        client.observers.append(request_counter)
+        results = run_batch(defectdojo, jobs, config.workers)
+        write_results(parsed_args.results_file, jobs, results)
+
+        stats = client.connection_stats()
+        logger.debug(
+            "HTTP connections opened: %s, reused: %s", stats["connections"], stats["reused"]
+        )
+        logger.debug(
+            "HTTP requests sent: %s %s", request_counter.total, request_counter.by_endpoint()
+        )
+        return results
+
+    @staticmethod
+    def serve(parsed_args: Namespace, config: Config, session: "requests.Session | None" = None):
+        """Run the import daemon until it is interrupted or terminated."""
+        from .daemon import ImportDaemon, ImportServer
+
+        defectdojo = Importer.create_shared_defectdojo(parsed_args, config, session)
+        # Metrics are served on /metrics
+        if REGISTRY not in defectdojo.defectdojo_client.observers:
+            defectdojo.defectdojo_client.observers.append(REGISTRY)
+        daemon = ImportDaemon(defectdojo, config, parsed_args.spool_dir, parsed_args.spool_interval)
+        server = ImportServer((parsed_args.host, parsed_args.port), daemon)
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(
+                signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start()
+            )
+        daemon.start()
+        logger.info("Listening on http://%s:%s", *server.server_address[:2])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            daemon.stop()
+            logger.info("Importer daemon stopped.")
+
+    @staticmethod
+    def flush(
+        parsed_args: Namespace, config: Config, session: "requests.Session | None" = None
+    ) -> list[ImportResult]:
+        """Send the imports queued in the outbox."""
+        from .outbox import flush_outbox
+
+        defectdojo = Importer.create_shared_defectdojo(parsed_args, config, session)
+        try:
+            flushed = flush_outbox(defectdojo, config, parsed_args.max_attempts)
+        except ConfigurationError as e:
+            logger.error(f"Configuration error: {e}")
+            sys.exit(1)
+        if parsed_args.results_file:
+            with open(parsed_args.results_file, "w", encoding="utf-8") as file:
+                json.dump(
+                    {"results": [{"id": job_id, **result.to_dict()} for job_id, result in flushed]},
+                    file,
+                    indent=2,
                 )
+        return [result for _, result in flushed]
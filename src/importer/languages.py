@@ -1,10 +1,47 @@
+import logging
 from defectdojo import DefectDojo
 from models.config import Config
+from models.result import ImportResult, ImportStatus
 from common.utils import get_files
+from common.multipart import ReportFile
+from common.profiling import phase
+from .report_hash import get_report_hash, is_report_unchanged, record_report_hash
 
+logger = logging.getLogger("defectdojo_importer")
 
-def import_languages(defectdojo: DefectDojo, config: Config, product_id: int, filename: str):
-    """Import Languages and Lines of Code into DefectDojo API."""
 
-    files = get_files(filename)
-    return defectdojo.languages.upload(product_id, files)
+def import_languages(
+    defectdojo: DefectDojo, config: Config, product_id: int, filename: str
+) -> ImportResult:
+    """Import Languages and Lines of Code into DefectDojo API.
+
+    Languages imports have no test to tag, the hash of the last report is only kept in the
+    local lookup cache and unchanged reports are only skipped when it is enabled.
+    """
+
+    with phase("preparation"):
+        files = get_files(filename)
+        report_hash = (
+            get_report_hash(files) if config.skip_unchanged or config.summary_json else None
+        )
+    details = {"filename": str(filename), "product_id": product_id, "report_sha256": report_hash}
+    for _, (_, contents, _) in files:
+        if isinstance(contents, ReportFile):
+            details["report_size"] = contents.size
+    if config.skip_unchanged and defectdojo.cache is None:
+        logger.warning(
+            "Languages reports are only skipped with the lookup cache of --cache-dir, "
+            "uploading the report."
+        )
+    elif (
+        config.skip_unchanged
+        and report_hash is not None
+        and is_report_unchanged(defectdojo, config, "languages", report_hash)
+    ):
+        return ImportResult(ImportStatus.SKIPPED, **details)
+    response = defectdojo.languages.upload(product_id, files)
+    if response is None:
+        return ImportResult(ImportStatus.FAILED, **details)
+    if config.skip_unchanged and report_hash is not None:
+        record_report_hash(defectdojo, config, "languages", report_hash)
+    return ImportResult(ImportStatus.IMPORTED, response=response, **details)
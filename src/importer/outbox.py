@@ -0,0 +1,178 @@
+import os
+import json
+import time
+import shutil
+import logging
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from uuid import uuid4
+from models.config import Config
+from models.result import ImportResult, ImportStatus
+from models.exceptions import ConfigurationError
+from defectdojo import DefectDojo
+from .batch import GLOBAL_KEYS, NOT_ATTEMPTED, BatchJob, batch_jobs, run_batch
+from .findings import report_test_names
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+logger = logging.getLogger("defectdojo_importer")
+
+JOB_FILE = "job.json"
+FAILED_DIR = "failed"
+LOCK_FILE = ".lock"
+
+
+def write_durably(path: Path, data: bytes):
+    with open(path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def copy_durably(source: str, destination: Path):
+    with open(source, "rb") as report, open(destination, "wb") as file:
+        shutil.copyfileobj(report, file)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def enqueue_reports(outbox: str, config: Config, reports: list[tuple[str, str]]) -> list[str]:
+    """Queue one import per report in the outbox, without contacting DefectDojo.
+
+    Each import is a directory holding a copy of the report and a job.json with the
+    settings of the import. Directories are written under a hidden name and renamed once
+    complete, so `flush` never sees a partial import. Names sort in queueing order.
+    """
+    outbox_dir = Path(outbox)
+    outbox_dir.mkdir(parents=True, exist_ok=True)
+    settings = {
+        key: value
+        for key, value in config.to_dict().items()
+        if key not in GLOBAL_KEYS and key != "test_name"
+    }
+    if not reports:
+        # Imports from a tool configuration have no report file
+        reports = [(None, config.test_type_name)]
+
+    job_ids = []
+    for (filename, test_type), test_name in zip(reports, report_test_names(config, reports)):
+        job_id = f"{time.time_ns():020d}-{uuid4().hex[:8]}"
+        temp_dir = outbox_dir / f".{job_id}"
+        temp_dir.mkdir()
+        files = []
+        if filename is not None:
+            files.append(os.path.basename(filename))
+            copy_durably(filename, temp_dir / files[0])
+        job = {
+            "config": {**settings, "test_type_name": test_type, "test_name": test_name},
+            "files": files,
+            "attempts": 0,
+            "last_error": None,
+        }
+        write_durably(temp_dir / JOB_FILE, json.dumps(job, indent=2).encode())
+        os.rename(temp_dir, outbox_dir / job_id)
+        job_ids.append(job_id)
+        logger.info("Queued %s (%s) in outbox as %s", filename, test_type, job_id)
+    return job_ids
+
+
+@contextmanager
+def outbox_lock(outbox_dir: Path):
+    """Hold an exclusive lock on the outbox so concurrent flushes do not send imports twice."""
+    if fcntl is None:
+        yield
+        return
+    with open(outbox_dir / LOCK_FILE, "w") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError as err:
+            raise ConfigurationError(f"Outbox {outbox_dir} is being flushed already.") from err
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def load_jobs(config: Config, outbox_dir: Path) -> list[tuple[Path, dict, BatchJob | None]]:
+    """Load the queued imports in queueing order, with their batch job if they are valid."""
+    jobs = []
+    for job_dir in sorted(outbox_dir.iterdir()):
+        if job_dir.name.startswith(".") or not (job_dir / JOB_FILE).is_file():
+            continue
+        job = None
+        try:
+            job = json.loads((job_dir / JOB_FILE).read_text(encoding="utf-8"))
+            entry = {**job["config"], "file": [str(job_dir / file) for file in job["files"]]}
+            batch_job = batch_jobs(config, [entry])[0]
+        except (ValueError, KeyError, TypeError, ConfigurationError) as err:
+            logger.error("Queued import %s is invalid: %s", job_dir.name, err)
+            # Only keep what could be read from this job
+            job = job if isinstance(job, dict) else {}
+            attempts = job.get("attempts")
+            job = {
+                **job,
+                "attempts": attempts if isinstance(attempts, int) else 0,
+                "last_error": str(err),
+            }
+            batch_job = None
+        jobs.append((job_dir, job, batch_job))
+    return jobs
+
+
+def flush_outbox(
+    defectdojo: DefectDojo, config: Config, max_attempts: int = 10
+) -> list[tuple[str, ImportResult]]:
+    """Send the queued imports to DefectDojo and remove the ones that succeeded.
+
+    Imports into different tests are sent concurrently, imports into the same test in
+    queueing order, stopping at the first failure so a later report never overtakes an
+    earlier one. Failed imports stay queued for the next flush, until they have failed
+    max_attempts times and are moved to the `failed` directory. Imports not attempted after
+    an earlier failure keep their number of attempts.
+    """
+    outbox_dir = Path(str(config.outbox))
+    with outbox_lock(outbox_dir):
+        queued = load_jobs(config, outbox_dir)
+        valid = [(job_dir, job, batch_job) for job_dir, job, batch_job in queued if batch_job]
+        batch = [replace(batch_job, index=index) for index, (_, _, batch_job) in enumerate(valid)]
+        results = dict(
+            zip(
+                [job_dir for job_dir, _, _ in valid],
+                run_batch(defectdojo, batch, config.workers, stop_on_failure=True),
+            )
+        )
+
+        flushed = []
+        for job_dir, job, batch_job in queued:
+            if batch_job is None:
+                result = ImportResult(ImportStatus.FAILED, error=job["last_error"])
+            else:
+                result = results[job_dir]
+            flushed.append((job_dir.name, result))
+            if result.status != ImportStatus.FAILED:
+                shutil.rmtree(job_dir)
+                continue
+            if result.error == NOT_ATTEMPTED:
+                # Never sent, the import stays queued as it is
+                continue
+            job["attempts"] += 1
+            job["last_error"] = result.error or "Import failed."
+            write_durably(job_dir / f".{JOB_FILE}", json.dumps(job, indent=2).encode())
+            os.replace(job_dir / f".{JOB_FILE}", job_dir / JOB_FILE)
+            if batch_job is None or job["attempts"] >= max_attempts:
+                logger.error(
+                    "Queued import %s failed %s times, moving it to %s.",
+                    job_dir.name,
+                    job["attempts"],
+                    FAILED_DIR,
+                )
+                (outbox_dir / FAILED_DIR).mkdir(exist_ok=True)
+                os.rename(job_dir, outbox_dir / FAILED_DIR / job_dir.name)
+
+    sent = len([result for _, result in flushed if result.status != ImportStatus.FAILED])
+    logger.info("Flushed %s of %s queued imports.", sent, len(flushed))
+    return flushed
@@ -0,0 +1,84 @@
+import logging
+from defectdojo import DefectDojo
+from models.config import Config
+from common.multipart import ReportFile
+
+logger = logging.getLogger("defectdojo_importer")
+
+REPORT_HASH_TAG_PREFIX = "sha256:"
+
+
+def get_report_hash(files: list) -> str | None:
+    """Return the sha256 digest of the report file being uploaded."""
+    for _, (_, contents, _) in files:
+        if isinstance(contents, ReportFile):
+            return contents.sha256()
+    return None
+
+
+def report_hash_tag(report_hash: str) -> str:
+    return REPORT_HASH_TAG_PREFIX + report_hash
+
+
+def report_hash_params(config: Config, import_type: str) -> dict:
+    """Identify the test and reimport condition a report is imported into."""
+    return {
+        "report_hash": import_type,
+        "product": config.product_name,
+        "engagement": config.engagement_name,
+        "test": config.test_name,
+        "test_type": config.test_type_name,
+        "reimport_condition": config.reimport_condition.value,
+        "build_id": config.build_id,
+        "commit_hash": config.commit_hash,
+        "branch_tag": config.branch_tag,
+    }
+
+
+def is_report_unchanged(
+    defectdojo: DefectDojo,
+    config: Config,
+    import_type: str,
+    report_hash: str,
+    test_id: int | None = None,
+) -> bool:
+    """Check if a report matches the last one successfully imported into the same test.
+
+    The hash of the last import is read from the local lookup cache first, then from the
+    tags of the existing test so that it also works on ephemeral runners.
+    """
+    endpoint = defectdojo.tests.endpoint
+    if defectdojo.cache is not None:
+        hit, last_import = defectdojo.cache.get(endpoint, report_hash_params(config, import_type))
+        if hit and last_import and last_import["sha256"] == report_hash:
+            logger.info(
+                "Report unchanged since the last %s import, skipping upload. Test id: %s",
+                import_type,
+                last_import["test"],
+            )
+            return True
+    if test_id is not None and report_hash_tag(report_hash) in defectdojo.tests.get_tags(test_id):
+        logger.info(
+            "Report unchanged since the last %s import, skipping upload. Test id: %s",
+            import_type,
+            test_id,
+        )
+        return True
+    return False
+
+
+def record_report_hash(
+    defectdojo: DefectDojo,
+    config: Config,
+    import_type: str,
+    report_hash: str,
+    test_id: int | None = None,
+):
+    """Record the hash of a successfully imported report in the local lookup cache."""
+    if defectdojo.cache is None:
+        return
+    defectdojo.cache.set(
+        defectdojo.tests.endpoint,
+        report_hash_params(config, import_type),
+        {"sha256": report_hash, "test": test_id},
+    )
@@ -0,0 +1,77 @@
+import json
+import time
+import logging
+from datetime import datetime, timezone
+from common.instrumentation import RequestStats
+from common.profiling import PROFILER
+from models.config import Config
+from models.result import ImportResult, ImportStatus
+
+logger = logging.getLogger("defectdojo_importer")
+
+# Increased whenever fields of the summary change meaning or are removed
+SCHEMA_VERSION = 1
+
+# Requests of the run of this process, observed while a summary is written
+REQUESTS = RequestStats()
+
+
+class SummaryWriter:
+    """Write a json summary of a run when it ends, for dashboards and orchestrators.
+
+    The summary holds the result of every import with the resolved ids, the report size and
+    hash and the statistics returned by DefectDojo, the time spent per phase and the
+    requests sent per endpoint. Set results to the results of the run before it ends.
+    """
+
+    def __init__(self, path: str, command: str, config: Config, import_type: str | None = None):
+        self.path = path
+        self.command = command
+        self.config = config
+        self.import_type = import_type
+        self.results: list[ImportResult] = []
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+
+    def __enter__(self) -> "SummaryWriter":
+        REQUESTS.reset()
+        return self
+
+    def summary(self, error: str | None = None) -> dict:
+        counts = {status.value: 0 for status in ImportStatus}
+        for result in self.results:
+            counts[result.status.value] += 1
+        failed = error is not None or counts[ImportStatus.FAILED.value] > 0
+        # Ids shared by every import, such as the product of a single report
+        ids = {}
+        for key in ["product_id", "engagement_id", "test_id"]:
+            values = {getattr(result, key) for result in self.results}
+            if len(values) == 1:
+                ids[key] = values.pop()
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "command": self.command,
+            "import_type": self.import_type,
+            "status": "failed" if failed else "succeeded",
+            "error": error,
+            "started_at": self.started_at.isoformat(),
+            "duration": time.perf_counter() - self.started,
+            "product_type_name": self.config.product_type_name,
+            "product_name": self.config.product_name,
+            "engagement_name": self.config.engagement_name,
+            **ids,
+            "summary": {"total": len(self.results), **counts},
+            "imports": [result.to_dict() for result in self.results],
+            "phases": PROFILER.timings(),
+            "requests": REQUESTS.to_dict(),
+        }
+
+    def __exit__(self, exc_type, exc, traceback):
+        error = None
+        if exc is not None:
+            error = f"{exc_type.__name__}: {exc}"
+        try:
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump(self.summary(error), file, indent=2)
+        except OSError as err:
+            logger.error("Could not write summary to %s: %s", self.path, err)
@@ -1,40 +1,137 @@
+import os
 import logging
 from argparse import Namespace
 from config import env_config
 from models.config import Config
-from models.common import SeverityLevel, ReimportConditions
+from models.common import ImportTypes, SeverityLevel, ReimportConditions
 from models.exceptions import ConfigurationError
-from common.utils import get_branch_tag, get_build_id, get_commit_hash, get_scm_uri
+from common.tracing import TRACE_FORMATS
+from common.utils import (
+    get_branch_tag,
+    get_build_id,
+    get_commit_hash,
+    get_scm_uri,
+    get_report_files,
+)
 
 logger = logging.getLogger("defectdojo_importer")
 
 
+def to_bool(value) -> bool:
+    """Convert a cli or environment variable value to a boolean."""
+    if isinstance(value, str):
+        return value.strip().lower() not in ["", "0", "false", "no", "off"]
+    return bool(value)
+
+
+def to_number(merged_config: dict, key: str, default, cast=int, minimum=0):
+    """Convert a numeric setting, rejecting values that are not numbers or below minimum."""
+    value = merged_config.get(key, default)
+    name = key.replace("_", " ").capitalize()
+    try:
+        number = cast(value)
+    except (TypeError, ValueError) as err:
+        raise ConfigurationError(f"{name} must be a number, not {value}.") from err
+    if number < minimum:
+        raise ConfigurationError(f"{name} must be at least {minimum}, not {value}.")
+    return number
+
+
 def validate_config(args: Namespace) -> Config:
 
     merged_config = env_config(args)
     # merged_config_output = {key: value for key, value in merged_config.items() if key not in ["api_key", "dtrack_api_key"]}
 
+    # Manifests, daemon requests and queued imports provide the settings of each import
+    config_obj = create_config(
+        merged_config, require_import=args.sub_command not in ["batch", "serve", "flush"]
+    )
+
+    if config_obj.debug:
+        logger.setLevel(logging.DEBUG)
+
+    if args.sub_command == "integration":
+
+        match args.integration_type:
+            case "dtrack":
+                if not config_obj.dtrack_api_url:
+                    raise ConfigurationError("Dependency Track API URL is required.")
+                if not config_obj.dtrack_api_key:
+                    raise ConfigurationError("Dependency Track API Key is required.")
+
+                if not config_obj.dtrack_project_name:
+                    logger.warning(
+                        "If --dtrack-project-name or DD_DTRACK_PROJECT_NAME is not explicitly set, there may be errors."
+                    )
+                    config_obj.dtrack_project_name = config_obj.product_name
+                if not config_obj.dtrack_project_version:
+                    logger.warning(
+                        "If --dtrack-project-version or DD_DTRACK_PROJECT_VERSION is not explicitly set, there may be errors."
+                    )
+                    config_obj.dtrack_project_version = config_obj.branch_tag or config_obj.build_id
+
+    elif args.sub_command == "batch":
+        if not args.manifest:
+            raise ConfigurationError("Batch manifest is required.")
+        if not os.path.isfile(args.manifest):
+            raise ConfigurationError(f"Batch manifest {args.manifest} not found.")
+
+    elif args.sub_command == "serve":
+        if args.spool_dir and not os.path.isdir(args.spool_dir):
+            raise ConfigurationError(f"Spool directory {args.spool_dir} not found.")
+
+    elif args.sub_command == "flush":
+        if not config_obj.outbox:
+            raise ConfigurationError("Outbox directory is required.")
+        if not os.path.isdir(config_obj.outbox):
+            raise ConfigurationError(f"Outbox directory {config_obj.outbox} not found.")
+
+    elif config_obj.outbox and args.import_type != ImportTypes.FINDINGS.value:
+        raise ConfigurationError("Only findings imports can be queued in the outbox.")
+
+    elif config_obj.tool_configuration_name:
+        if not config_obj.tool_configuration_params:
+            raise ConfigurationError(
+                "Tool configuration parameters are required for the specified tool configuration."
+            )
+    elif not args.file:
+        raise ConfigurationError("File is required for import.")
+    else:
+        reports = get_report_files(args.file, config_obj.test_type_name)
+        if not reports:
+            raise ConfigurationError(f"No report files found for {args.file}.")
+        if len(reports) > 1 and args.import_type == ImportTypes.LANGUAGES.value:
+            raise ConfigurationError("Languages imports take a single report file.")
+
+    logger.debug(config_obj.to_json())
+    return config_obj
+
+
+def create_config(merged_config: dict, require_import: bool = True) -> Config:
+    """Create a Config from merged cli, environment and manifest values."""
+
     if not merged_config.get("api_url"):
         raise ConfigurationError("DefectDojo API URL is required.")
     if not merged_config.get("api_key"):
         raise ConfigurationError("DefectDojo API Key is required.")
-    if not merged_config.get("product_name"):
-        raise ConfigurationError("Product name is required.")
-    if not merged_config.get("product_type_name"):
-        raise ConfigurationError("Product type name is required.")
-    if not merged_config.get("test_type_name"):
-        raise ConfigurationError("Test type name is required.")
+    if require_import:
+        if not merged_config.get("product_name"):
+            raise ConfigurationError("Product name is required.")
+        if not merged_config.get("product_type_name"):
+            raise ConfigurationError("Product type name is required.")
+        if not merged_config.get("test_type_name"):
+            raise ConfigurationError("Test type name is required.")
 
     config_obj = Config(
         api_url=str(merged_config.get("api_url")),
         api_key=str(merged_config.get("api_key")),
-        product_name=str(merged_config.get("product_name")),
-        product_type_name=str(merged_config.get("product_type_name")),
+        product_name=str(merged_config.get("product_name") or ""),
+        product_type_name=str(merged_config.get("product_type_name") or ""),
         engagement_name=merged_config.get("engagement_name", "CI/CD Engagement"),
         critical_product=bool(merged_config.get("critical_product")),
         product_platform=merged_config.get("product_platform"),
         test_name=merged_config.get("test_name"),
-        test_type_name=str(merged_config.get("test_type_name")),
+        test_type_name=str(merged_config.get("test_type_name") or ""),
         tool_configuration_name=merged_config.get("tool_configuration_name"),
         tool_configuration_params=merged_config.get("tool_configuration_params"),
         static_tool=bool(merged_config.get("static_tool")),
@@ -55,40 +152,34 @@ def validate_config(args: Namespace) -> Config:
         dtrack_project_version=merged_config.get("dtrack_project_version"),
         dtrack_reimport=bool(merged_config.get("dtrack_reimport")),
         dtrack_reactivate=bool(merged_config.get("dtrack_reactivate")),
+        pool_size=to_number(merged_config, "pool_size", 10, minimum=1),
+        keep_alive=to_bool(merged_config.get("keep_alive", True)),
+        lookup_retries=to_number(merged_config, "lookup_retries", 3),
+        import_retries=to_number(merged_config, "import_retries", 2),
+        dtrack_retries=to_number(merged_config, "dtrack_retries", 3),
+        retry_budget=to_number(merged_config, "retry_budget", 120.0, float),
+        cache_dir=merged_config.get("cache_dir"),
+        cache_ttl=to_number(merged_config, "cache_ttl", 86400, float),
+        cache_negative_ttl=to_number(merged_config, "cache_negative_ttl", 300, float),
+        auto_create_context=to_bool(merged_config.get("auto_create_context", False)),
+        skip_unchanged=to_bool(merged_config.get("skip_unchanged", False)),
+        workers=to_number(merged_config, "workers", 4, minimum=1),
+        outbox=merged_config.get("outbox"),
+        metrics_file=merged_config.get("metrics_file"),
+        trace_file=merged_config.get("trace_file"),
+        trace_format=str(merged_config.get("trace_format", "chrome")).lower(),
+        summary_json=merged_config.get("summary_json"),
+        log_body_limit=to_number(merged_config, "log_body_limit", 2048),
+        lookup_rate=float(merged_config.get("lookup_rate", 0)),
+        import_rate=float(merged_config.get("import_rate", 0)),
+        rate_limit_file=merged_config.get("rate_limit_file"),
     )
+    if config_obj.lookup_rate < 0 or config_obj.import_rate < 0:
+        raise ConfigurationError("Request rates must not be negative.")
+    if config_obj.trace_format not in TRACE_FORMATS:
+        raise ConfigurationError(
+            f"Trace format must be one of {', '.join(TRACE_FORMATS)}, not {config_obj.trace_format}."
+        )
 
     config_obj.test_name = config_obj.test_name or config_obj.test_type_name
-
-    if config_obj.debug:
-        logger.setLevel(logging.DEBUG)
-
-    if args.sub_command == "integration":
-
-        match args.integration_type:
-            case "dtrack":
-                if not config_obj.dtrack_api_url:
-                    raise ConfigurationError("Dependency Track API URL is required.")
-                if not config_obj.dtrack_api_key:
-                    raise ConfigurationError("Dependency Track API Key is required.")
-
-                if not config_obj.dtrack_project_name:
-                    logger.warning(
-                        "If --dtrack-project-name or DD_DTRACK_PROJECT_NAME is not explicitly set, there may be errors."
-                    )
-                    config_obj.dtrack_project_name = config_obj.product_name
-                if not config_obj.dtrack_project_version:
-                    logger.warning(
-                        "If --dtrack-project-version or DD_DTRACK_PROJECT_VERSION is not explicitly set, there may be errors."
-                    )
-                    config_obj.dtrack_project_version = config_obj.branch_tag or config_obj.build_id
-
-    elif config_obj.tool_configuration_name:
-        if not config_obj.tool_configuration_params:
-            raise ConfigurationError(
-                "Tool configuration parameters are required for the specified tool configuration."
-            )
-    elif not args.file:
-        raise ConfigurationError("File is required for import.")
-
-    logger.info(config_obj.to_json())
     return config_obj
@@ -1,7 +1,8 @@
-import json
+from common import jsonlib
 from models.dtrack import Project, ProjectProperty
 from models.config import Config
 from http_client import HttpClient
+from common.tracing import span
 
 
 class Dtrack:
@@ -21,9 +22,8 @@ class Dtrack:
 
         enabled = None
         endpoint = self.client.url + "/api/v1/configProperty"
-        response = self.client.request("GET", endpoint)
         try:
-            config_data = json.loads(response)
+            config_data = self.client.request_json("GET", endpoint)
         except Exception as err:
             self.logger.error("An error occured while checking the integration status.")
             raise err
@@ -69,7 +69,7 @@ class Dtrack:
             },
         ]
         try:
-            self.client.request("POST", endpoint, data=json.dumps(payload))
+            self.client.request("POST", endpoint, data=jsonlib.dumps(payload))
         except Exception as err:
             self.logger.error(
                 "An error occured while updating the integration config. Check API key permissions or enable the integration manually"
@@ -81,9 +81,8 @@ class Dtrack:
     def get_project_uuid(self, project: Project) -> str:
         """Get a dependency track project uuid."""
         endpoint = self.client.url + "/api/v1/project/lookup"
-        response = self.client.request("GET", endpoint, params=project.to_dict())
         try:
-            project_data = json.loads(response)
+            project_data = self.client.request_json("GET", endpoint, params=project.to_dict())
             uuid = project_data["uuid"]
         except Exception as err:
             self.logger.error(
@@ -97,9 +96,8 @@ class Dtrack:
     def get_project_properties(self, properties: ProjectProperty):
         """Get Dependency Track project properties"""
         endpoint = self.client.url + f"/api/v1/project/{properties.uuid}/property"
-        response = self.client.request("GET", endpoint)
         try:
-            properties_data = json.loads(response)
+            properties_data = self.client.request_json("GET", endpoint)
         except Exception as err:
             self.logger.error(
                 "An error occured while getting the dependency track properties for project %s.",
@@ -135,25 +133,31 @@ class Dtrack:
             },
         ]
 
-        existing_properties = self.get_project_properties(properties)
+        with span(
+            "dtrack.update_project_properties",
+            project=properties.uuid,
+            engagement=properties.engagement,
+        ) as current:
+            existing_properties = self.get_project_properties(properties)
+            created = 0
 
-        for item in payload:
-            property_name = item["propertyName"]
+            for item in payload:
+                property_name = item["propertyName"]
 
-            # Check if the property with the same "propertyName" exists
-            property_exists = any(
-                prop["propertyName"] == property_name for prop in existing_properties
-            )
-
-            if property_exists:
-                # Perform the update for the existing property
-                self.client.request("POST", endpoint, data=json.dumps(item))
-            else:
-                # Create a new property
-                self.logger.info(
-                    "Creating Dependency Track project property: %s", property_name
+                # Check if the property with the same "propertyName" exists
+                property_exists = any(
+                    prop["propertyName"] == property_name for prop in existing_properties
                 )
-                self.client.request("PUT", endpoint, data=json.dumps(item))
-        return self.logger.info(
-            "Dependency Track project properties updated successfully"
-        )
+
+                if property_exists:
+                    # Perform the update for the existing property
+                    self.client.request("POST", endpoint, data=jsonlib.dumps(item))
+                else:
+                    # Create a new property
+                    self.logger.info(
+                        "Creating Dependency Track project property: %s", property_name
+                    )
+                    self.client.request("PUT", endpoint, data=jsonlib.dumps(item))
+                    created += 1
+            current.set(updated=len(payload) - created, created=created)
+        return self.logger.info("Dependency Track project properties updated successfully")
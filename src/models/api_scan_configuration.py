@@ -1,4 +1,4 @@
-import json
+from common import jsonlib
 from dataclasses import dataclass, asdict
 
 
@@ -14,4 +14,4 @@ class ApiScanConfig:
         return dict((x, y) for x, y in asdict(self).items() if y is not None)
 
     def to_json(self):
-        return json.dumps(self.to_dict())
+        return jsonlib.dumps(self.to_dict())
@@ -1,4 +1,4 @@
-import json
+from common import jsonlib
 from dataclasses import dataclass, asdict
 from .common import SeverityLevel, ReimportConditions
 
@@ -34,6 +34,27 @@ class Config:
     dtrack_project_version: str | None
     dtrack_reimport: bool
     dtrack_reactivate: bool
+    pool_size: int = 10
+    keep_alive: bool = True
+    lookup_retries: int = 3
+    import_retries: int = 2
+    dtrack_retries: int = 3
+    retry_budget: float = 120.0
+    cache_dir: str | None = None
+    cache_ttl: float = 86400
+    cache_negative_ttl: float = 300
+    auto_create_context: bool = False
+    skip_unchanged: bool = False
+    workers: int = 4
+    outbox: str | None = None
+    metrics_file: str | None = None
+    trace_file: str | None = None
+    trace_format: str = "chrome"
+    summary_json: str | None = None
+    log_body_limit: int = 2048
+    lookup_rate: float = 0.0
+    import_rate: float = 0.0
+    rate_limit_file: str | None = None
 
     def to_dict(self):
         result = {}
@@ -46,7 +67,7 @@ class Config:
         return result
 
     def to_json(self):
-        return json.dumps(
+        return jsonlib.dumps(
             {
                 key: value
                 for key, value in self.to_dict().items()
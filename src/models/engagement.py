@@ -1,4 +1,4 @@
-import json
+from common import jsonlib
 from datetime import date
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -38,4 +38,4 @@ class Engagement:
         return result
 
     def to_json(self):
-        return json.dumps(self.to_dict())
+        return jsonlib.dumps(self.to_dict())
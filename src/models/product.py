@@ -1,4 +1,4 @@
-import json
+from common import jsonlib
 from dataclasses import dataclass, field, asdict
 
 
@@ -16,7 +16,7 @@ class Product:
         return dict((x, y) for x, y in asdict(self).items() if y is not None)
 
     def to_json(self):
-        return json.dumps(self.to_dict())
+        return jsonlib.dumps(self.to_dict())
 
 
 @dataclass
@@ -30,4 +30,4 @@ class ProductType:
         return dict((x, y) for x, y in asdict(self).items() if y is not None)
 
     def to_json(self):
-        return json.dumps(self.to_dict())
+        return jsonlib.dumps(self.to_dict())
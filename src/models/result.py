@@ -0,0 +1,34 @@
+from dataclasses import dataclass, asdict
+from enum import Enum
+
+
+class ImportStatus(Enum):
+    IMPORTED = "imported"
+    REIMPORTED = "reimported"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+@dataclass
+class ImportResult:
+    status: ImportStatus
+    filename: str | None = None
+    report_size: int | None = None
+    report_sha256: str | None = None
+    test_type_name: str | None = None
+    test_name: str | None = None
+    product_id: int | None = None
+    engagement_id: int | None = None
+    test_id: int | None = None
+    response: dict | None = None
+    error: str | None = None
+
+    def to_dict(self):
+        result = {}
+        for key, value in asdict(self).items():
+            if value is not None:
+                if key == "status":
+                    result[key] = value.value
+                else:
+                    result[key] = value
+        return result
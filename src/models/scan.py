@@ -1,4 +1,4 @@
-import json
+from common import jsonlib
 from datetime import date
 from dataclasses import dataclass, field, asdict
 from .common import SeverityLevel
@@ -9,9 +9,11 @@ class Scan:
     scan_type: str
     product_name: str
     test_title: str
-    engagement: int
+    engagement: int | None
     engagement_name: str
     test: int | None = None
+    product_type_name: str | None = None
+    auto_create_context: bool | None = None
     push_to_jira: bool = False
     active: bool = True
     verified: bool = True
@@ -36,4 +38,4 @@ class Scan:
         return result
 
     def to_json(self):
-        return json.dumps(self.to_dict())
+        return jsonlib.dumps(self.to_dict())
@@ -1,4 +1,4 @@
-import json
+from common import jsonlib
 from dataclasses import dataclass, field, asdict
 from datetime import date
 
@@ -20,7 +20,7 @@ class Test:
         return dict((x, y) for x, y in asdict(self).items() if y is not None)
 
     def to_json(self):
-        return json.dumps(self.to_dict())
+        return jsonlib.dumps(self.to_dict())
 
 
 @dataclass
@@ -35,4 +35,4 @@ class TestType:
         return dict((x, y) for x, y in asdict(self).items() if y is not None)
 
     def to_json(self):
-        return json.dumps(self.to_dict())
+        return jsonlib.dumps(self.to_dict())
@@ -0,0 +1,45 @@
+"""Run the importer benchmarks: python -m tests.benchmarks --output results.json"""
+
+import argparse
+import json
+from .scenarios import run_benchmarks
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks",
+        description="Benchmark the importer end to end against a local fake DefectDojo.",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Delay in seconds of every response."
+    )
+    parser.add_argument(
+        "--padding", type=int, default=0, help="Bytes added to every object of list responses."
+    )
+    parser.add_argument(
+        "--findings",
+        type=int,
+        default=0,
+        help="Import a generated report with this many findings instead of the ESLint report.",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Number of runs of every scenario.")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="benchmark-results.json",
+        help="File the results are written to, default is benchmark-results.json.",
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.latency, args.padding, args.findings, args.repeat)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    for result in results["results"]:
+        print(
+            "{name:<28}{latency:>8.3f}s{requests:>5} requests{bytes_sent:>10} bytes sent"
+            "{peak_rss_kb:>8} KB peak RSS".format(**result)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""A local stand-in for the DefectDojo v2 and Dependency-Track v1 endpoints used by the importer."""
+
+import json
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit
+
+DTRACK_PROJECT_UUID = "18841bb6-8f30-47a6-9fe2-caa4336e10d5"
+LIST_PATH = re.compile(r"^/api/v2/([a-z_]+)/$")
+DETAIL_PATH = re.compile(r"^/api/v2/([a-z_]+)/(\d+)/$")
+PROPERTY_PATH = re.compile(r"^/api/v1/project/([^/]+)/property$")
+# Query parameters which are not filters
+LIST_PARAMS = {"limit", "offset", "o"}
+
+
+def query_value(value) -> str:
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value)
+
+
+def matches(obj: dict, key: str, value: str) -> bool:
+    """Apply a DefectDojo filter, filters on fields the object does not have are ignored."""
+    if key == "tags__and":
+        return set(value.split(",")) <= set(obj.get("tags") or [])
+    if key not in obj:
+        return True
+    return query_value(obj[key]).lower() == value.lower()
+
+
+class FakeDefectDojo(ThreadingHTTPServer):
+    """Serve the importer endpoints from memory, recording the requests it receives.
+
+    Every response is delayed by `latency` seconds, and every object returned by a list
+    endpoint is padded with `padding` bytes to simulate the size of real DefectDojo
+    objects. Dependency-Track endpoints are served on the same address.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0, padding: int = 0, address=("127.0.0.1", 0)):
+        super().__init__(address, FakeRequestHandler)
+        self.latency = latency
+        self.padding = padding
+        self.lock = threading.Lock()
+        self.objects: dict[str, list[dict]] = defaultdict(list)
+        self.next_id = 1
+        self.dtrack_config = [
+            {
+                "groupName": "integrations",
+                "propertyName": "defectdojo.enabled",
+                "propertyValue": "true",
+                "propertyType": "BOOLEAN",
+            }
+        ]
+        self.dtrack_properties: list[dict] = []
+        self.thread: threading.Thread | None = None
+        self.reset_stats()
+
+    @property
+    def url(self) -> str:
+        return "http://%s:%s" % self.server_address[:2]
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests: Counter = Counter()
+            self.connections = 0
+            self.bytes_received = 0
+            self.bytes_sent = 0
+
+    def stats(self) -> dict:
+        """Return the requests received since the last reset."""
+        with self.lock:
+            return {
+                "requests": sum(self.requests.values()),
+                "requests_by_endpoint": dict(sorted(self.requests.items())),
+                "connections": self.connections,
+                "bytes_sent": self.bytes_received,
+                "bytes_received": self.bytes_sent,
+            }
+
+    def seed(self, resource: str, **fields) -> dict:
+        """Add an object to a DefectDojo list endpoint."""
+        with self.lock:
+            obj = {"id": self.next_id, **fields}
+            self.next_id += 1
+            self.objects[resource].append(obj)
+        return obj
+
+    def find(self, resource: str, **filters) -> list[dict]:
+        with self.lock:
+            return [
+                obj
+                for obj in self.objects[resource]
+                if all(matches(obj, key, query_value(value)) for key, value in filters.items())
+            ]
+
+    def start(self) -> "FakeDefectDojo":
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def get_request(self):
+        with self.lock:
+            self.connections += 1
+        return super().get_request()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+class FakeRequestHandler(BaseHTTPRequestHandler):
+    server: FakeDefectDojo
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def respond(self, status: int, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        time.sleep(self.server.latency)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            # Status line and headers are counted approximately
+            self.server.bytes_sent += len(body) + 128
+
+    def read_body(self) -> bytes:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        endpoint = LIST_PATH.sub(r"/api/v2/\1/", urlsplit(self.path).path)
+        endpoint = DETAIL_PATH.sub(r"/api/v2/\1/{id}/", endpoint)
+        endpoint = PROPERTY_PATH.sub("/api/v1/project/{uuid}/property", endpoint)
+        with self.server.lock:
+            self.server.requests[f"{self.command} {endpoint}"] += 1
+            self.server.bytes_received += len(body) + len(self.requestline) + len(str(self.headers))
+        return body
+
+    def read_object(self, body: bytes) -> dict:
+        """Read a created object, some endpoints are sent form encoded data."""
+        try:
+            return json.loads(body)
+        except ValueError:
+            fields = parse_qs(body.decode())
+            return {key: values if key == "tags" else values[0] for key, values in fields.items()}
+
+    def read_form(self, body: bytes) -> dict:
+        message = BytesParser(policy=HTTP).parsebytes(
+            b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + body
+        )
+        form: dict[str, list] = defaultdict(list)
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if part.get_filename() is None:
+                form[name].append(part.get_payload(decode=True).decode())
+        return form
+
+    def find_or_seed(self, resource: str, **fields) -> dict:
+        found = self.server.find(resource, **fields)
+        return found[0] if found else self.server.seed(resource, **fields)
+
+    def upload_engagement(self, form: dict) -> int:
+        """Return the engagement of an upload, found or created by name with auto_create_context."""
+        if form["engagement"]:
+            return int(form["engagement"][0])
+        product_type = self.find_or_seed("product_types", name=form["product_type_name"][0])
+        product = self.find_or_seed(
+            "products", name=form["product_name"][0], prod_type=product_type["id"]
+        )
+        engagement = self.find_or_seed(
+            "engagements", name=form["engagement_name"][0], product=product["id"]
+        )
+        return engagement["id"]
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.read_body()
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        if url.path == "/api/v1/configProperty":
+            self.respond(200, self.server.dtrack_config)
+        elif url.path == "/api/v1/project/lookup":
+            self.respond(200, {"uuid": DTRACK_PROJECT_UUID, **params})
+        elif PROPERTY_PATH.match(url.path):
+            self.respond(200, self.server.dtrack_properties)
+        elif match := DETAIL_PATH.match(url.path):
+            found = [obj for obj in self.server.find(match[1]) if obj["id"] == int(match[2])]
+            self.respond(200 if found else 404, found[0] if found else {"detail": "Not found."})
+        elif match := LIST_PATH.match(url.path):
+            self.respond(200, self.list_page(match[1], params))
+        else:
+            self.respond(404, {"detail": "Not found."})
+
+    def list_page(self, resource: str, params: dict) -> dict:
+        filters = {key: value for key, value in params.items() if key not in LIST_PARAMS}
+        results = self.server.find(resource, **filters)
+        if params.get("o") == "-id":
+            results.sort(key=lambda obj: obj["id"], reverse=True)
+        limit = int(params.get("limit", 25))
+        offset = int(params.get("offset", 0))
+        page = results[offset : offset + limit]
+        following = None
+        if offset + limit < len(results):
+            following = "%s%s?%s" % (
+                self.server.url,
+                urlsplit(self.path).path,
+                urlencode({**params, "offset": offset + limit}),
+            )
+        padding = "x" * self.server.padding
+        return {
+            "count": len(results),
+            "next": following,
+            "previous": None,
+            "results": [{**obj, "description": padding} if padding else obj for obj in page],
+        }
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body = self.read_body()
+        path = urlsplit(self.path).path
+        if path == "/api/v1/configProperty/aggregate":
+            self.server.dtrack_config = json.loads(body)
+            self.respond(200, self.server.dtrack_config)
+        elif PROPERTY_PATH.match(path):
+            self.respond(200, json.loads(body))
+        elif path == "/api/v2/import-scan/":
+            form = self.read_form(body)
+            scan_type = form["scan_type"][0]
+            test = self.server.seed(
+                "tests",
+                title=form["test_title"][0],
+                engagement=self.upload_engagement(form),
+                test_type=self.find_or_seed("test_types", name=scan_type)["id"],
+                tags=form["tags"],
+            )
+            self.respond(201, {"test": test["id"], "scan_type": scan_type})
+        elif path == "/api/v2/reimport-scan/":
+            form = self.read_form(body)
+            scan_type = form["scan_type"][0]
+            if form["test"]:
+                test_id = int(form["test"][0])
+            else:
+                # Reimports without a test go to the test of the engagement with that title
+                fields = {
+                    "title": form["test_title"][0],
+                    "engagement": self.upload_engagement(form),
+                    "test_type": self.find_or_seed("test_types", name=scan_type)["id"],
+                }
+                tests = self.server.find("tests", **fields)
+                test = tests[0] if tests else self.server.seed("tests", **fields, tags=form["tags"])
+                test_id = test["id"]
+            self.respond(201, {"test": test_id, "scan_type": scan_type})
+        elif path == "/api/v2/import-languages/":
+            form = self.read_form(body)
+            self.respond(201, {"product": int(form["product"][0])})
+        elif match := LIST_PATH.match(path):
+            self.respond(201, self.server.seed(match[1], **self.read_object(body)))
+        else:
+            self.respond(404, {"detail": "Not found."})
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        body = self.read_body()
+        if PROPERTY_PATH.match(urlsplit(self.path).path):
+            self.server.dtrack_properties.append(json.loads(body))
+            self.respond(201, json.loads(body))
+        else:
+            self.respond(404, {"detail": "Not found."})
@@ -0,0 +1,167 @@
+"""End-to-end importer scenarios run against the fake DefectDojo server."""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from .fake_server import FakeDefectDojo
+
+ROOT = Path(__file__).resolve().parents[2]
+REPORTS = ROOT / "tests" / "reports"
+
+BASE_ENV = {
+    "DD_API_KEY": "benchmark-api-key",
+    "DD_PRODUCT_TYPE_NAME": "Benchmarks",
+    "DD_PRODUCT_NAME": "Benchmark Product",
+    "DD_ENGAGEMENT_NAME": "Benchmark Engagement",
+    "DD_TEST_TYPE_NAME": "ESLint Scan",
+    "DD_BRANCH_TAG": "main",
+    "DD_DTRACK_API_KEY": "benchmark-api-key",
+    "DD_DTRACK_PROJECT_NAME": "Benchmark Product",
+    "DD_DTRACK_PROJECT_VERSION": "1.0",
+}
+
+# Runs the cli in a fresh interpreter, so that the latency includes the start up and the
+# peak RSS is the one of a single run
+RUN_SCRIPT = """
+import json, resource, sys, time
+started = time.perf_counter()
+from importer.execute import main
+sys.argv = ["defectdojo-importer", *sys.argv[1:]]
+main()
+peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "latency": time.perf_counter() - started,
+    "peak_rss_kb": peak_rss // 1024 if sys.platform == "darwin" else peak_rss,
+}))
+"""
+
+
+@dataclass
+class Scenario:
+    name: str
+    args: list[str]
+    env: dict = field(default_factory=dict)
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latency: float
+    peak_rss_kb: int
+    requests: int
+    connections: int
+    bytes_sent: int
+    bytes_received: int
+    requests_by_endpoint: dict
+
+
+def scenarios(report: str = str(REPORTS / "eslint-report.json")) -> list[Scenario]:
+    """Return the benchmarked scenarios in the order they run against the same server.
+
+    The first import creates the product type, product, engagement and test that the
+    other scenarios find, the auto-create import uploads to a product of its own.
+    """
+    return [
+        Scenario("first_import", ["-f", report, "--reimport"]),
+        Scenario("reimport", ["-f", report, "--reimport"]),
+        Scenario(
+            "tool_configuration_import",
+            ["--tool-configuration-name", "Sonarqube", "--tool-configuration-params", "benchmark"],
+            # Environment variables take precedence over the cli arguments
+            env={"DD_TEST_TYPE_NAME": "SonarQube API Import"},
+        ),
+        Scenario("languages", ["-f", str(REPORTS / "cloc.json"), "--import-type", "languages"]),
+        Scenario("dtrack_integration", ["integration", "dtrack", "--dtrack-reimport"]),
+        # DefectDojo creates the product of this import from the names sent with the report
+        Scenario(
+            "auto_create_import",
+            ["-f", report, "--auto-create-context"],
+            env={"DD_PRODUCT_NAME": "Auto Created Product"},
+        ),
+    ]
+
+
+def seed(server: FakeDefectDojo):
+    """Add the objects an administrator creates up front, scan types and tools."""
+    server.seed("test_types", name="ESLint Scan", tags=[])
+    server.seed("test_types", name="SonarQube API Import", tags=[])
+    server.seed("tool_configurations", name="Sonarqube")
+
+
+def generate_report(path: Path, findings: int) -> str:
+    """Write a Generic Findings Import report with the given number of findings."""
+    report = {
+        "findings": [
+            {
+                "title": f"Benchmark finding {index}",
+                "severity": "Medium",
+                "description": "Generated by the importer benchmarks. " * 8,
+                "file_path": f"src/module_{index % 100}.py",
+                "line": index,
+            }
+            for index in range(findings)
+        ]
+    }
+    path.write_text(json.dumps(report), encoding="utf-8")
+    return str(path)
+
+
+def run_scenario(server: FakeDefectDojo, scenario: Scenario, workdir: str) -> ScenarioResult:
+    env = {key: value for key, value in os.environ.items() if not key.startswith("DD_")}
+    env.update(BASE_ENV)
+    env.update(
+        {
+            "DD_API_URL": server.url,
+            "DD_DTRACK_API_URL": server.url,
+            "PYTHONPATH": str(ROOT / "src"),
+            **scenario.env,
+        }
+    )
+    server.reset_stats()
+    # Runs outside the repository so that no .env file is picked up
+    completed = subprocess.run(
+        [sys.executable, "-c", RUN_SCRIPT, *scenario.args],
+        cwd=workdir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Scenario {scenario.name} failed:\n{completed.stderr}")
+    measured = json.loads(completed.stdout.splitlines()[-1])
+    return ScenarioResult(scenario.name, **measured, **server.stats())
+
+
+def run_benchmarks(
+    latency: float = 0.0, padding: int = 0, findings: int = 0, repeat: int = 1
+) -> dict:
+    """Run every scenario against a fresh fake server and return machine-readable results."""
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        report = str(REPORTS / "eslint-report.json")
+        if findings:
+            report = generate_report(Path(workdir) / "generic-report.json", findings)
+            report += "=Generic Findings Import"
+        for _ in range(repeat):
+            with FakeDefectDojo(latency=latency, padding=padding) as server:
+                seed(server)
+                server.seed("test_types", name="Generic Findings Import", tags=[])
+                for scenario in scenarios(report):
+                    results.append(asdict(run_scenario(server, scenario, workdir)))
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "latency": latency,
+            "padding": padding,
+            "findings": findings,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
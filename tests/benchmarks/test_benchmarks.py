@@ -0,0 +1,36 @@
+import json
+import os
+import pytest
+from .scenarios import run_benchmarks
+
+pytestmark = pytest.mark.benchmark
+
+# Requests sent by each scenario, a change in the number of lookups shows up here first
+REQUEST_BUDGETS = {
+    "first_import": 9,
+    "reimport": 6,
+    "tool_configuration_import": 9,
+    "languages": 4,
+    "dtrack_integration": 9,
+    "auto_create_import": 1,
+}
+
+
+def test_benchmarks():
+    benchmarks = run_benchmarks()
+
+    results = {result["name"]: result for result in benchmarks["results"]}
+    assert list(results) == list(REQUEST_BUDGETS)
+    for name, budget in REQUEST_BUDGETS.items():
+        assert results[name]["requests"] <= budget, results[name]["requests_by_endpoint"]
+        assert results[name]["peak_rss_kb"] > 0
+    assert results["first_import"]["requests_by_endpoint"]["POST /api/v2/import-scan/"] == 1
+    assert results["reimport"]["requests_by_endpoint"]["POST /api/v2/reimport-scan/"] == 1
+    assert results["auto_create_import"]["requests_by_endpoint"] == {
+        "POST /api/v2/reimport-scan/": 1
+    }
+
+    # Keep the results to compare them across releases
+    if os.environ.get("BENCHMARK_RESULTS"):
+        with open(os.environ["BENCHMARK_RESULTS"], "w", encoding="utf-8") as file:
+            json.dump(benchmarks, file, indent=2)
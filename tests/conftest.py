@@ -1,6 +1,8 @@
 import os
 import pytest
 from dotenv import dotenv_values
+from models.config import Config
+from models.common import SeverityLevel, ReimportConditions
 
 
 @pytest.fixture
@@ -33,3 +35,44 @@ def mock_config(mocker):
     config.product_name = "Test Product"
     config.product_type_name = "Test Product Type"
     return config
+
+
+@pytest.fixture
+def make_config():
+    """Create a Config of an ESLint import, with keyword arguments overriding its fields."""
+
+    def make(**overrides) -> Config:
+        fields = {
+            "api_url": "https://defectdojo.example.com",
+            "api_key": "dd-api-key",
+            "product_name": "Test Product",
+            "product_type_name": "Test Products",
+            "critical_product": False,
+            "product_platform": None,
+            "engagement_name": "CI/CD Engagement",
+            "test_name": None,
+            "test_type_name": "ESLint Scan",
+            "tool_configuration_name": None,
+            "tool_configuration_params": None,
+            "static_tool": False,
+            "dynamic_tool": False,
+            "minimum_severity": SeverityLevel.INFO,
+            "push_to_jira": False,
+            "close_old_findings": True,
+            "build_id": None,
+            "commit_hash": None,
+            "branch_tag": "main",
+            "scm_uri": None,
+            "reimport": True,
+            "reimport_condition": ReimportConditions.DEFAULT,
+            "debug": False,
+            "dtrack_api_url": None,
+            "dtrack_api_key": None,
+            "dtrack_project_name": None,
+            "dtrack_project_version": None,
+            "dtrack_reimport": False,
+            "dtrack_reactivate": False,
+        }
+        return Config(**{**fields, **overrides})
+
+    return make
@@ -1,4 +1,6 @@
 import re
+import logging
+import hashlib
 import json
 import pytest
 from unittest.mock import patch
@@ -28,7 +30,7 @@ api_scan_args = [
 class TestImportFindingsFromFile:
     @responses.activate
     def test_import_existing_test_findings(self, mock_env):
-        with patch.object(config, "env", mock_env):
+        with patch.object(config, "load_env", return_value=mock_env):
             response = json.dumps(
                 {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
             ).encode()
@@ -40,7 +42,7 @@ class TestImportFindingsFromFile:
 
     @responses.activate
     def test_import_new_test_findings(self, mock_env):
-        with patch.object(config, "env", mock_env):
+        with patch.object(config, "load_env", return_value=mock_env):
             response = json.dumps(
                 {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
             ).encode()
@@ -61,7 +63,7 @@ class TestImportFindingsFromFile:
 
     @responses.activate
     def test_invalid_test_type(self, mock_env):
-        with patch.object(config, "env", mock_env):
+        with patch.object(config, "load_env", return_value=mock_env):
             create_response = json.dumps({"id": 1, "name": "Test Type"}).encode()
             get_response = json.dumps({"count": 0, "results": []}).encode()
             responses.add(responses.GET, mock_url, body=get_response, status=200)
@@ -74,7 +76,7 @@ class TestImportFindingsFromFile:
 class TestApiScanImport:
     @responses.activate
     def test_import_with_existing_configuration(self, mock_env):
-        with patch.object(config, "env", mock_env):
+        with patch.object(config, "load_env", return_value=mock_env):
             response = json.dumps(
                 {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
             ).encode()
@@ -99,7 +101,7 @@ class TestApiScanImport:
 
     @responses.activate
     def test_import_with_new_configuration(self, mock_env):
-        with patch.object(config, "env", mock_env):
+        with patch.object(config, "load_env", return_value=mock_env):
             response = json.dumps(
                 {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
             ).encode()
@@ -112,3 +114,333 @@ class TestApiScanImport:
                 responses.POST, dojo_url + "/api/v2/reimport-scan/", status=200
             )
             main()
+
+
+class TestAutoCreateContextImport:
+    @patch("sys.argv", ["defectdojo-importer"] + args + ["--auto-create-context"])
+    @responses.activate
+    def test_import_in_single_request(self, mock_env):
+        with patch.object(config, "load_env", return_value=mock_env):
+            responses.add(
+                responses.POST, dojo_url + "/api/v2/reimport-scan/", status=201
+            )
+            main()
+
+        assert len(responses.calls) == 1
+        body = responses.calls[0].request.body
+        assert b'name="auto_create_context"' in body
+        assert b'name="product_type_name"' in body
+        assert b'name="engagement"\r\n' not in body
+
+    @patch("sys.argv", ["defectdojo-importer"] + args + ["--auto-create-context"])
+    @responses.activate
+    def test_request_counts_are_logged(self, mock_env, caplog):
+        with patch.object(config, "load_env", return_value=mock_env):
+            responses.add(
+                responses.POST, dojo_url + "/api/v2/reimport-scan/", status=201
+            )
+            with caplog.at_level(logging.DEBUG, logger="defectdojo_importer"):
+                main()
+
+        assert "HTTP connections opened:" in caplog.text
+        assert "HTTP requests sent: 1" in caplog.text
+
+    @patch(
+        "sys.argv",
+        ["defectdojo-importer"]
+        + args
+        + ["--auto-create-context", "--reimport-condition", "branch"],
+    )
+    @responses.activate
+    def test_reimport_condition_resolves_test(self, mock_env):
+        with patch.object(config, "load_env", return_value=mock_env):
+            response = json.dumps(
+                {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
+            ).encode()
+            responses.add(responses.GET, mock_url, body=response, status=200)
+            responses.add(
+                responses.POST, dojo_url + "/api/v2/reimport-scan/", status=201
+            )
+            main()
+
+        assert len(responses.calls) > 1
+
+
+@patch("sys.argv", ["defectdojo-importer"] + args + ["--skip-unchanged"])
+class TestSkipUnchangedImport:
+    @responses.activate
+    def test_skip_unchanged_report(self, mock_env):
+        with patch.object(config, "load_env", return_value=mock_env):
+            with open("tests/reports/eslint-report.json", "rb") as report:
+                report_hash = hashlib.sha256(report.read()).hexdigest()
+            responses.add(
+                responses.GET,
+                dojo_url + "/api/v2/tests/1/",
+                body=json.dumps({"id": 1, "tags": [f"sha256:{report_hash}"]}),
+                status=200,
+            )
+            response = json.dumps(
+                {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
+            ).encode()
+            responses.add(responses.GET, mock_url, body=response, status=200)
+            main()
+
+        assert all(call.request.method == "GET" for call in responses.calls)
+
+    @responses.activate
+    def test_upload_changed_report_with_hash_tag(self, mock_env):
+        with patch.object(config, "load_env", return_value=mock_env):
+            response = json.dumps(
+                {"count": 1, "results": [{"id": 1, "name": "Test Item", "tags": []}]}
+            ).encode()
+            responses.add(responses.GET, mock_url, body=response, status=200)
+            responses.add(
+                responses.POST, dojo_url + "/api/v2/reimport-scan/", status=201
+            )
+            main()
+
+        upload = responses.calls[-1].request
+        assert upload.url == dojo_url + "/api/v2/reimport-scan/"
+        assert b"sha256:" in upload.body
+
+
+@patch(
+    "sys.argv",
+    [
+        "defectdojo-importer",
+        "--workers",
+        "2",
+        "-f",
+        "tests/reports/eslint-report.json",
+        "tests/reports/cloc.json=Generic Findings Import",
+    ],
+)
+class TestImportMultipleFiles:
+    @responses.activate
+    def test_import_multiple_files(self, mock_env):
+        with patch.object(config, "load_env", return_value=mock_env):
+            response = json.dumps(
+                {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
+            ).encode()
+            responses.add(responses.GET, mock_url, body=response, status=200)
+            responses.add(
+                responses.POST,
+                dojo_url + "/api/v2/reimport-scan/",
+                body=json.dumps({"test": 1}),
+                status=201,
+            )
+            main()
+
+        uploads = [call.request.body for call in responses.calls if call.request.method == "POST"]
+        product_lookups = [
+            call for call in responses.calls if "/api/v2/products/" in call.request.url
+        ]
+        assert len(uploads) == 2
+        assert len(product_lookups) == 1
+        assert any(b"Generic Findings Import" in body for body in uploads)
+
+
+class TestBatchImport:
+    @responses.activate
+    def test_batch_import(self, mock_env, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(
+            json.dumps(
+                {
+                    "defaults": {"test_type_name": "ESLint Scan"},
+                    "imports": [
+                        {"product_name": "Shop", "file": "tests/reports/eslint-report.json"},
+                        {"product_name": "Blog", "file": "tests/reports/eslint-report.json"},
+                    ],
+                }
+            )
+        )
+        results_file = tmp_path / "results.json"
+        argv = [
+            "defectdojo-importer",
+            "batch",
+            "--manifest",
+            str(manifest),
+            "--results-file",
+            str(results_file),
+        ]
+        with patch.object(config, "load_env", return_value=mock_env), patch("sys.argv", argv):
+            response = json.dumps(
+                {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
+            ).encode()
+            responses.add(responses.GET, mock_url, body=response, status=200)
+            responses.add(
+                responses.POST,
+                dojo_url + "/api/v2/reimport-scan/",
+                body=json.dumps({"test": 1}),
+                status=201,
+            )
+            main()
+
+        product_type_lookups = [
+            call for call in responses.calls if "/api/v2/product_types/" in call.request.url
+        ]
+        output = json.loads(results_file.read_text())
+        assert len(product_type_lookups) == 1
+        assert output["summary"]["reimported"] == 2
+        assert [result["product_name"] for result in output["results"]] == ["Shop", "Blog"]
+
+
+class TestOutboxImport:
+    @responses.activate
+    def test_queue_and_flush(self, mock_env, tmp_path):
+        outbox = str(tmp_path / "outbox")
+        with patch.object(config, "load_env", return_value=mock_env):
+            with patch("sys.argv", ["defectdojo-importer"] + args + ["--outbox", outbox]):
+                main()
+            assert len(responses.calls) == 0
+
+            response = json.dumps(
+                {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
+            ).encode()
+            responses.add(responses.GET, mock_url, body=response, status=200)
+            responses.add(
+                responses.POST,
+                dojo_url + "/api/v2/reimport-scan/",
+                body=json.dumps({"test": 1}),
+                status=201,
+            )
+            with patch("sys.argv", ["defectdojo-importer", "flush", "--outbox", outbox]):
+                main()
+
+        uploads = [call for call in responses.calls if call.request.method == "POST"]
+        assert len(uploads) == 1
+        assert b"Snyk Scan" in uploads[0].request.body
+        assert [path.name for path in (tmp_path / "outbox").iterdir()] == [".lock"]
+
+
+class TestMetricsFile:
+    @responses.activate
+    def test_metrics_file_is_written(self, mock_env, tmp_path):
+        metrics_file = tmp_path / "importer.prom"
+        with patch.object(config, "load_env", return_value=mock_env):
+            response = json.dumps(
+                {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
+            ).encode()
+            responses.add(responses.GET, mock_url, body=response, status=200)
+            responses.add(
+                responses.POST,
+                dojo_url + "/api/v2/reimport-scan/",
+                body=json.dumps({"test": 1}),
+                status=201,
+            )
+            argv = ["defectdojo-importer"] + args + ["--metrics-file", str(metrics_file)]
+            with patch("sys.argv", argv):
+                main()
+
+        metrics = metrics_file.read_text()
+        assert (
+            'defectdojo_importer_http_request_duration_seconds_count{method="POST",'
+            'endpoint="/api/v2/reimport-scan/"}'
+        ) in metrics
+        assert (
+            'defectdojo_importer_http_requests_total{method="GET",'
+            'endpoint="/api/v2/tests/",status="200"}'
+        ) in metrics
+
+
+class TestTraceFile:
+    @responses.activate
+    def test_trace_file_is_written(self, mock_env, tmp_path):
+        trace_file = tmp_path / "trace.json"
+        with patch.object(config, "load_env", return_value=mock_env):
+            response = json.dumps(
+                {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
+            ).encode()
+            responses.add(responses.GET, mock_url, body=response, status=200)
+            responses.add(
+                responses.POST,
+                dojo_url + "/api/v2/reimport-scan/",
+                body=json.dumps({"test": 1}),
+                status=201,
+            )
+            argv = ["defectdojo-importer"] + args + ["--trace-file", str(trace_file)]
+            with patch("sys.argv", argv):
+                main()
+
+        events = json.loads(trace_file.read_text())["traceEvents"]
+        spans = {event["name"]: event for event in events if event["ph"] == "X"}
+        assert {
+            "import",
+            "parse_arguments",
+            "validate_config",
+            "get_or_create product_type",
+            "get_or_create product",
+            "get_or_create engagement",
+            "lookup test_type",
+            "lookup test",
+            "prepare_report",
+            "reimport-scan",
+            "POST /api/v2/reimport-scan/",
+        } <= set(spans)
+        assert spans["get_or_create engagement"]["args"]["id"] == 1
+        assert spans["reimport-scan"]["args"]["test"] == 1
+        assert spans["POST /api/v2/reimport-scan/"]["args"]["http.response.status_code"] == 201
+
+
+class TestProfile:
+    @responses.activate
+    def test_profile_is_written(self, mock_env, tmp_path, caplog):
+        profile = tmp_path / "run.prof"
+        with patch.object(config, "load_env", return_value=mock_env):
+            response = json.dumps(
+                {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
+            ).encode()
+            responses.add(responses.GET, mock_url, body=response, status=200)
+            responses.add(
+                responses.POST,
+                dojo_url + "/api/v2/reimport-scan/",
+                body=json.dumps({"test": 1}),
+                status=201,
+            )
+            argv = ["defectdojo-importer"] + args + ["--profile", str(profile)]
+            with patch("sys.argv", argv):
+                main()
+
+        assert profile.stat().st_size > 0
+        assert f"Profile written to {profile}" in caplog.text
+        summary = caplog.text[caplog.text.index("Time and memory of the run by phase") :]
+        phases = [line.split()[0] for line in summary.splitlines()[2:7]]
+        assert phases == ["config", "preparation", "resolution", "upload", "total"]
+
+
+class TestSummaryJson:
+    @responses.activate
+    def test_summary_is_written(self, mock_env, tmp_path):
+        summary_json = tmp_path / "summary.json"
+        with patch.object(config, "load_env", return_value=mock_env):
+            response = json.dumps(
+                {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
+            ).encode()
+            responses.add(responses.GET, mock_url, body=response, status=200)
+            responses.add(
+                responses.POST,
+                dojo_url + "/api/v2/reimport-scan/",
+                body=json.dumps({"test": 1, "statistics": {"after": {"total": 3}}}),
+                status=201,
+            )
+            argv = ["defectdojo-importer"] + args + ["--summary-json", str(summary_json)]
+            with patch("sys.argv", argv):
+                main()
+
+        summary = json.loads(summary_json.read_text())
+        with open("tests/reports/eslint-report.json", "rb") as report:
+            contents = report.read()
+        assert summary["status"] == "succeeded"
+        assert summary["command"] == "import"
+        assert summary["import_type"] == "findings"
+        assert summary["product_id"] == summary["engagement_id"] == summary["test_id"] == 1
+        assert summary["summary"]["reimported"] == 1
+        imported = summary["imports"][0]
+        assert imported["status"] == "reimported"
+        assert imported["report_size"] == len(contents)
+        assert imported["report_sha256"] == hashlib.sha256(contents).hexdigest()
+        assert imported["response"]["statistics"] == {"after": {"total": 3}}
+        assert {"config", "preparation", "resolution", "upload"} <= set(summary["phases"])
+        assert summary["requests"]["by_endpoint"]["POST /api/v2/reimport-scan/"]["count"] == 1
+        assert summary["requests"]["total"] > 1
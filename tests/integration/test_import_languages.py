@@ -13,7 +13,7 @@ args = ["-f", "tests/reports/cloc.json", "--import-type", "languages"]
 @patch("sys.argv", ["defectdojo-importer"] + args)
 @responses.activate
 def test_import_languages(mock_env):
-    with patch.object(config, "env", mock_env):
+    with patch.object(config, "load_env", return_value=mock_env):
         generic_response = json.dumps(
             {"count": 1, "results": [{"id": 1, "name": "Test Item"}]}
         ).encode()
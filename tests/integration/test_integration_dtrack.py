@@ -18,7 +18,7 @@ class TestDtrackIntegration:
 
     @responses.activate
     def test_dtrack_with_existing_integration(self, mock_env):
-        with patch.object(config, "env", mock_env):
+        with patch.object(config, "load_env", return_value=mock_env):
             get_response = json.dumps({"count": 0, "results": []}).encode()
             create_response = json.dumps({"id": 1, "name": "Test Item"}).encode()
             dtrack_uuid_response = json.dumps(
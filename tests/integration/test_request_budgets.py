@@ -0,0 +1,133 @@
+import pytest
+from unittest.mock import patch
+import config
+from common.instrumentation import RequestCounter
+from defectdojo import lookup
+from importer import Importer
+from importer.execute import main
+from tests.benchmarks.fake_server import FakeDefectDojo
+from tests.benchmarks.scenarios import BASE_ENV, REPORTS, seed
+
+eslint_args = ["-f", str(REPORTS / "eslint-report.json")]
+reimport_args = eslint_args + ["--reimport", "--build-id", "42", "--commit-hash", "abc123"]
+api_scan_args = ["--tool-configuration-name", "Sonarqube", "--tool-configuration-params", "key"]
+languages_args = ["-f", str(REPORTS / "cloc.json"), "--import-type", "languages"]
+dtrack_args = ["integration", "dtrack"]
+
+
+@pytest.fixture
+def fake_dojo():
+    lookup.ordering_checked.clear()
+    lookup.ordering_rejected.clear()
+    with FakeDefectDojo() as server:
+        seed(server)
+        yield server
+
+
+@pytest.fixture
+def request_counter(mocker):
+    counter = RequestCounter()
+    create_client = Importer.create_client
+
+    def counted_client(*args, **kwargs):
+        client = create_client(*args, **kwargs)
+        client.observers.append(counter)
+        return client
+
+    mocker.patch.object(Importer, "create_client", side_effect=counted_client)
+    return counter
+
+
+def run(server: FakeDefectDojo, args: list[str], **env):
+    run_env = {**BASE_ENV, "DD_API_URL": server.url, "DD_DTRACK_API_URL": server.url, **env}
+    argv = ["defectdojo-importer"] + args
+    with patch.object(config, "load_env", return_value=run_env), patch("sys.argv", argv):
+        main()
+
+
+# Requests of each flow, any additional round trip to DefectDojo fails these tests
+CONTEXT_LOOKUPS = {
+    "GET /api/v2/product_types/": 1,
+    "GET /api/v2/products/": 1,
+    "GET /api/v2/engagements/": 1,
+}
+CONTEXT_CREATION = {
+    "POST /api/v2/product_types/": 1,
+    "POST /api/v2/products/": 1,
+    "POST /api/v2/engagements/": 1,
+}
+TEST_LOOKUPS = {"GET /api/v2/test_types/": 1, "GET /api/v2/tests/": 1}
+
+
+class TestRequestBudgets:
+    def test_new_import(self, fake_dojo, request_counter):
+        run(fake_dojo, eslint_args)
+
+        assert request_counter.by_endpoint() == {
+            **CONTEXT_LOOKUPS,
+            **CONTEXT_CREATION,
+            **TEST_LOOKUPS,
+            "POST /api/v2/import-scan/": 1,
+        }
+
+    @pytest.mark.parametrize("condition", ["default", "branch", "commit", "build", "pull_request"])
+    def test_reimport(self, fake_dojo, request_counter, monkeypatch, condition):
+        monkeypatch.setenv("PULL_REQUEST_ID", "7")
+        args = reimport_args + ["--reimport-condition", condition]
+        run(fake_dojo, args)
+        # The test of an earlier import of the same pull request
+        for test in fake_dojo.find("tests"):
+            test["tags"].append("pull_request:7")
+        request_counter.reset()
+
+        run(fake_dojo, args)
+
+        assert request_counter.by_endpoint() == {
+            **CONTEXT_LOOKUPS,
+            **TEST_LOOKUPS,
+            "POST /api/v2/reimport-scan/": 1,
+        }
+
+    def test_api_scan_import(self, fake_dojo, request_counter):
+        run(fake_dojo, api_scan_args, DD_TEST_TYPE_NAME="SonarQube API Import")
+
+        assert request_counter.by_endpoint() == {
+            **CONTEXT_LOOKUPS,
+            **CONTEXT_CREATION,
+            **TEST_LOOKUPS,
+            "GET /api/v2/tool_configurations/": 1,
+            "GET /api/v2/product_api_scan_configurations/": 1,
+            "POST /api/v2/product_api_scan_configurations/": 1,
+            "POST /api/v2/import-scan/": 1,
+        }
+
+    def test_languages_import(self, fake_dojo, request_counter):
+        run(fake_dojo, languages_args)
+
+        assert request_counter.by_endpoint() == {
+            **CONTEXT_LOOKUPS,
+            **CONTEXT_CREATION,
+            "POST /api/v2/import-languages/": 1,
+        }
+
+    def test_dtrack_integration(self, fake_dojo, request_counter):
+        run(fake_dojo, dtrack_args)
+
+        assert request_counter.by_endpoint() == {
+            **CONTEXT_LOOKUPS,
+            **CONTEXT_CREATION,
+            "GET /api/v1/configProperty": 1,
+            "GET /api/v1/project/lookup": 1,
+            "GET /api/v1/project/{uuid}/property": 1,
+            "PUT /api/v1/project/{uuid}/property": 3,
+        }
+
+    def test_auto_create_import(self, fake_dojo, request_counter):
+        args = eslint_args + ["--auto-create-context"]
+        run(fake_dojo, args)
+        # Later runs reimport into the test created by the first one
+        run(fake_dojo, args)
+
+        assert request_counter.by_endpoint() == {"POST /api/v2/reimport-scan/": 2}
+        engagement = fake_dojo.find("engagements", name=BASE_ENV["DD_ENGAGEMENT_NAME"])[0]
+        assert len(fake_dojo.find("tests", engagement=engagement["id"])) == 1
@@ -0,0 +1,90 @@
+import pytest
+from unittest.mock import Mock
+from common.cache import LookupCache, cached_lookup, cache_created
+
+api_url = "https://defectdojo.example.com"
+endpoint = api_url + "/api/v2/products/"
+
+
+class Products:
+    """Minimal resource used to exercise the cache decorators."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.endpoint = endpoint
+        self.logger = Mock()
+        self.lookups = 0
+
+    @cached_lookup(lambda name: {"name": name})
+    def get(self, name):
+        self.lookups += 1
+        return 7 if name == "existing" else None
+
+    @cache_created(lambda name: {"name": name})
+    def create(self, name):
+        return 8
+
+
+class TestLookupCache:
+    """Test cases for the LookupCache class."""
+
+    def test_cache_persists_between_instances(self, tmp_path):
+        cache = LookupCache(api_url, tmp_path)
+        cache.set(endpoint, {"name": "app"}, 3)
+
+        assert LookupCache(api_url, tmp_path).get(endpoint, {"name": "app"}) == (True, 3)
+
+    def test_cache_entries_expire(self, tmp_path):
+        cache = LookupCache(api_url, tmp_path, ttl=0, negative_ttl=60)
+        cache.set(endpoint, {"name": "app"}, 3)
+        cache.set(endpoint, {"name": "missing"}, None)
+
+        assert cache.get(endpoint, {"name": "app"}) == (False, None)
+        assert cache.get(endpoint, {"name": "missing"}) == (True, None)
+
+    def test_cache_invalidated_on_404(self, tmp_path):
+        cache = LookupCache(api_url, tmp_path)
+        cache.set(endpoint, {"name": "app"}, 3)
+        cache.set("https://other.example.com/api/v2/products/", {"name": "app"}, 4)
+
+        cache.response_hook(Mock(status_code=200, url=endpoint))
+        assert cache.get(endpoint, {"name": "app"}) == (True, 3)
+
+        cache.response_hook(Mock(status_code=404, url=api_url + "/api/v2/engagements/3/"))
+        assert cache.get(endpoint, {"name": "app"}) == (False, None)
+        assert LookupCache(api_url, tmp_path).get(
+            "https://other.example.com/api/v2/products/", {"name": "app"}
+        ) == (True, 4)
+
+    def test_unreadable_cache_is_ignored(self, tmp_path):
+        (tmp_path / "lookups.json").write_text("not json")
+
+        assert LookupCache(api_url, tmp_path).entries == {}
+
+
+class TestCacheDecorators:
+    """Test cases for the cached_lookup and cache_created decorators."""
+
+    def test_warm_lookups_skip_requests(self):
+        products = Products(LookupCache(api_url))
+
+        assert products.get("existing") == 7
+        assert products.get("existing") == 7
+        assert products.get("missing") is None
+        assert products.get("missing") is None
+        assert products.lookups == 2
+
+    def test_created_ids_are_cached(self):
+        products = Products(LookupCache(api_url))
+
+        assert products.get("new") is None
+        assert products.create("new") == 8
+        assert products.get("new") == 8
+        assert products.lookups == 1
+
+    def test_without_cache(self):
+        products = Products(None)
+
+        products.get("existing")
+        products.get("existing")
+        assert products.lookups == 2
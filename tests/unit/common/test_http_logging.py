@@ -0,0 +1,72 @@
+import logging
+import responses
+import requests
+from common.http_logging import (
+    REDACTED,
+    LazyBody,
+    LazyExchange,
+    redact_headers,
+    truncate_body,
+)
+from common.multipart import MultipartEncoder, ReportFile
+
+url = "https://dojo.example.com/api/v2/import-scan/"
+
+
+def test_redact_headers():
+    headers = {"Authorization": "Token secret", "X-Api-Key": "secret", "Accept": "*/*"}
+
+    assert redact_headers(headers) == {
+        "Authorization": REDACTED,
+        "X-Api-Key": REDACTED,
+        "Accept": "*/*",
+    }
+    assert redact_headers(None) == {}
+
+
+class TestTruncateBody:
+    """Test cases for the truncate_body function."""
+
+    def test_short_bodies_are_logged_whole(self):
+        assert truncate_body(b'{"id": 1}', 100) == '{"id": 1}'
+        assert truncate_body("product=1", 100) == "product=1"
+
+    def test_long_bodies_are_truncated(self):
+        assert truncate_body(b"a" * 5000, 10) == "aaaaaaaaaa... <4990 more bytes>"
+
+    def test_split_characters_are_replaced(self):
+        assert truncate_body("é".encode(), 1) == "�... <1 more bytes>"
+
+    def test_sizes_only(self):
+        assert truncate_body(b"a" * 5000, 0) == "<5000 bytes>"
+        assert truncate_body(None, 0) == "<empty>"
+
+    def test_streamed_bodies_are_not_read(self, tmp_path):
+        report = tmp_path / "report.json"
+        report.write_text("{}")
+        body = MultipartEncoder(
+            {"product": 1}, [("file", ("report.json", ReportFile(report), None))]
+        )
+
+        assert truncate_body(body) == f"<streamed body of {len(body)} bytes>"
+
+
+def test_lazy_body_is_formatted_when_logged(caplog):
+    with caplog.at_level(logging.ERROR):
+        logging.getLogger("test").error("Failed - %s", LazyBody(b"x" * 10, 4))
+
+    assert "Failed - xxxx... <6 more bytes>" in caplog.text
+
+
+@responses.activate
+def test_lazy_exchange_redacts_credentials():
+    responses.add(responses.POST, url, body=b"r" * 100, status=201)
+    response = requests.post(url, data=b"{}", headers={"Authorization": "Token secret"})
+
+    message = str(LazyExchange(response, 10))
+
+    assert message.startswith(f"POST {url} -> 201 in ")
+    assert "secret" not in message
+    assert f"'Authorization': '{REDACTED}'" in message
+    assert "Request body: {}" in message
+    assert "Response body: rrrrrrrrrr... <90 more bytes>" in message
@@ -0,0 +1,93 @@
+import pytest
+from common.instrumentation import (
+    RequestCounter,
+    RequestRecord,
+    RequestStats,
+    normalize_endpoint,
+)
+
+
+class TestNormalizeEndpoint:
+    """Test cases for the normalize_endpoint function."""
+
+    @pytest.mark.parametrize(
+        "url,endpoint",
+        [
+            ("https://dojo.example.com/api/v2/tests/?title=Scan", "/api/v2/tests/"),
+            ("https://dojo.example.com/api/v2/tests/42/", "/api/v2/tests/{id}/"),
+            (
+                "https://dtrack.example.com/api/v1/project/18841bb6-8f30-47a6-9fe2-caa4336e10d5/property",
+                "/api/v1/project/{uuid}/property",
+            ),
+            ("https://dtrack.example.com/api/v1/configProperty", "/api/v1/configProperty"),
+        ],
+    )
+    def test_normalize_endpoint(self, url, endpoint):
+        assert normalize_endpoint(url) == endpoint
+
+
+class TestRequestCounter:
+    """Test cases for the RequestCounter class."""
+
+    def test_counts_by_method_and_endpoint(self):
+        counter = RequestCounter()
+
+        counter(RequestRecord("GET", "https://dojo.example.com/api/v2/tests/1/", 200, 0.1))
+        counter(RequestRecord("GET", "https://dojo.example.com/api/v2/tests/2/", 200, 0.1))
+        counter(RequestRecord("POST", "https://dojo.example.com/api/v2/import-scan/", 503, 0.1))
+
+        assert counter.total == 3
+        assert counter.by_endpoint() == {
+            "GET /api/v2/tests/{id}/": 2,
+            "POST /api/v2/import-scan/": 1,
+        }
+
+    def test_reset(self):
+        counter = RequestCounter()
+        counter(RequestRecord("GET", "https://dojo.example.com/api/v2/tests/", 200, 0.1))
+
+        counter.reset()
+
+        assert counter.total == 0
+
+
+class TestRequestStats:
+    """Test cases for the RequestStats class."""
+
+    def test_sums_by_method_and_endpoint(self):
+        stats = RequestStats()
+
+        stats(RequestRecord("GET", "https://dojo.example.com/api/v2/tests/1/", 200, 0.1))
+        stats(RequestRecord("GET", "https://dojo.example.com/api/v2/tests/2/", 404, 0.3))
+        stats(
+            RequestRecord(
+                "POST",
+                "https://dojo.example.com/api/v2/import-scan/",
+                None,
+                0.5,
+                error="ConnectionError",
+                request_bytes=100,
+            )
+        )
+
+        summary = stats.to_dict()
+        assert summary["total"] == 3
+        assert summary["errors"] == 2
+        assert summary["seconds"] == pytest.approx(0.9)
+        assert summary["request_bytes"] == 100
+        assert summary["by_endpoint"]["GET /api/v2/tests/{id}/"] == {
+            "count": 2,
+            "errors": 1,
+            "seconds": pytest.approx(0.4),
+            "max_seconds": 0.3,
+            "request_bytes": 0,
+            "response_bytes": 0,
+        }
+
+    def test_reset(self):
+        stats = RequestStats()
+        stats(RequestRecord("GET", "https://dojo.example.com/api/v2/tests/", 200, 0.1))
+
+        stats.reset()
+
+        assert stats.to_dict()["total"] == 0
@@ -0,0 +1,23 @@
+import pytest
+from common import jsonlib
+
+
+def test_loads_bytes_and_text():
+    assert jsonlib.loads(b'{"id": 1, "name": "\xc3\xa9"}') == {"id": 1, "name": "é"}
+    assert jsonlib.loads('[{"id": 2}]') == [{"id": 2}]
+
+
+def test_loads_invalid_json_raises_value_error():
+    with pytest.raises(ValueError):
+        jsonlib.loads(b"<html>Bad Gateway</html>")
+
+
+def test_dumps_compact_text():
+    assert jsonlib.dumps({"name": "Product", "tags": ["a"]}) == '{"name":"Product","tags":["a"]}'
+
+
+def test_stdlib_fallback(monkeypatch):
+    monkeypatch.setattr(jsonlib, "orjson", None)
+
+    assert jsonlib.loads(b'{"id": 1}') == {"id": 1}
+    assert jsonlib.dumps({"id": 1}) == '{"id":1}'
@@ -0,0 +1,76 @@
+from common.instrumentation import RequestRecord
+from common.metrics import Metrics, MetricsWriter
+
+import_url = "https://dojo.example.com/api/v2/import-scan/"
+
+
+def record(status=201, elapsed=0.3, **kwargs) -> RequestRecord:
+    return RequestRecord("POST", import_url, status, elapsed, **kwargs)
+
+
+class TestMetrics:
+    """Test cases for the Metrics class."""
+
+    def test_render_histograms(self):
+        metrics = Metrics(buckets=(0.1, 1))
+        metrics(record(elapsed=0.05, ttfb=0.04))
+        metrics(record(elapsed=0.5, ttfb=0.45))
+
+        lines = metrics.render().splitlines()
+
+        labels = 'method="POST",endpoint="/api/v2/import-scan/"'
+        assert "# TYPE defectdojo_importer_http_request_duration_seconds histogram" in lines
+        assert (
+            f'defectdojo_importer_http_request_duration_seconds_bucket{{{labels},le="0.1"}} 1'
+            in lines
+        )
+        assert (
+            f'defectdojo_importer_http_request_duration_seconds_bucket{{{labels},le="1"}} 2'
+            in lines
+        )
+        assert (
+            f'defectdojo_importer_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2'
+            in lines
+        )
+        assert f"defectdojo_importer_http_request_duration_seconds_count{{{labels}}} 2" in lines
+        assert f"defectdojo_importer_http_time_to_first_byte_seconds_count{{{labels}}} 2" in lines
+
+    def test_render_counters(self):
+        metrics = Metrics()
+        metrics(record(status=503, request_bytes=100, response_bytes=10))
+        metrics(record(status=None, attempt=2, error="ConnectionError", request_bytes=100))
+        metrics(record(status=201, attempt=3, request_bytes=100, response_bytes=20))
+
+        lines = metrics.render().splitlines()
+
+        labels = 'method="POST",endpoint="/api/v2/import-scan/"'
+        assert f'defectdojo_importer_http_requests_total{{{labels},status="503"}} 1' in lines
+        assert (
+            f'defectdojo_importer_http_requests_total{{{labels},status="ConnectionError"}} 1'
+            in lines
+        )
+        assert f"defectdojo_importer_http_retries_total{{{labels}}} 2" in lines
+        assert f"defectdojo_importer_http_request_bytes_total{{{labels}}} 300" in lines
+        assert f"defectdojo_importer_http_response_bytes_total{{{labels}}} 30" in lines
+
+
+class TestMetricsWriter:
+    """Test cases for the MetricsWriter class."""
+
+    def test_writes_metrics_when_stopped(self, tmp_path):
+        metrics = Metrics()
+        path = tmp_path / "importer.prom"
+
+        with MetricsWriter(metrics, str(path)):
+            metrics(record())
+
+        assert "defectdojo_importer_http_requests_total" in path.read_text()
+        assert [file.name for file in tmp_path.iterdir()] == ["importer.prom"]
+
+    def test_writes_metrics_while_running(self, tmp_path):
+        metrics = Metrics()
+        path = tmp_path / "importer.prom"
+
+        with MetricsWriter(metrics, str(path), interval=0.01) as writer:
+            writer.stopped.wait(0.1)
+            assert path.exists()
@@ -0,0 +1,73 @@
+import pytest
+from email.parser import BytesParser
+from common.multipart import MultipartEncoder, ReportFile
+
+
+def parse(encoder: MultipartEncoder) -> list:
+    """Parse an encoded body back into its form-data parts."""
+    message = BytesParser().parsebytes(
+        f"Content-Type: {encoder.content_type}\r\n\r\n".encode() + encoder.read()
+    )
+    return [
+        (
+            part.get_param("name", header="content-disposition"),
+            part.get_filename(),
+            part.get_payload(decode=True),
+        )
+        for part in message.get_payload()
+    ]
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = tmp_path / "report.json"
+    path.write_bytes(b'{"findings": []}' * 1000)
+    return ReportFile(path)
+
+
+class TestMultipartEncoder:
+    """Test cases for the MultipartEncoder class."""
+
+    def test_encodes_fields_and_files(self, report):
+        encoder = MultipartEncoder(
+            {"scan_type": "ESLint Scan", "tags": ["a", "b"], "active": True, "test": None},
+            [("file", ("report.json", report, "application/json"))],
+        )
+
+        parts = parse(encoder)
+
+        assert parts == [
+            ("scan_type", None, b"ESLint Scan"),
+            ("tags", None, b"a"),
+            ("tags", None, b"b"),
+            ("active", None, b"True"),
+            ("file", "report.json", report.path.read_bytes()),
+        ]
+
+    def test_length_matches_body(self, report):
+        encoder = MultipartEncoder({"product": 1}, [("file", ("report.json", report, None))])
+
+        assert len(encoder) == len(encoder.read())
+
+    def test_reads_in_chunks_and_rewinds(self, report):
+        encoder = MultipartEncoder({}, [("file", ("report.json", report, None))], chunk_size=100)
+        body = b""
+        while chunk := encoder.read(333):
+            assert len(chunk) <= 333
+            body += chunk
+
+        assert encoder.tell() == len(encoder)
+        encoder.seek(0)
+        assert encoder.read() == body
+        assert b"".join(encoder) == body
+
+    def test_skips_empty_files(self):
+        encoder = MultipartEncoder(
+            {"product": 1}, [("file", (None, None, "application/octet-stream"))]
+        )
+
+        assert parse(encoder) == [("product", None, b"1")]
+
+    def test_only_rewinds_to_start(self):
+        with pytest.raises(OSError):
+            MultipartEncoder({}, []).seek(10)
@@ -0,0 +1,101 @@
+import pstats
+import logging
+import pytest
+from common.profiling import Profiler, profiling, format_bytes, PROFILER
+
+
+@pytest.fixture
+def profiler():
+    profiler = Profiler()
+    profiler.start()
+    yield profiler
+    if profiler.enabled:
+        profiler.stop()
+
+
+class TestProfiler:
+    """Test cases for the Profiler class."""
+
+    def test_memory_is_only_measured_while_profiling(self):
+        profiler = Profiler()
+
+        with profiler.phase("config"):
+            data = bytearray(1024 * 1024)
+            del data
+
+        assert profiler.phases["config"].calls == 1
+        assert profiler.phases["config"].peak == 0
+
+    def test_timings(self):
+        profiler = Profiler()
+
+        for _ in range(2):
+            with profiler.phase("resolution"):
+                pass
+
+        timings = profiler.timings()
+        assert list(timings) == ["resolution"]
+        assert timings["resolution"]["calls"] == 2
+        assert timings["resolution"]["wall"] >= 0
+        profiler.reset()
+        assert profiler.timings() == {}
+
+    def test_phase_stats(self, profiler):
+        for _ in range(2):
+            with profiler.phase("upload"):
+                data = bytearray(1024 * 1024)
+                del data
+        profiler.stop()
+
+        stats = profiler.phases["upload"]
+        assert stats.calls == 2
+        assert stats.wall > 0
+        assert stats.cpu >= 0
+        assert stats.peak >= 1024 * 1024
+        assert profiler.peak >= stats.peak
+
+    def test_running_phases_keep_their_peak(self, profiler):
+        with profiler.phase("resolution"):
+            data = bytearray(1024 * 1024)
+            del data
+            # Starting a phase resets the tracemalloc peak
+            with profiler.phase("preparation"):
+                pass
+        profiler.stop()
+
+        assert profiler.phases["resolution"].peak >= 1024 * 1024
+        assert profiler.phases["preparation"].peak < 1024 * 1024
+
+    def test_summary(self, profiler):
+        with profiler.phase("config"):
+            sorted(range(1000), reverse=True)
+        profiler.stop()
+
+        lines = profiler.summary().splitlines()
+
+        assert lines[0].split() == ["Phase", "Calls", "Wall", "(s)", "CPU", "(s)", "Peak", "memory"]
+        assert lines[1].startswith("config ")
+        assert lines[2].startswith("total ")
+        assert any("ncalls" in line for line in lines)
+
+
+def test_format_bytes():
+    assert format_bytes(512) == "512 B"
+    assert format_bytes(2048) == "2.0 KiB"
+    assert format_bytes(3 * 1024 * 1024) == "3.0 MiB"
+
+
+def test_profiling_writes_statistics(tmp_path, caplog):
+    path = tmp_path / "run.prof"
+
+    with caplog.at_level(logging.INFO, logger="defectdojo_importer"):
+        with pytest.raises(SystemExit):
+            with profiling(str(path)):
+                with PROFILER.phase("config"):
+                    sorted(range(1000))
+                raise SystemExit(1)
+
+    assert not PROFILER.enabled
+    assert pstats.Stats(str(path)).total_calls > 0
+    assert f"Profile written to {path}" in caplog.text
+    assert "config " in caplog.text
@@ -0,0 +1,85 @@
+import json
+import threading
+import pytest
+from common.ratelimit import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRateLimiter:
+    """Test cases for the RateLimiter class."""
+
+    def test_burst_then_paced(self):
+        clock = FakeClock()
+        limiter = RateLimiter({"lookup": 2}, clock=clock)
+
+        delays = [limiter.reserve("lookup") for _ in range(4)]
+
+        # A second of requests is sent right away, the next ones half a second apart
+        assert delays == [0.0, 0.0, 0.5, 1.0]
+
+    def test_tokens_refill(self):
+        clock = FakeClock()
+        limiter = RateLimiter({"import": 0.5}, clock=clock)
+
+        assert limiter.reserve("import") == 0.0
+        assert limiter.reserve("import") == 2.0
+        clock.now += 10
+        assert limiter.reserve("import") == 0.0
+
+    def test_unlimited_families(self):
+        limiter = RateLimiter({"lookup": 0, "import": 1})
+
+        assert limiter.reserve("lookup") == 0.0
+        assert limiter.reserve("dtrack") == 0.0
+        assert "lookup" not in limiter.rates
+
+    def test_acquire_sleeps_until_due(self):
+        clock = FakeClock()
+        slept = []
+        limiter = RateLimiter({"import": 1}, clock=clock, sleep=slept.append)
+
+        limiter.acquire("import")
+        limiter.acquire("import")
+
+        assert slept == [1.0]
+
+    def test_concurrent_requests_are_spaced(self):
+        clock = FakeClock()
+        limiter = RateLimiter({"lookup": 10}, clock=clock)
+        delays = []
+
+        def reserve():
+            for _ in range(5):
+                delays.append(limiter.reserve("lookup"))
+
+        threads = [threading.Thread(target=reserve) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(delays) == pytest.approx([0.0] * 10 + [0.1 * i for i in range(1, 11)])
+
+    def test_buckets_are_shared_through_a_file(self, tmp_path):
+        path = tmp_path / "rate-limit.json"
+        clock = FakeClock()
+        first = RateLimiter({"import": 1}, str(path), clock=clock)
+        second = RateLimiter({"import": 1}, str(path), clock=clock)
+
+        assert first.reserve("import") == 0.0
+        assert second.reserve("import") == 1.0
+        assert json.loads(path.read_text())["import"] == [-1.0, 100.0]
+
+    def test_state_of_a_previous_boot_is_reset(self, tmp_path):
+        path = tmp_path / "rate-limit.json"
+        path.write_text(json.dumps({"import": [-50.0, 1000.0]}))
+        limiter = RateLimiter({"import": 1}, str(path), clock=FakeClock())
+
+        assert limiter.reserve("import") == 0.0
@@ -0,0 +1,61 @@
+import threading
+import pytest
+from common.resolver import Resolver
+
+
+class TestResolver:
+    def test_dependencies_receive_results(self):
+        resolver = Resolver()
+        resolver.add("product_type", lambda: 1)
+        resolver.add("product", lambda product_type: product_type + 1, "product_type")
+        resolver.add("engagement", lambda product: product * 10, "product")
+
+        assert resolver.resolve() == {"product_type": 1, "product": 2, "engagement": 20}
+
+    def test_independent_steps_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        resolver = Resolver()
+        resolver.add("product_type", lambda: (barrier.wait(), "product type")[1])
+        resolver.add("test_type", lambda: (barrier.wait(), "test type")[1])
+        resolver.add("test", lambda *results: results, "product_type", "test_type")
+
+        assert resolver.resolve()["test"] == ("product type", "test type")
+
+    def test_failed_step_skips_dependents(self):
+        dependent = []
+        resolver = Resolver()
+        resolver.add("test_type", lambda: (_ for _ in ()).throw(ValueError("invalid")))
+        resolver.add("test", lambda test_type: dependent.append(test_type), "test_type")
+
+        with pytest.raises(ValueError, match="invalid"):
+            resolver.resolve()
+        assert dependent == []
+
+    def test_unknown_dependency(self):
+        resolver = Resolver()
+        resolver.add("test", lambda engagement: None, "engagement")
+
+        with pytest.raises(ValueError, match="unknown steps"):
+            resolver.resolve()
+
+    def test_circular_dependency(self):
+        resolver = Resolver()
+        resolver.add("a", lambda b: None, "b")
+        resolver.add("b", lambda a: None, "a")
+
+        with pytest.raises(ValueError, match="circular"):
+            resolver.resolve()
+
+    def test_critical_path(self):
+        wait = threading.Event().wait
+        resolver = Resolver()
+        resolver.add("product_type", lambda: wait(0.02))
+        resolver.add("product", lambda _: wait(0.02), "product_type")
+        resolver.add("test_type", lambda: wait(0.01))
+        resolver.add("test", lambda *_: None, "product", "test_type")
+        resolver.resolve()
+
+        path, latency = resolver.critical_path()
+
+        assert path == ["product_type", "product", "test"]
+        assert latency >= 0.04
@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import Mock
+from requests.exceptions import ConnectionError, ConnectTimeout
+from common.retry import (
+    RetryPolicy,
+    default_retry_policies,
+    endpoint_family,
+    is_connect_error,
+    retry_after,
+)
+
+
+class TestEndpointFamily:
+    """Test cases for the endpoint_family function."""
+
+    @pytest.mark.parametrize(
+        "url,family",
+        [
+            ("https://dojo.example.com/api/v2/import-scan/", "import"),
+            ("https://dojo.example.com/api/v2/reimport-scan/", "import"),
+            ("https://dojo.example.com/api/v2/import-languages/", "import"),
+            ("https://dojo.example.com/api/v2/products/", "lookup"),
+            ("https://dtrack.example.com/api/v1/project/lookup", "dtrack"),
+        ],
+    )
+    def test_endpoint_family(self, url, family):
+        assert endpoint_family(url) == family
+
+
+class TestRetryAfter:
+    """Test cases for the retry_after function."""
+
+    def test_retry_after_seconds(self):
+        response = Mock(headers={"Retry-After": "7"})
+        assert retry_after(response) == 7.0
+
+    def test_retry_after_http_date_in_past(self):
+        response = Mock(headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        assert retry_after(response) == 0.0
+
+    def test_retry_after_missing_or_invalid(self):
+        assert retry_after(None) is None
+        assert retry_after(Mock(headers={})) is None
+        assert retry_after(Mock(headers={"Retry-After": "soon"})) is None
+
+
+class TestRetryPolicy:
+    """Test cases for the RetryPolicy class."""
+
+    def test_backoff_is_bounded_by_full_jitter(self):
+        policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+        for attempt in range(1, 10):
+            assert 0 <= policy.backoff(attempt) <= min(5.0, 2 ** (attempt - 1))
+
+    def test_next_delay_retryable_status(self):
+        policy = RetryPolicy(max_retries=2)
+        response = Mock(status_code=503, headers={})
+        assert policy.next_delay("GET", 1, 60, response=response) is not None
+        assert policy.next_delay("GET", 3, 60, response=response) is None
+
+    def test_next_delay_non_retryable(self):
+        policy = RetryPolicy()
+        assert policy.next_delay("GET", 1, 60, response=Mock(status_code=404, headers={})) is None
+        assert policy.next_delay("POST", 1, 60, response=Mock(status_code=503, headers={})) is None
+
+    def test_next_delay_honours_retry_after_and_budget(self):
+        policy = RetryPolicy()
+        response = Mock(status_code=429, headers={"Retry-After": "10"})
+        assert policy.next_delay("GET", 1, 60, response=response) == 10.0
+        assert policy.next_delay("GET", 1, 5, response=response) is None
+
+    def test_import_policy_only_retries_unsent_requests(self):
+        policy = default_retry_policies()["import"]
+        assert policy.next_delay("POST", 1, 120, error=ConnectTimeout()) is not None
+        assert policy.next_delay("POST", 1, 120, error=ConnectionError("reset")) is None
+        assert policy.next_delay("POST", 1, 120, response=Mock(status_code=502)) is None
+
+    def test_is_connect_error(self):
+        assert is_connect_error(ConnectTimeout()) is True
+        assert is_connect_error(ConnectionError("Connection reset by peer")) is False
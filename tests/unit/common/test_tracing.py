@@ -0,0 +1,135 @@
+import json
+import threading
+import pytest
+from common.instrumentation import RequestRecord
+from common.tracing import Tracer, TraceWriter, NOOP_SPAN, SPAN_KIND_CLIENT
+
+import_url = "https://dojo.example.com/api/v2/import-scan/"
+
+
+@pytest.fixture
+def tracer() -> Tracer:
+    tracer = Tracer()
+    tracer.enabled = True
+    return tracer
+
+
+class TestTracer:
+    """Test cases for the Tracer class."""
+
+    def test_spans_are_disabled_by_default(self):
+        tracer = Tracer()
+
+        with tracer.span("lookup", name="Product") as span:
+            span.set(id=1)
+
+        assert span is NOOP_SPAN
+        assert tracer.spans == []
+
+    def test_nested_spans(self, tracer):
+        with tracer.span("get_or_create product", name="Product") as outer:
+            with tracer.span("lookup") as inner:
+                pass
+            outer.set(id=2, created=None)
+
+        assert [span.name for span in tracer.spans] == ["lookup", "get_or_create product"]
+        assert inner.parent_id == outer.span_id
+        assert outer.parent_id is None
+        assert outer.attributes == {"name": "Product", "id": 2}
+        assert outer.start <= inner.start <= inner.end <= outer.end
+
+    def test_span_records_errors(self, tracer):
+        with pytest.raises(ValueError):
+            with tracer.span("import-scan"):
+                raise ValueError("Bad report")
+
+        assert tracer.spans[0].error == "ValueError: Bad report"
+
+    def test_worker_spans_belong_to_the_root(self, tracer):
+        tracer.root = tracer.start_span("run")
+
+        def work():
+            with tracer.span("import_report"):
+                pass
+
+        thread = threading.Thread(target=work, name="worker")
+        thread.start()
+        thread.join()
+
+        span = tracer.spans[0]
+        assert span.parent_id == tracer.root.span_id
+        assert span.thread_name == "worker"
+        assert span.thread_id == thread.native_id
+
+    def test_request_records_are_client_spans(self, tracer):
+        with tracer.span("import-scan") as parent:
+            tracer(RequestRecord("POST", import_url, 201, 0.5, attempt=2, request_bytes=100))
+
+        request = tracer.spans[0]
+        assert request.name == "POST /api/v2/import-scan/"
+        assert request.kind == SPAN_KIND_CLIENT
+        assert request.parent_id == parent.span_id
+        assert request.end - request.start == 500_000_000
+        assert request.attributes["http.response.status_code"] == 201
+        assert request.attributes["http.request.resend_count"] == 1
+        assert request.attributes["http.request.body.size"] == 100
+
+    def test_chrome_trace(self, tracer):
+        with tracer.span("import", product_name="Product"):
+            with tracer.span("import-scan"):
+                pass
+
+        trace = tracer.chrome_trace()
+
+        events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        assert [event["name"] for event in events] == ["import", "import-scan"]
+        assert events[0]["args"] == {"product_name": "Product"}
+        assert events[0]["dur"] >= events[1]["dur"]
+        assert {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": events[0]["pid"],
+            "tid": events[0]["tid"],
+            "args": {"name": "MainThread"},
+        } in trace["traceEvents"]
+
+    def test_otlp_trace(self, tracer):
+        with tracer.span("import", test_id=3, reimport=True):
+            with tracer.span("import-scan"):
+                pass
+
+        trace = tracer.otlp_trace()
+
+        resource_spans = trace["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"] == [
+            {"key": "service.name", "value": {"stringValue": "defectdojo-importer"}}
+        ]
+        outer, inner = resource_spans["scopeSpans"][0]["spans"]
+        assert outer["traceId"] == inner["traceId"] == tracer.trace_id
+        assert inner["parentSpanId"] == outer["spanId"]
+        assert "parentSpanId" not in outer
+        assert int(outer["endTimeUnixNano"]) >= int(inner["endTimeUnixNano"])
+        assert {"key": "test_id", "value": {"intValue": "3"}} in outer["attributes"]
+        assert {"key": "reimport", "value": {"boolValue": True}} in outer["attributes"]
+
+
+class TestTraceWriter:
+    """Test cases for the TraceWriter class."""
+
+    def test_writes_trace_when_stopped(self, tmp_path):
+        tracer = Tracer()
+        path = tmp_path / "trace.json"
+        tracer.enabled = True
+        started = tracer.now()
+        parse = tracer.add_span("parse_arguments", started, tracer.now())
+
+        with TraceWriter(tracer, str(path), "otlp", "import") as root:
+            with tracer.span("prepare_report"):
+                pass
+
+        spans = json.loads(path.read_text())["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [span["name"] for span in spans] == ["import", "parse_arguments", "prepare_report"]
+        assert parse.parent_id == root.span_id
+        assert root.start == started
+        assert not tracer.enabled
+        assert tracer.spans == []
@@ -1,6 +1,8 @@
+import os
 import pytest
 from pathlib import Path
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
+from common.multipart import ReportFile
 from common.utils import (
     get_files,
     get_service_keys,
@@ -9,6 +11,7 @@ from common.utils import (
     get_commit_hash,
     get_scm_uri,
     get_branch_tag,
+    get_report_files,
 )
 
 
@@ -50,8 +53,9 @@ class TestGetFiles:
 
         assert result == expected
 
-    @patch("builtins.open", new_callable=mock_open, read_data=b"file contents")
-    def test_get_files_with_valid_filename(self, mock_file):
+    @patch("common.utils.os.access", return_value=True)
+    @patch("common.utils.Path.is_file", return_value=True)
+    def test_get_files_with_valid_filename(self, mock_is_file, mock_access):
         """Test get_files with a valid filename."""
         filename = "/path/to/testfile.txt"
 
@@ -62,17 +66,18 @@ class TestGetFiles:
                 "file",
                 (
                     "testfile.txt",
-                    b"file contents",
+                    ReportFile(Path(filename).expanduser().absolute()),
                     "application/octet-stream",
                 ),
             )
         ]
 
         assert result == expected
-        mock_file.assert_called_once_with(Path(filename).expanduser().absolute(), "rb")
+        mock_access.assert_called_once_with(Path(filename).expanduser().absolute(), os.R_OK)
 
-    @patch("builtins.open", new_callable=mock_open, read_data=b"original contents")
-    def test_get_files_with_payload_override(self, mock_file):
+    @patch("common.utils.os.access", return_value=True)
+    @patch("common.utils.Path.is_file", return_value=True)
+    def test_get_files_with_payload_override(self, mock_is_file, mock_access):
         """Test get_files when payload overrides file contents."""
         filename = "/path/to/testfile.txt"
         payload = b"custom payload"
@@ -91,10 +96,11 @@ class TestGetFiles:
         ]
 
         assert result == expected
-        mock_file.assert_called_once_with(Path(filename).expanduser().absolute(), "rb")
+        mock_access.assert_called_once_with(Path(filename).expanduser().absolute(), os.R_OK)
 
-    @patch("builtins.open", new_callable=mock_open, read_data=b"file contents")
-    def test_get_files_with_relative_path(self, mock_file):
+    @patch("common.utils.os.access", return_value=True)
+    @patch("common.utils.Path.is_file", return_value=True)
+    def test_get_files_with_relative_path(self, mock_is_file, mock_access):
         """Test get_files with a relative path."""
         filename = "~/documents/testfile.txt"
 
@@ -105,7 +111,7 @@ class TestGetFiles:
                 "file",
                 (
                     "testfile.txt",
-                    b"file contents",
+                    ReportFile(Path(filename).expanduser().absolute()),
                     "application/octet-stream",
                 ),
             )
@@ -113,26 +119,28 @@ class TestGetFiles:
 
         assert result == expected
         # Verify that expanduser() and absolute() were applied
-        mock_file.assert_called_once_with(Path(filename).expanduser().absolute(), "rb")
+        mock_access.assert_called_once_with(Path(filename).expanduser().absolute(), os.R_OK)
 
-    @patch("builtins.open", side_effect=FileNotFoundError("File not found"))
-    def test_get_files_with_nonexistent_file(self, mock_file):
+    @patch("common.utils.Path.is_file", return_value=False)
+    def test_get_files_with_nonexistent_file(self, mock_is_file):
         """Test get_files with a non-existent file."""
         filename = "/path/to/nonexistent.txt"
 
         with pytest.raises(FileNotFoundError):
             get_files(filename=filename)
 
-    @patch("builtins.open", side_effect=PermissionError("Permission denied"))
-    def test_get_files_with_permission_error(self, mock_file):
+    @patch("common.utils.os.access", return_value=False)
+    @patch("common.utils.Path.is_file", return_value=True)
+    def test_get_files_with_permission_error(self, mock_is_file, mock_access):
         """Test get_files when file cannot be read due to permissions."""
         filename = "/path/to/restricted.txt"
 
         with pytest.raises(PermissionError):
             get_files(filename=filename)
 
-    @patch("builtins.open", new_callable=mock_open, read_data=b"")
-    def test_get_files_with_empty_file(self, mock_file):
+    @patch("common.utils.os.access", return_value=True)
+    @patch("common.utils.Path.is_file", return_value=True)
+    def test_get_files_with_empty_file(self, mock_is_file, mock_access):
         """Test get_files with an empty file."""
         filename = "/path/to/empty.txt"
 
@@ -143,7 +151,7 @@ class TestGetFiles:
                 "file",
                 (
                     "empty.txt",
-                    b"",
+                    ReportFile(Path(filename).expanduser().absolute()),
                     "application/octet-stream",
                 ),
             )
@@ -329,3 +337,40 @@ class TestBuildSystemFunctionsEnvUnset:
         """Test get_branch_tag returns None when no env vars are set."""
         branch_tag = get_branch_tag()
         assert branch_tag is None
+
+
+class TestGetReportFiles:
+    """Test cases for the get_report_files function."""
+
+    @pytest.fixture
+    def report_dir(self, tmp_path):
+        (tmp_path / "trivy.json").write_text("{}")
+        (tmp_path / "gitleaks.json").write_text("{}")
+        (tmp_path / "lint.sarif").write_text("{}")
+        (tmp_path / "nested").mkdir()
+        return tmp_path
+
+    def test_single_file(self):
+        assert get_report_files("report.json", "ZAP Scan") == [("report.json", "ZAP Scan")]
+        assert get_report_files(None, "ZAP Scan") == []
+
+    def test_test_type_mapping(self, report_dir):
+        result = get_report_files(
+            [f"{report_dir}/trivy.json=Trivy Scan", f"{report_dir}/lint.sarif"], "SARIF"
+        )
+
+        assert result == [
+            (f"{report_dir}/trivy.json", "Trivy Scan"),
+            (f"{report_dir}/lint.sarif", "SARIF"),
+        ]
+
+    def test_glob_and_directory(self, report_dir):
+        assert get_report_files([f"{report_dir}/*.json=Generic Findings Import"], "SARIF") == [
+            (f"{report_dir}/gitleaks.json", "Generic Findings Import"),
+            (f"{report_dir}/trivy.json", "Generic Findings Import"),
+        ]
+        assert [filename for filename, _ in get_report_files([str(report_dir)], "SARIF")] == [
+            f"{report_dir}/gitleaks.json",
+            f"{report_dir}/lint.sarif",
+            f"{report_dir}/trivy.json",
+        ]
@@ -0,0 +1,91 @@
+import pytest
+from unittest.mock import Mock, call
+from requests.exceptions import HTTPError
+from defectdojo import lookup
+from defectdojo.lookup import get_newest
+
+endpoint = "https://example.com/api/v2/tests/"
+
+
+def page(*ids, count=None, next=None):
+    return {
+        "count": len(ids) if count is None else count,
+        "next": next,
+        "results": [{"id": id} for id in ids],
+    }
+
+
+@pytest.fixture(autouse=True)
+def ordering(monkeypatch):
+    monkeypatch.setattr(lookup, "ordering_checked", set())
+    monkeypatch.setattr(lookup, "ordering_rejected", set())
+    return lookup
+
+
+class TestGetNewest:
+    def test_single_match(self, mock_http_client, ordering):
+        mock_http_client.request_json.return_value = page(5)
+
+        assert get_newest(mock_http_client, endpoint, {"title": "Test"}) == {"id": 5}
+        mock_http_client.request_json.assert_called_once_with(
+            "GET", endpoint, params={"title": "Test", "o": "-id", "limit": 1}
+        )
+        assert endpoint not in ordering.ordering_checked
+
+    def test_no_match(self, mock_http_client):
+        mock_http_client.request_json.return_value = page()
+
+        assert get_newest(mock_http_client, endpoint, {"title": "Test"}) is None
+
+    def test_ordering_is_checked_once(self, mock_http_client, ordering):
+        mock_http_client.request_json.side_effect = [
+            page(9, count=3),
+            page(3, 9, 4),
+            page(9, count=3),
+        ]
+
+        assert get_newest(mock_http_client, endpoint, {"title": "Test"}) == {"id": 9}
+        assert get_newest(mock_http_client, endpoint, {"title": "Test"}) == {"id": 9}
+        assert mock_http_client.request_json.call_args_list[1] == call(
+            "GET", endpoint, params={"title": "Test", "limit": 100}
+        )
+        assert mock_http_client.request_json.call_count == 3
+        assert ordering.ordering_checked == {endpoint}
+        assert ordering.ordering_rejected == set()
+
+    def test_ignored_ordering(self, mock_http_client, ordering):
+        mock_http_client.request_json.side_effect = [page(3, count=3), page(3, 9, 4), page(3, 9)]
+
+        assert get_newest(mock_http_client, endpoint, {"title": "Test"}) == {"id": 9}
+        assert get_newest(mock_http_client, endpoint, {"title": "Test"}) == {"id": 9}
+        assert mock_http_client.request_json.call_args_list[2] == call(
+            "GET", endpoint, params={"title": "Test", "limit": 100}
+        )
+        assert ordering.ordering_rejected == {endpoint}
+
+    def test_rejected_ordering(self, mock_http_client, ordering):
+        next_page = "http://internal/api/v2/tests/?limit=2&offset=2&title=Test"
+        mock_http_client.request_json.side_effect = [
+            HTTPError(response=Mock(status_code=400)),
+            page(2, 7, count=3, next=next_page),
+            page(11, count=3),
+            page(4),
+        ]
+
+        assert get_newest(mock_http_client, endpoint, {"title": "Test"}) == {"id": 11}
+        assert mock_http_client.request_json.call_args_list[2] == call(
+            "GET", endpoint + "?limit=2&offset=2&title=Test", params=None
+        )
+        assert ordering.ordering_rejected == {endpoint}
+
+        # The ordering is not tried again
+        assert get_newest(mock_http_client, endpoint, {"title": "Test"}) == {"id": 4}
+        assert mock_http_client.request_json.call_args_list[3] == call(
+            "GET", endpoint, params={"title": "Test", "limit": 100}
+        )
+
+    def test_server_error(self, mock_http_client):
+        mock_http_client.request_json.side_effect = HTTPError(response=Mock(status_code=500))
+
+        with pytest.raises(HTTPError):
+            get_newest(mock_http_client, endpoint, {"title": "Test"})
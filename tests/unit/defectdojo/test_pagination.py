@@ -0,0 +1,57 @@
+import threading
+from unittest.mock import call
+from defectdojo import paginate
+
+endpoint = "https://example.com/api/v2/engagements/"
+
+
+def page(ids, next=None):
+    return {
+        "count": 5,
+        "next": next and f"http://internal/api/v2/engagements/?{next}",
+        "results": [{"id": id} for id in ids],
+    }
+
+
+class TestPaginate:
+    def test_follows_next_links(self, mock_http_client):
+        mock_http_client.request_json.side_effect = [
+            page([1, 2], next="limit=2&offset=2"),
+            page([3, 4], next="limit=2&offset=4"),
+            page([5]),
+        ]
+
+        objects = list(paginate(mock_http_client, endpoint, {"product": 1}, page_size=2))
+
+        assert [obj["id"] for obj in objects] == [1, 2, 3, 4, 5]
+        assert mock_http_client.request_json.call_args_list == [
+            call("GET", endpoint, params={"product": 1, "limit": 2}),
+            call("GET", endpoint + "?limit=2&offset=2", params=None),
+            call("GET", endpoint + "?limit=2&offset=4", params=None),
+        ]
+
+    def test_pages_are_fetched_lazily(self, mock_http_client):
+        mock_http_client.request_json.side_effect = [page([1, 2], next="limit=2&offset=2")]
+
+        objects = paginate(mock_http_client, endpoint, page_size=2, prefetch=False)
+
+        assert next(objects) == {"id": 1}
+        assert next(objects) == {"id": 2}
+        assert mock_http_client.request_json.call_count == 1
+        objects.close()
+
+    def test_next_page_is_prefetched(self, mock_http_client):
+        prefetched = threading.Event()
+
+        def request(method, url, params=None):
+            if params is None:
+                prefetched.set()
+                return page([3])
+            return page([1, 2], next="limit=2&offset=2")
+
+        mock_http_client.request_json.side_effect = request
+        objects = paginate(mock_http_client, endpoint, page_size=2)
+
+        assert next(objects) == {"id": 1}
+        assert prefetched.wait(5)
+        assert [obj["id"] for obj in objects] == [2, 3]
@@ -0,0 +1,171 @@
+import json
+import threading
+import pytest
+from unittest.mock import Mock
+from models.exceptions import ConfigurationError
+from models.result import ImportResult, ImportStatus
+from importer.batch import load_manifest, batch_jobs, run_batch, write_results
+
+eslint_report = "tests/reports/eslint-report.json"
+
+
+@pytest.fixture
+def config(make_config):
+    return make_config(product_name="", engagement_name="Nightly")
+
+
+class TestLoadManifest:
+    def test_load_json_manifest_with_defaults(self, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(
+            json.dumps(
+                {
+                    "defaults": {"product_type_name": "Web"},
+                    "imports": [
+                        {"product_name": "Shop", "file": eslint_report},
+                        {"product_name": "Blog", "product_type_name": "Blogs"},
+                    ],
+                }
+            )
+        )
+
+        entries = load_manifest(str(manifest))
+
+        assert entries == [
+            {"product_type_name": "Web", "product_name": "Shop", "file": eslint_report},
+            {"product_type_name": "Blogs", "product_name": "Blog"},
+        ]
+
+    def test_load_yaml_manifest(self, tmp_path):
+        pytest.importorskip("yaml")
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text("- product_name: Shop\n  file: report.json\n")
+
+        assert load_manifest(str(manifest)) == [{"product_name": "Shop", "file": "report.json"}]
+
+    def test_load_empty_manifest(self, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({"imports": []}))
+
+        with pytest.raises(ConfigurationError, match="does not contain any imports"):
+            load_manifest(str(manifest))
+
+    def test_load_invalid_manifest(self, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text("{")
+
+        with pytest.raises(ConfigurationError, match="Invalid batch manifest"):
+            load_manifest(str(manifest))
+
+
+class TestBatchJobs:
+    def test_entries_override_base_config(self, config):
+        jobs = batch_jobs(
+            config,
+            [
+                {"product_name": "Shop", "file": eslint_report},
+                {"product_name": "Blog", "engagement-name": "Weekly", "file": eslint_report},
+            ],
+        )
+
+        assert [job.config.product_name for job in jobs] == ["Shop", "Blog"]
+        assert [job.config.engagement_name for job in jobs] == ["Nightly", "Weekly"]
+        assert all(job.config.test_name == "ESLint Scan" for job in jobs)
+        assert all(job.filename.endswith("eslint-report.json") for job in jobs)
+
+    def test_entry_without_product(self, config):
+        with pytest.raises(ConfigurationError, match="Import 1: Product name is required."):
+            batch_jobs(config, [{"file": eslint_report}])
+
+    def test_entry_without_report(self, config):
+        with pytest.raises(ConfigurationError, match="file or tool configuration is required"):
+            batch_jobs(config, [{"product_name": "Shop"}])
+
+    def test_entry_with_global_key(self, config):
+        with pytest.raises(ConfigurationError, match="Unknown keys in import 1: workers."):
+            batch_jobs(config, [{"product_name": "Shop", "file": eslint_report, "workers": 8}])
+
+
+class TestRunBatch:
+    def test_same_test_imports_run_in_order(self, config, mocker):
+        defectdojo = Mock()
+        mocker.patch(
+            "importer.batch.setup_product_engagement",
+            side_effect=lambda _, config: {"engagement_id": config.product_name},
+        )
+        running = {}
+        overlaps = []
+        lock = threading.Lock()
+
+        def import_report_file(defectdojo, config, filename, engagement_config=None):
+            key = (config.product_name, config.test_name)
+            with lock:
+                if running.get(key):
+                    overlaps.append(key)
+                running[key] = True
+            threading.Event().wait(0.01)
+            with lock:
+                running[key] = False
+            return ImportResult(ImportStatus.REIMPORTED, filename, test_name=config.test_name)
+
+        mocker.patch("importer.batch.import_report_file", side_effect=import_report_file)
+        entries = [{"product_name": name, "file": eslint_report} for name in "ABAB"]
+        jobs = batch_jobs(config, entries)
+
+        results = run_batch(defectdojo, jobs, workers=4)
+
+        assert overlaps == []
+        assert len(results) == 4
+        assert all(result.status == ImportStatus.REIMPORTED for result in results)
+
+    def test_failed_context_fails_its_imports(self, config, mocker):
+        def setup_product_engagement(_, config):
+            if config.product_name == "Broken":
+                raise ValueError("product type not allowed")
+            return {"engagement_id": 1}
+
+        mocker.patch(
+            "importer.batch.setup_product_engagement", side_effect=setup_product_engagement
+        )
+        import_report_file = mocker.patch(
+            "importer.batch.import_report_file",
+            return_value=ImportResult(ImportStatus.IMPORTED),
+        )
+        jobs = batch_jobs(
+            config,
+            [
+                {"product_name": "Broken", "file": eslint_report},
+                {"product_name": "Shop", "file": eslint_report},
+            ],
+        )
+
+        results = run_batch(Mock(), jobs, workers=2)
+
+        assert results[0].status == ImportStatus.FAILED
+        assert results[0].error == "product type not allowed"
+        assert results[1].status == ImportStatus.IMPORTED
+        assert import_report_file.call_count == 1
+
+    def test_write_results(self, config, tmp_path):
+        jobs = batch_jobs(config, [{"product_name": "Shop", "file": eslint_report}])
+        path = tmp_path / "results.json"
+
+        write_results(str(path), jobs, [ImportResult(ImportStatus.IMPORTED, test_id=3)])
+
+        output = json.loads(path.read_text())
+        assert output["summary"] == {
+            "total": 1,
+            "imported": 1,
+            "reimported": 0,
+            "skipped": 0,
+            "failed": 0,
+        }
+        assert output["results"] == [
+            {
+                "product_type_name": "Test Products",
+                "product_name": "Shop",
+                "engagement_name": "Nightly",
+                "status": "imported",
+                "test_id": 3,
+            }
+        ]
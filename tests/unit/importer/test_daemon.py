@@ -0,0 +1,225 @@
+import json
+import socket
+import threading
+import pytest
+import requests
+from unittest.mock import Mock
+from models.exceptions import ConfigurationError
+from models.result import ImportResult, ImportStatus
+from importer.daemon import ImportDaemon, ImportQueue, ImportServer, QueuedImport, query_entry
+from importer.batch import batch_jobs
+
+eslint_report = "tests/reports/eslint-report.json"
+
+
+@pytest.fixture
+def config(make_config):
+    return make_config(product_name="", engagement_name="CI", workers=2)
+
+
+def queued_import(config, product_name, import_id, **entry):
+    job = batch_jobs(config, [{"product_name": product_name, "file": eslint_report, **entry}])[0]
+    return QueuedImport(import_id, job)
+
+
+class TestImportQueue:
+    def test_reimports_into_the_same_test_are_coalesced(self, config):
+        queue = ImportQueue()
+        first = queued_import(config, "Shop", "1")
+        second = queued_import(config, "Shop", "2")
+
+        assert queue.put(first) is None
+        assert queue.put(second) is first
+        assert len(queue) == 1
+
+    def test_imports_are_not_coalesced(self, config):
+        queue = ImportQueue()
+        queue.put(queued_import(config, "Shop", "1", reimport=False))
+
+        assert queue.put(queued_import(config, "Shop", "2", reimport=False)) is None
+        assert len(queue) == 2
+
+    @pytest.mark.parametrize(
+        "condition,first,second",
+        [
+            ("commit", {"commit_hash": "a1b2c3"}, {"commit_hash": "d4e5f6"}),
+            ("branch", {"branch_tag": "main"}, {"branch_tag": "feature"}),
+        ],
+    )
+    def test_reimports_into_other_tests_are_not_coalesced(self, config, condition, first, second):
+        queue = ImportQueue()
+        entry = {"reimport": True, "reimport_condition": condition}
+        queue.put(queued_import(config, "Shop", "1", **entry, **first))
+
+        assert queue.put(queued_import(config, "Shop", "2", **entry, **second)) is None
+        assert len(queue) == 2
+        assert queue.put(queued_import(config, "Shop", "3", **entry, **second)).id == "2"
+
+    def test_auto_created_imports_of_other_tests_are_not_coalesced(self, config):
+        queue = ImportQueue()
+        entry = {"reimport": True, "auto_create_context": True}
+        queue.put(queued_import(config, "Shop", "1", **entry))
+        trivy = {"test_type_name": "Trivy Scan", "test_name": "Trivy Scan"}
+
+        assert queue.put(queued_import(config, "Shop", "2", **entry, **trivy)) is None
+        assert len(queue) == 2
+        assert queue.put(queued_import(config, "Shop", "3", **entry, **trivy)).id == "2"
+        # Imports of the same context still run in order
+        assert [queue.get().id] == ["1"]
+        queue.stop()
+
+    def test_same_test_is_not_imported_concurrently(self, config):
+        queue = ImportQueue()
+        for item in [
+            queued_import(config, "Shop", "1", reimport=False),
+            queued_import(config, "Shop", "2", reimport=False),
+            queued_import(config, "Blog", "3"),
+        ]:
+            queue.put(item)
+
+        first = queue.get()
+        second = queue.get()
+        queue.done(first)
+        third = queue.get()
+        queue.stop()
+
+        assert [first.id, second.id, third.id] == ["1", "3", "2"]
+        assert queue.get() is None
+
+
+class TestImportDaemon:
+    @pytest.fixture
+    def daemon(self, config, mocker):
+        mocker.patch("importer.daemon.setup_product_engagement", return_value={"engagement_id": 1})
+        mocker.patch(
+            "importer.daemon.import_report_file",
+            side_effect=lambda defectdojo, config, filename, engagement_config=None: ImportResult(
+                ImportStatus.REIMPORTED, filename, test_name=config.test_name, test_id=7
+            ),
+        )
+        daemon = ImportDaemon(Mock(), config)
+        yield daemon
+        daemon.stop()
+
+    def wait_for(self, daemon, import_id):
+        for _ in range(200):
+            if daemon.status(import_id)["status"] not in ["queued", "running"]:
+                return daemon.status(import_id)
+            threading.Event().wait(0.01)
+        raise AssertionError(f"Import {import_id} did not finish")
+
+    def test_submit_and_process(self, daemon):
+        items = daemon.submit([{"product_name": "Shop", "file": eslint_report}])
+        daemon.start()
+
+        status = self.wait_for(daemon, items[0].id)
+
+        assert status["status"] == "reimported"
+        assert status["test_id"] == 7
+
+    def test_superseded_import_is_skipped(self, daemon):
+        first = daemon.submit([{"product_name": "Shop", "file": eslint_report}])[0]
+        second = daemon.submit([{"product_name": "Shop", "file": eslint_report}])[0]
+
+        assert daemon.status(first.id)["status"] == "skipped"
+        assert daemon.status(second.id)["status"] == "queued"
+
+    def test_submit_invalid_entry(self, daemon, tmp_path):
+        workdir = tmp_path / "upload"
+        workdir.mkdir()
+
+        with pytest.raises(ConfigurationError):
+            daemon.submit([{"file": eslint_report}], workdir=str(workdir))
+        assert not workdir.exists()
+
+    def test_spool_directory(self, config, daemon, tmp_path):
+        (tmp_path / "report.json").write_text("{}")
+        (tmp_path / "shop.import.json").write_text(
+            json.dumps([{"product_name": "Shop", "file": "report.json"}])
+        )
+        daemon.spool_dir = tmp_path
+        daemon.spool_interval = 0.01
+        daemon.start()
+
+        for _ in range(200):
+            if (tmp_path / "done" / "shop.import.json").exists():
+                break
+            threading.Event().wait(0.01)
+
+        results = json.loads((tmp_path / "done" / "shop.import.json").read_text())
+        assert results["results"][0]["status"] == "reimported"
+        assert results["results"][0]["filename"] == str(tmp_path / "report.json")
+        assert not (tmp_path / "shop.import.json").exists()
+        assert not (tmp_path / "processing" / "shop.import.json").exists()
+
+    def test_http_ingest(self, daemon):
+        server = ImportServer(("127.0.0.1", 0), daemon)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        daemon.start()
+        url = "http://%s:%s" % server.server_address[:2]
+        try:
+            response = requests.post(
+                url + "/imports",
+                params={"product_name": "Shop", "filename": "eslint.json", "reimport": "true"},
+                data=b"[]",
+            )
+            invalid = requests.post(url + "/imports", data=b"[]")
+            import_id = response.json()["imports"][0]["id"]
+            self.wait_for(daemon, import_id)
+            status = requests.get(f"{url}/imports/{import_id}")
+            health = requests.get(url + "/health")
+            metrics = requests.get(url + "/metrics")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert response.status_code == 202
+        assert invalid.status_code == 400
+        assert "Product name is required." in invalid.json()["error"]
+        assert status.json()["status"] == "reimported"
+        assert status.json()["filename"].endswith("eslint.json")
+        assert health.json() == {"status": "ok", "queued": 0}
+        assert metrics.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE defectdojo_importer_http_requests_total counter" in metrics.text
+
+    @pytest.mark.parametrize("content_length,body", [("many", b""), ("-1", b""), ("10", b"[]")])
+    def test_http_ingest_invalid_body(self, daemon, content_length, body):
+        server = ImportServer(("127.0.0.1", 0), daemon)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with socket.create_connection(server.server_address[:2]) as connection:
+                connection.sendall(
+                    b"POST /imports?product_name=Shop HTTP/1.1\r\n"
+                    + f"Content-Length: {content_length}\r\n\r\n".encode()
+                    + body
+                )
+                connection.shutdown(socket.SHUT_WR)
+                response = connection.makefile("rb").read()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert response.startswith(b"HTTP/1.0 400")
+        assert len(daemon.queue) == 0
+
+    def test_stop_removes_queued_reports(self, daemon, tmp_path):
+        workdir = tmp_path / "upload"
+        workdir.mkdir()
+        item = daemon.submit(
+            [{"product_name": "Shop", "file": eslint_report}], workdir=str(workdir)
+        )[0]
+
+        daemon.stop()
+
+        assert daemon.status(item.id)["status"] == "skipped"
+        assert not workdir.exists()
+        assert len(daemon.queue) == 0
+
+    def test_query_entry(self):
+        assert query_entry("product-name=Shop&reimport=false&push_to_jira=1") == {
+            "product_name": "Shop",
+            "reimport": False,
+            "push_to_jira": True,
+        }
@@ -0,0 +1,40 @@
+import threading
+from unittest.mock import Mock
+from importer.findings import import_report, setup_import
+
+
+class TestSetupImport:
+    def test_test_type_is_resolved_alongside_the_engagement(self, mock_config):
+        mock_config.tool_configuration_name = None
+        mock_config.reimport = False
+        barrier = threading.Barrier(2, timeout=5)
+        defectdojo = Mock()
+        defectdojo.product_types.get_or_create.side_effect = lambda _: (barrier.wait(), 1)[1]
+        defectdojo.test_types.get.side_effect = lambda _: (barrier.wait(), 5)[1]
+        defectdojo.products.get_or_create.return_value = 2
+        defectdojo.engagements.get_or_create.return_value = 3
+        defectdojo.tests.get.return_value = 4
+
+        engagement_config, test_config = setup_import(defectdojo, mock_config)
+
+        assert engagement_config == {"product_id": 2, "product_type_id": 1, "engagement_id": 3}
+        assert test_config == {"test_id": 4, "test_type_id": 5, "api_scan_id": None}
+        test = defectdojo.tests.get.call_args.args[0]
+        assert (test.engagement, test.test_type) == (3, 5)
+
+
+class TestImportReport:
+    def test_report_is_prepared_during_the_lookups(self, mock_config, mocker):
+        mock_config.skip_unchanged = True
+        barrier = threading.Barrier(2, timeout=5)
+        hashes = mocker.patch("importer.findings.get_report_hash", side_effect=barrier.wait)
+        mocker.patch(
+            "importer.findings.setup_import",
+            side_effect=lambda *_: (barrier.wait(), ({"engagement_id": 3}, {"test_id": 4}))[1],
+        )
+        import_findings = mocker.patch("importer.findings.import_findings")
+
+        import_report(Mock(), mock_config, "tests/reports/eslint-report.json")
+
+        files = hashes.call_args.args[0]
+        assert import_findings.call_args.args[5] is files
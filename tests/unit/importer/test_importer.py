@@ -1,4 +1,5 @@
-from importer import Importer
+import asyncio
+from importer import Importer, AsyncImporter
 from models.exceptions import ConfigurationError
 import pytest
 
@@ -27,3 +28,21 @@ class TestImporter:
         # Help should be printed to stdout
         assert "usage:" in captured.out
         assert exc_info.value.code == 1
+
+
+class TestAsyncImporter:
+    def test_run_many_shares_session(self, mocker):
+        mocker.patch("importer.aio.validate_config", return_value=mocker.Mock())
+        execute = mocker.patch("importer.aio.Importer.execute")
+        execute.side_effect = [None, ConfigurationError("boom"), None]
+        importer = AsyncImporter(max_concurrency=2)
+
+        results = asyncio.run(
+            importer.run_many([["-f", "a.json"], ["-f", "b.json"], ["-f", "c.json"]])
+        )
+        importer.close()
+
+        assert results[0] is None and results[2] is None
+        assert isinstance(results[1], ConfigurationError)
+        assert execute.call_count == 3
+        assert all(call.args[2] is importer.session for call in execute.call_args_list)
@@ -0,0 +1,128 @@
+import json
+import pytest
+from unittest.mock import Mock
+from models.exceptions import ConfigurationError
+from models.result import ImportResult, ImportStatus
+from importer.outbox import enqueue_reports, flush_outbox, outbox_lock
+
+eslint_report = "tests/reports/eslint-report.json"
+
+
+@pytest.fixture
+def config(make_config, tmp_path):
+    return make_config(
+        product_name="Shop",
+        engagement_name="CI",
+        test_name="ESLint Scan",
+        build_id="42",
+        outbox=str(tmp_path / "outbox"),
+    )
+
+
+@pytest.fixture
+def imports(mocker):
+    mocker.patch("importer.batch.setup_product_engagement", return_value={"engagement_id": 1})
+    return mocker.patch("importer.batch.import_report_file")
+
+
+class TestOutbox:
+    def test_enqueue_reports(self, config):
+        job_ids = enqueue_reports(config.outbox, config, [(eslint_report, "ESLint Scan")])
+
+        job_dir = config.outbox + "/" + job_ids[0]
+        job = json.loads(open(job_dir + "/job.json").read())
+        assert open(job_dir + "/eslint-report.json").read() == open(eslint_report).read()
+        assert job["files"] == ["eslint-report.json"]
+        assert job["config"]["build_id"] == "42"
+        assert job["config"]["test_name"] == "ESLint Scan"
+        assert "api_key" not in job["config"]
+        assert "outbox" not in job["config"]
+
+    def test_flush_removes_sent_imports(self, config, imports, tmp_path):
+        imports.return_value = ImportResult(ImportStatus.REIMPORTED, test_id=1)
+        job_ids = enqueue_reports(config.outbox, config, [(eslint_report, "ESLint Scan")])
+
+        flushed = flush_outbox(Mock(), config)
+
+        assert [(job_id, result.status) for job_id, result in flushed] == [
+            (job_ids[0], ImportStatus.REIMPORTED)
+        ]
+        assert imports.call_args.args[1].build_id == "42"
+        assert not (tmp_path / "outbox" / job_ids[0]).exists()
+
+    def test_flush_keeps_order_after_failure(self, config, imports, tmp_path):
+        imports.return_value = ImportResult(ImportStatus.FAILED, error="Service Unavailable")
+        first, second = [
+            enqueue_reports(config.outbox, config, [(eslint_report, "ESLint Scan")])[0]
+            for _ in range(2)
+        ]
+
+        flushed = dict(flush_outbox(Mock(), config))
+
+        assert imports.call_count == 1
+        assert flushed[second].error.startswith("Not attempted")
+        job = json.loads((tmp_path / "outbox" / first / "job.json").read_text())
+        assert job["attempts"] == 1
+        assert job["last_error"] == "Service Unavailable"
+
+    def test_flush_keeps_imports_not_attempted(self, config, imports, tmp_path):
+        imports.return_value = ImportResult(ImportStatus.FAILED, error="Service Unavailable")
+        first, second = [
+            enqueue_reports(config.outbox, config, [(eslint_report, "ESLint Scan")])[0]
+            for _ in range(2)
+        ]
+
+        flush_outbox(Mock(), config, max_attempts=2)
+        flush_outbox(Mock(), config, max_attempts=2)
+
+        assert (tmp_path / "outbox" / "failed" / first).exists()
+        job = json.loads((tmp_path / "outbox" / second / "job.json").read_text())
+        assert job["attempts"] == 0
+
+    def test_flush_moves_exhausted_imports(self, config, imports, tmp_path):
+        imports.return_value = ImportResult(ImportStatus.FAILED)
+        job_id = enqueue_reports(config.outbox, config, [(eslint_report, "ESLint Scan")])[0]
+
+        flush_outbox(Mock(), config, max_attempts=2)
+        flush_outbox(Mock(), config, max_attempts=2)
+
+        assert not (tmp_path / "outbox" / job_id).exists()
+        assert (tmp_path / "outbox" / "failed" / job_id / "job.json").exists()
+
+    def test_flush_fails_corrupt_first_import(self, config, imports, tmp_path):
+        imports.return_value = ImportResult(ImportStatus.REIMPORTED, test_id=1)
+        job_id = enqueue_reports(config.outbox, config, [(eslint_report, "ESLint Scan")])[0]
+        corrupt = tmp_path / "outbox" / "0-corrupt"
+        corrupt.mkdir()
+        (corrupt / "job.json").write_text("{not json")
+
+        flushed = dict(flush_outbox(Mock(), config))
+
+        assert flushed["0-corrupt"].status == ImportStatus.FAILED
+        assert flushed[job_id].status == ImportStatus.REIMPORTED
+        job = json.loads((tmp_path / "outbox" / "failed" / "0-corrupt" / "job.json").read_text())
+        assert job["attempts"] == 1
+        assert "config" not in job
+
+    def test_flush_fails_corrupt_later_import(self, config, imports, tmp_path):
+        imports.return_value = ImportResult(ImportStatus.FAILED, error="Service Unavailable")
+        job_id = enqueue_reports(config.outbox, config, [(eslint_report, "ESLint Scan")])[0]
+        job_file = tmp_path / "outbox" / job_id / "job.json"
+        job_file.write_text(json.dumps({**json.loads(job_file.read_text()), "attempts": 7}))
+        corrupt = tmp_path / "outbox" / "z-corrupt"
+        corrupt.mkdir()
+        (corrupt / "job.json").write_text(json.dumps({"files": []}))
+
+        flushed = dict(flush_outbox(Mock(), config))
+
+        assert flushed["z-corrupt"].status == ImportStatus.FAILED
+        job = json.loads((tmp_path / "outbox" / "failed" / "z-corrupt" / "job.json").read_text())
+        assert job == {"files": [], "attempts": 1, "last_error": "'config'"}
+        assert json.loads(job_file.read_text())["attempts"] == 8
+
+    def test_concurrent_flush(self, config, tmp_path):
+        (tmp_path / "outbox").mkdir()
+
+        with outbox_lock(tmp_path / "outbox"):
+            with pytest.raises(ConfigurationError, match="being flushed already"):
+                flush_outbox(Mock(), config)
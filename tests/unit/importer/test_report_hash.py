@@ -0,0 +1,91 @@
+import pytest
+from unittest.mock import Mock
+from common.cache import LookupCache
+from common.multipart import ReportFile
+from models.common import ReimportConditions
+from models.result import ImportStatus
+from importer.languages import import_languages
+from importer.report_hash import (
+    get_report_hash,
+    is_report_unchanged,
+    record_report_hash,
+    report_hash_tag,
+)
+
+report_sha256 = "a948904f2f0f479b8f8197694b30184b0d2ed1c1cd2a1ec0fb85d299a192a447"
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = tmp_path / "report.json"
+    path.write_bytes(b"hello world\n")
+    return ReportFile(path)
+
+
+@pytest.fixture
+def defectdojo():
+    defectdojo = Mock()
+    defectdojo.cache = LookupCache("https://defectdojo.example.com")
+    defectdojo.tests.endpoint = "https://defectdojo.example.com/api/v2/tests/"
+    defectdojo.tests.get_tags.return_value = []
+    return defectdojo
+
+
+@pytest.fixture
+def config(mock_config):
+    mock_config.engagement_name = "CI/CD Engagement"
+    mock_config.test_name = "ESLint Scan"
+    mock_config.test_type_name = "ESLint Scan"
+    mock_config.reimport_condition = ReimportConditions.BRANCH
+    mock_config.branch_tag = "main"
+    mock_config.build_id = None
+    mock_config.commit_hash = None
+    return mock_config
+
+
+class TestReportHash:
+    """Test cases for skipping unchanged report uploads."""
+
+    def test_get_report_hash(self, report):
+        files = [("file", ("report.json", report, "application/octet-stream"))]
+
+        assert get_report_hash(files) == report_sha256
+        assert get_report_hash([("file", (None, None, "application/octet-stream"))]) is None
+
+    def test_unchanged_from_local_cache(self, defectdojo, config):
+        assert not is_report_unchanged(defectdojo, config, "findings", report_sha256)
+
+        record_report_hash(defectdojo, config, "findings", report_sha256, 12)
+
+        assert is_report_unchanged(defectdojo, config, "findings", report_sha256)
+        assert not is_report_unchanged(defectdojo, config, "findings", "0" * 64)
+        assert not is_report_unchanged(defectdojo, config, "languages", report_sha256)
+        defectdojo.tests.get_tags.assert_not_called()
+
+    def test_reimport_condition_is_part_of_the_key(self, defectdojo, config):
+        record_report_hash(defectdojo, config, "findings", report_sha256, 12)
+        config.branch_tag = "feature"
+
+        assert not is_report_unchanged(defectdojo, config, "findings", report_sha256)
+
+    def test_unchanged_from_test_tags(self, defectdojo, config):
+        defectdojo.cache = None
+        defectdojo.tests.get_tags.return_value = [
+            "defectdojo-importer",
+            report_hash_tag(report_sha256),
+        ]
+
+        assert is_report_unchanged(defectdojo, config, "findings", report_sha256, 12)
+        assert not is_report_unchanged(defectdojo, config, "findings", "0" * 64, 12)
+        assert not is_report_unchanged(defectdojo, config, "findings", report_sha256)
+        defectdojo.tests.get_tags.assert_called_with(12)
+
+    def test_languages_need_the_local_cache(self, defectdojo, config, report, caplog):
+        defectdojo.cache = None
+        config.skip_unchanged = True
+
+        result = import_languages(defectdojo, config, 1, str(report.path))
+
+        assert result.status == ImportStatus.IMPORTED
+        defectdojo.languages.upload.assert_called_once()
+        assert "only skipped with the lookup cache" in caplog.text
@@ -0,0 +1,55 @@
+import json
+import pytest
+from models.result import ImportResult, ImportStatus
+from common.instrumentation import RequestRecord
+from importer.summary import SummaryWriter, REQUESTS
+
+
+@pytest.fixture
+def config(make_config):
+    return make_config(product_name="Shop", engagement_name="Nightly")
+
+
+def test_summary_of_a_run(tmp_path, config):
+    path = tmp_path / "summary.json"
+
+    with SummaryWriter(str(path), "import", config, "findings") as summary:
+        REQUESTS(RequestRecord("GET", "https://dojo.example.com/api/v2/tests/", 200, 0.1))
+        summary.results = [
+            ImportResult(ImportStatus.IMPORTED, "a.json", product_id=1, test_id=2),
+            ImportResult(ImportStatus.FAILED, "b.json", product_id=1),
+        ]
+
+    output = json.loads(path.read_text())
+    assert output["status"] == "failed"
+    assert output["error"] is None
+    assert output["product_name"] == "Shop"
+    assert output["product_id"] == 1
+    assert "test_id" not in output
+    assert output["summary"] == {
+        "total": 2,
+        "imported": 1,
+        "reimported": 0,
+        "skipped": 0,
+        "failed": 1,
+    }
+    assert output["imports"][0] == {
+        "status": "imported",
+        "filename": "a.json",
+        "product_id": 1,
+        "test_id": 2,
+    }
+    assert output["requests"]["total"] == 1
+
+
+def test_summary_records_errors(tmp_path, config):
+    path = tmp_path / "summary.json"
+
+    with pytest.raises(ValueError):
+        with SummaryWriter(str(path), "batch", config):
+            raise ValueError("Invalid manifest")
+
+    output = json.loads(path.read_text())
+    assert output["status"] == "failed"
+    assert output["error"] == "ValueError: Invalid manifest"
+    assert output["imports"] == []
@@ -43,37 +43,33 @@ class TestDtrack:
 
     def test_get_integration_enabled(self, dtrack_client, mock_http_client):
         """Test get_integration when integration is enabled."""
-        mock_response = json.dumps(
-            [
-                {
-                    "groupName": "integrations",
-                    "propertyName": "defectdojo.enabled",
-                    "propertyValue": "true",
-                }
-            ]
-        )
-        mock_http_client.request.return_value = mock_response
+        mock_response = [
+            {
+                "groupName": "integrations",
+                "propertyName": "defectdojo.enabled",
+                "propertyValue": "true",
+            }
+        ]
+        mock_http_client.request_json.return_value = mock_response
 
         result = dtrack_client.get_integration()
 
         assert result is True
-        mock_http_client.request.assert_called_once_with(
+        mock_http_client.request_json.assert_called_once_with(
             "GET", "https://dtrack.example.com/api/v1/configProperty"
         )
         mock_http_client.logger.info.assert_called_with("Dependency Track integration is enabled.")
 
     def test_get_integration_disabled(self, dtrack_client, mock_http_client):
         """Test get_integration when integration is disabled."""
-        mock_response = json.dumps(
-            [
-                {
-                    "groupName": "integrations",
-                    "propertyName": "defectdojo.enabled",
-                    "propertyValue": "false",
-                }
-            ]
-        )
-        mock_http_client.request.return_value = mock_response
+        mock_response = [
+            {
+                "groupName": "integrations",
+                "propertyName": "defectdojo.enabled",
+                "propertyValue": "false",
+            }
+        ]
+        mock_http_client.request_json.return_value = mock_response
 
         result = dtrack_client.get_integration()
 
@@ -84,10 +80,10 @@ class TestDtrack:
 
     def test_get_integration_not_found(self, dtrack_client, mock_http_client):
         """Test get_integration when defectdojo.enabled property is not found."""
-        mock_response = json.dumps(
-            [{"groupName": "other", "propertyName": "other.property", "propertyValue": "value"}]
-        )
-        mock_http_client.request.return_value = mock_response
+        mock_response = [
+            {"groupName": "other", "propertyName": "other.property", "propertyValue": "value"}
+        ]
+        mock_http_client.request_json.return_value = mock_response
 
         result = dtrack_client.get_integration()
 
@@ -98,7 +94,7 @@ class TestDtrack:
 
     def test_get_integration_json_error(self, dtrack_client, mock_http_client):
         """Test get_integration when JSON parsing fails."""
-        mock_http_client.request.return_value = "invalid json"
+        mock_http_client.request_json.side_effect = ValueError("Invalid JSON")
 
         with pytest.raises(Exception):
             dtrack_client.get_integration()
@@ -165,13 +161,13 @@ class TestDtrack:
 
     def test_get_project_uuid_success(self, dtrack_client, mock_http_client, sample_project):
         """Test get_project_uuid successful retrieval."""
-        mock_response = json.dumps({"uuid": "test-uuid-123"})
-        mock_http_client.request.return_value = mock_response
+        mock_response = {"uuid": "test-uuid-123"}
+        mock_http_client.request_json.return_value = mock_response
 
         result = dtrack_client.get_project_uuid(sample_project)
 
         assert result == "test-uuid-123"
-        mock_http_client.request.assert_called_once_with(
+        mock_http_client.request_json.assert_called_once_with(
             "GET",
             "https://dtrack.example.com/api/v1/project/lookup",
             params=sample_project.to_dict(),
@@ -182,7 +178,7 @@ class TestDtrack:
 
     def test_get_project_uuid_error(self, dtrack_client, mock_http_client, sample_project):
         """Test get_project_uuid when request fails."""
-        mock_http_client.request.return_value = "invalid json"
+        mock_http_client.request_json.side_effect = ValueError("Invalid JSON")
 
         with pytest.raises(Exception):
             dtrack_client.get_project_uuid(sample_project)
@@ -195,16 +191,14 @@ class TestDtrack:
         self, dtrack_client, mock_http_client, sample_project_property
     ):
         """Test get_project_properties successful retrieval."""
-        mock_response = json.dumps(
-            [{"propertyName": "defectdojo.engagementId", "propertyValue": "123"}]
-        )
-        mock_http_client.request.return_value = mock_response
+        mock_response = [{"propertyName": "defectdojo.engagementId", "propertyValue": "123"}]
+        mock_http_client.request_json.return_value = mock_response
 
         result = dtrack_client.get_project_properties(sample_project_property)
 
         expected_result = [{"propertyName": "defectdojo.engagementId", "propertyValue": "123"}]
         assert result == expected_result
-        mock_http_client.request.assert_called_once_with(
+        mock_http_client.request_json.assert_called_once_with(
             "GET",
             f"https://dtrack.example.com/api/v1/project/{sample_project_property.uuid}/property",
         )
@@ -213,7 +207,7 @@ class TestDtrack:
         self, dtrack_client, mock_http_client, sample_project_property
     ):
         """Test get_project_properties when request fails."""
-        mock_http_client.request.return_value = "invalid json"
+        mock_http_client.request_json.side_effect = ValueError("Invalid JSON")
 
         with pytest.raises(Exception):
             dtrack_client.get_project_properties(sample_project_property)
@@ -228,24 +222,17 @@ class TestDtrack:
     ):
         """Test update_project_properties when creating new properties."""
         # Mock existing properties (empty)
-        mock_http_client.request.side_effect = [
-            json.dumps([]),  # get_project_properties response
-            "{}",  # PUT response for engagementId
-            "{}",  # PUT response for reimport
-            "{}",  # PUT response for doNotReactivate
-        ]
+        mock_http_client.request_json.return_value = []  # get_project_properties response
+        mock_http_client.request.return_value = "{}"
 
         result = dtrack_client.update_project_properties(sample_project_property)
 
-        # Verify 4 calls: 1 GET + 3 PUT
-        assert mock_http_client.request.call_count == 4
-
-        # Verify GET call for existing properties
-        first_call = mock_http_client.request.call_args_list[0]
-        assert first_call[0][0] == "GET"
+        # Verify 1 GET for existing properties + 3 PUT
+        assert mock_http_client.request_json.call_args[0][0] == "GET"
+        assert mock_http_client.request.call_count == 3
 
         # Verify PUT calls for new properties
-        for i in range(1, 4):
+        for i in range(3):
             call = mock_http_client.request.call_args_list[i]
             assert call[0][0] == "PUT"
             assert call[1]["data"] is not None
@@ -260,24 +247,18 @@ class TestDtrack:
             {"propertyName": "defectdojo.reimport", "propertyValue": "false"},
             {"propertyName": "defectdojo.doNotReactivate", "propertyValue": "true"},
         ]
-        mock_http_client.request.side_effect = [
-            json.dumps(existing_properties),  # get_project_properties response
-            "{}",  # POST response for engagementId
-            "{}",  # POST response for reimport
-            "{}",  # POST response for doNotReactivate
-        ]
+        # get_project_properties response
+        mock_http_client.request_json.return_value = existing_properties
+        mock_http_client.request.return_value = "{}"
 
         result = dtrack_client.update_project_properties(sample_project_property)
 
-        # Verify 4 calls: 1 GET + 3 POST
-        assert mock_http_client.request.call_count == 4
-
-        # Verify GET call for existing properties
-        first_call = mock_http_client.request.call_args_list[0]
-        assert first_call[0][0] == "GET"
+        # Verify 1 GET for existing properties + 3 POST
+        assert mock_http_client.request_json.call_args[0][0] == "GET"
+        assert mock_http_client.request.call_count == 3
 
         # Verify POST calls for updating existing properties
-        for i in range(1, 4):
+        for i in range(3):
             call = mock_http_client.request.call_args_list[i]
             assert call[0][0] == "POST"
             assert call[1]["data"] is not None
@@ -291,18 +272,14 @@ class TestDtrack:
             reactivate=False,  # This should set doNotReactivate to True
         )
 
-        mock_http_client.request.side_effect = [
-            json.dumps([]),  # get_project_properties response
-            "{}",  # PUT responses
-            "{}",
-            "{}",
-        ]
+        mock_http_client.request_json.return_value = []  # get_project_properties response
+        mock_http_client.request.return_value = "{}"  # PUT responses
 
         dtrack_client.update_project_properties(project_property)
 
         # Check the doNotReactivate payload
         do_not_reactivate_call = None
-        for call in mock_http_client.request.call_args_list[1:]:
+        for call in mock_http_client.request.call_args_list:
             payload = json.loads(call[1]["data"])
             if payload["propertyName"] == "defectdojo.doNotReactivate":
                 do_not_reactivate_call = payload
@@ -1,3 +1,5 @@
+import socket
+import logging
 import responses
 import pytest
 from unittest.mock import MagicMock
@@ -74,3 +76,143 @@ class TestHttpClient:
 
         with pytest.raises(Exception):
             client.request("PUT", url)
+
+    def test_http_client_uses_pooled_session(self):
+        pooled_client = HttpClient("http://localhost", logger=MagicMock(), pool_size=4)
+        adapter = pooled_client.session.get_adapter("https://localhost")
+        assert adapter._pool_maxsize == 4
+
+        shared_client = HttpClient("http://other", session=pooled_client.session)
+        assert shared_client.session is pooled_client.session
+
+    @responses.activate
+    def test_http_client_without_keep_alive(self):
+        responses.add(responses.GET, url=url, status=200)
+        closing_client = HttpClient(url, default_headers, False, MagicMock(), keep_alive=False)
+
+        closing_client.request("GET", url)
+
+        assert responses.calls[0].request.headers.get("Connection") == "close"
+
+    def test_http_client_connection_stats(self):
+        pooled_client = HttpClient("http://localhost", logger=MagicMock())
+        pool = pooled_client.session.get_adapter(url).poolmanager.connection_from_url(url)
+        pool.num_connections = 1
+        pool.num_requests = 5
+
+        stats = pooled_client.connection_stats()
+
+        assert stats == {"connections": 1, "requests": 5, "reused": 4}
+
+    def test_http_client_warm_up(self):
+        listener = socket.create_server(("127.0.0.1", 0))
+        warm_url = f"http://127.0.0.1:{listener.getsockname()[1]}"
+        warm_client = HttpClient(warm_url, logger=MagicMock())
+
+        for thread in warm_client.warm_up(2):
+            thread.join(timeout=5)
+
+        assert warm_client.connection_stats()["connections"] == 2
+        listener.close()
+
+    def test_http_client_warm_up_without_keep_alive(self):
+        closing_client = HttpClient(url, logger=MagicMock(), keep_alive=False)
+
+        assert closing_client.warm_up(2) == []
+
+    @responses.activate
+    def test_http_client_retries_lookups(self, mocker):
+        sleep = mocker.patch("time.sleep")
+        responses.add(responses.GET, url=url, status=503, headers={"Retry-After": "1"})
+        responses.add(responses.GET, url=url, status=200, body="ok")
+
+        assert client.request("GET", url) == "ok"
+        assert len(responses.calls) == 2
+        sleep.assert_called_once_with(1.0)
+
+    @responses.activate
+    def test_http_client_notifies_observers_of_every_attempt(self, mocker):
+        mocker.patch("time.sleep")
+        observer = MagicMock()
+        observed_client = HttpClient(url, logger=MagicMock(), observers=[observer])
+        responses.add(responses.GET, url=url, status=503)
+        responses.add(responses.GET, url=url, status=200)
+
+        observed_client.request("GET", url)
+
+        records = [call.args[0] for call in observer.call_args_list]
+        assert [(record.method, record.status, record.attempt) for record in records] == [
+            ("GET", 503, 1),
+            ("GET", 200, 2),
+        ]
+
+    @responses.activate
+    def test_http_client_does_not_retry_processed_imports(self, mocker):
+        mocker.patch("time.sleep")
+        import_url = url + "/api/v2/import-scan/"
+        responses.add(responses.POST, url=import_url, status=502)
+
+        with pytest.raises(HTTPError):
+            client.request("POST", import_url)
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_http_client_retries_throttled_imports(self, mocker):
+        mocker.patch("time.sleep")
+        import_url = url + "/api/v2/import-scan/"
+        responses.add(responses.POST, url=import_url, status=429)
+        responses.add(responses.POST, url=import_url, status=201)
+
+        client.request("POST", import_url)
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_http_client_rate_limits_every_attempt(self, mocker):
+        mocker.patch("time.sleep")
+        limiter = MagicMock()
+        limited_client = HttpClient(url, logger=MagicMock(), rate_limiter=limiter)
+        import_url = url + "/api/v2/import-scan/"
+        responses.add(responses.GET, url=url, status=503)
+        responses.add(responses.GET, url=url, status=200)
+        responses.add(responses.POST, url=import_url, status=201)
+
+        limited_client.request("GET", url)
+        limited_client.request("POST", import_url)
+
+        assert [call.args for call in limiter.acquire.call_args_list] == [
+            ("lookup",),
+            ("lookup",),
+            ("import",),
+        ]
+
+    @responses.activate
+    def test_http_client_request_json(self):
+        responses.add(responses.GET, url=url, status=200, json={"count": 1, "results": []})
+        responses.add(responses.POST, url=url, status=204)
+
+        assert client.request_json("GET", url) == {"count": 1, "results": []}
+        assert client.request_json("POST", url) is None
+
+    @responses.activate
+    def test_http_client_only_formats_debug_logs_when_enabled(self, mocker):
+        logger = logging.getLogger("test_http_client")
+        logger.setLevel(logging.INFO)
+        quiet_client = HttpClient(url, {"Authorization": "Token secret"}, logger=logger)
+        responses.add(responses.GET, url=url, status=200, body="ok")
+        truncate = mocker.patch("common.http_logging.truncate_body")
+
+        assert quiet_client.request("GET", url) == "ok"
+        truncate.assert_not_called()
+
+    @responses.activate
+    def test_http_client_truncates_error_bodies(self, caplog):
+        logger = logging.getLogger("test_http_client")
+        limited_client = HttpClient(url, logger=logger, log_body_limit=5)
+        responses.add(responses.GET, url=url, status=400, body="x" * 1000)
+
+        with caplog.at_level(logging.ERROR, logger="test_http_client"):
+            with pytest.raises(HTTPError):
+                limited_client.request("GET", url)
+
+        assert "xxxxx... <995 more bytes>" in caplog.text
+
@@ -0,0 +1,66 @@
+import json
+import subprocess
+import sys
+import pytest
+
+# Modules only needed once an import runs, printing the help must not load them
+DEFERRED_MODULES = ["requests", "urllib3", "dotenv", "asyncio", "http.server", "importer.findings"]
+# Modules of the DefectDojo client, importing the cli must not load them
+CLIENT_MODULES = ["requests", "urllib3", "http_client", "defectdojo", "importer.findings"]
+# Importing the cli must take less than this share of the time taken by `import requests`,
+# which the cli used to load up front. Relative, so that slow machines do not fail it.
+IMPORT_TIME_BUDGET = 0.8
+
+startup_script = """
+import sys, json, time
+started = time.perf_counter()
+from importer.execute import main
+elapsed = time.perf_counter() - started
+imported = sorted(sys.modules)
+sys.argv = ["defectdojo-importer", *sys.argv[1:]]
+try:
+    main()
+except SystemExit:
+    pass
+modules = sorted(sys.modules)
+started = time.perf_counter()
+import requests
+requests_elapsed = time.perf_counter() - started
+print(json.dumps({
+    "elapsed": elapsed,
+    "requests_elapsed": requests_elapsed,
+    "imported": imported,
+    "modules": modules,
+}))
+"""
+
+
+def cold_start(*args: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", startup_script, *args],
+        cwd="src",
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+class TestStartup:
+    def test_help_does_not_load_deferred_modules(self):
+        modules = cold_start("--help")["modules"]
+
+        assert [module for module in DEFERRED_MODULES if module in modules] == []
+
+    def test_import_does_not_load_client_modules(self):
+        modules = cold_start("--help")["imported"]
+
+        assert [module for module in CLIENT_MODULES if module in modules] == []
+
+    @pytest.mark.benchmark
+    def test_import_time_budget(self):
+        runs = [cold_start("--help") for _ in range(3)]
+        elapsed = min(run["elapsed"] for run in runs)
+        requests_elapsed = min(run["requests_elapsed"] for run in runs)
+
+        assert elapsed < requests_elapsed * IMPORT_TIME_BUDGET, (elapsed, requests_elapsed)